@@ -1,27 +1,118 @@
+import json
 import os
 import pytest
-import allure
-from playwright.sync_api import sync_playwright
-from saucedemo.config.logger import logger
+from saucedemo.config.constants import CART_STORAGE_KEY, CONTEXT_OPTIONS, Products, URLs
+from saucedemo.config.logger import get_logger
 from saucedemo.config.settings import get_settings
+from saucedemo.utils.app_storage import write_local_storage
+from saucedemo.utils.artifacts import capture_screenshot
+from saucedemo.utils.asset_cache import install_asset_cache
+from saucedemo.utils.browser_events import BrowserEventBuffer
+from saucedemo.utils.browser_server import connect_or_launch
+from saucedemo.utils.auth_state import DEFAULT_IDENTITY, AuthStateCache, auth_identity
+from saucedemo.utils.context_pool import ContextPool
+from saucedemo.utils.local_site import LocalSiteServer
+from saucedemo.utils.recordings import attach_recordings, get_trace_recorder, keep_artifacts
+from saucedemo.utils.resource_blocking import block_resources, blocking_profiles
+from saucedemo.utils.sync_session import get_sync_session
+from saucedemo.utils.dom_watcher import flush_changes, install_dom_watcher
+from saucedemo.utils.flow_checkpoints import FLOWS, CheckpointStore
+from saucedemo.utils.web_vitals import install_observer
+
+logger = get_logger(__name__)
 
 settings = get_settings()
 
-@pytest.fixture(scope="session")
-def playwright():
-    """Create a Playwright instance"""
-    with sync_playwright() as playwright:
-        yield playwright
+pytest_plugins = [
+    "saucedemo.plugins.adaptive_timeouts",
+    "saucedemo.plugins.artifacts",
+    "saucedemo.plugins.asset_cache",
+    "saucedemo.plugins.async_fixtures",
+    "saucedemo.plugins.concurrent_runner",
+    "saucedemo.plugins.duration_scheduling",
+    "saucedemo.plugins.engine_report",
+    "saucedemo.plugins.load_mode",
+    "saucedemo.plugins.log_streams",
+    "saucedemo.plugins.perf_budgets",
+    "saucedemo.plugins.recordings",
+    "saucedemo.plugins.timing_report",
+    "saucedemo.plugins.web_vitals_report",
+]
+
+def pytest_addoption(parser):
+    """Add command-line options to pytest"""
+    parser.addoption(
+        "--local-site",
+        action="store_true",
+        default=settings.LOCAL_SITE,
+        help="Run against the bundled local SauceDemo replica instead of BASE_URL"
+    )
+    parser.addoption(
+        "--context-mode",
+        action="store",
+        default=settings.CONTEXT_MODE,
+        choices=["strict", "pooled"],
+        help="strict: new browser context per test; pooled: reuse reset contexts"
+    )
+    parser.addoption(
+        "--browser-server",
+        action="store",
+        default=settings.BROWSER_SERVER,
+        choices=["off", "auto", "start"],
+        help="off: always launch; auto: connect to a running browser server; start: start one if needed"
+    )
+
+@pytest.fixture(scope="session", autouse=True)
+def local_site(request):
+    """Serve the local SauceDemo replica and point BASE_URL at it when enabled"""
+    if not request.config.getoption("--local-site"):
+        yield None
+        return
+    original_base_url = URLs.BASE_URL
+    with LocalSiteServer() as server:
+        URLs.rebase(server.base_url)
+        settings.BASE_URL = server.base_url
+        yield server
+        URLs.rebase(original_base_url)
+        settings.BASE_URL = original_base_url
 
 @pytest.fixture(scope="session")
-def browser(playwright):
-    """Create a browser instance"""
-    browser = playwright.chromium.launch(
-        headless=os.getenv('HEADLESS', 'false').lower() == 'true',
-        args=['--disable-gpu']
+def sync_session():
+    """Sync Playwright and everything built on it, stopped at session end
+    
+    The asyncio tests stop it earlier (see saucedemo.utils.sync_session), so
+    the fixtures below are function-scoped and read from it on every test.
+    """
+    session = get_sync_session()
+    yield session
+    session.stop()
+
+@pytest.fixture
+def playwright(sync_session):
+    """The sync Playwright instance, started on first use"""
+    return sync_session.playwright()
+
+@pytest.fixture
+def browser(playwright, engine_cache, request):
+    """Create a browser instance, connecting to a running browser server if there is one"""
+    launch_args = {
+        "headless": os.getenv('HEADLESS', 'false').lower() == 'true',
+        "args": ['--disable-gpu']
+    }
+    
+    def close(launched):
+        browser, lease = launched
+        browser.close()
+        if lease:
+            lease.release()
+    
+    browser, _ = engine_cache.get(
+        "chromium",
+        "browser",
+        lambda: connect_or_launch(playwright.chromium, launch_args, request.config.getoption("--browser-server")),
+        close=close
     )
-    yield browser
-    browser.close()
+    return browser
 
 @pytest.hookimpl(hookwrapper=True, tryfirst=True)
 def pytest_runtest_makereport(item, call):
@@ -30,39 +121,131 @@ def pytest_runtest_makereport(item, call):
     rep = outcome.get_result()
     setattr(item, f"rep_{rep.when}", rep)
 
-@pytest.fixture(scope="function")
-def context(browser):
-    """Create a browser context"""
-    context = browser.new_context(
-        viewport={'width': 1920, 'height': 1080},
-        ignore_https_errors=True
+@pytest.fixture
+def engine_cache(playwright, sync_session):
+    """Browsers and per-browser resources of this worker, kept across tests and browser matrix engines"""
+    return sync_session.cache
+
+@pytest.fixture
+def auth_state_cache(browser, engine_cache, tmp_path_factory):
+    """Logged-in storage state per identity, shared by all tests on this worker"""
+    engine = browser.browser_type.name
+    return engine_cache.get(
+        engine,
+        "auth_state_cache",
+        lambda: AuthStateCache(browser, tmp_path_factory.mktemp(f"auth_state_{engine}"))
+    )
+
+@pytest.fixture
+def checkpoint_store(browser, engine_cache):
+    """Flow checkpoints recorded on this worker"""
+    return engine_cache.get(
+        browser.browser_type.name,
+        "checkpoint_store",
+        lambda: CheckpointStore(enabled=settings.FLOW_CHECKPOINTS)
     )
+
+@pytest.fixture(scope="session")
+def context_mode(request):
+    """Context isolation mode; override in a module to force one for its tests"""
+    return request.config.getoption("--context-mode")
+
+@pytest.fixture
+def context_pool(browser, auth_state_cache, engine_cache):
+    """Pool of reusable browser contexts for pooled context mode"""
+    def create_pool():
+        pool = ContextPool(browser, auth_state_cache, max_uses=settings.CONTEXT_POOL_MAX_USES)
+        pool.prewarm(DEFAULT_IDENTITY)
+        return pool
+    return engine_cache.get(browser.browser_type.name, "context_pool", create_pool, close=ContextPool.close)
+
+@pytest.fixture(scope="function")
+def context(browser, auth_state_cache, context_mode, request):
+    """Create a browser context, logged in unless the test is marked no_auth"""
+    identity = auth_identity(request.node)
+    if context_mode == "pooled":
+        context_pool = request.getfixturevalue("context_pool")
+        pooled = context_pool.acquire(identity)
+        block_resources(pooled.context, blocking_profiles(request.node))
+        recording = get_trace_recorder().record(pooled.context, request.node.nodeid)
+        yield pooled.context
+        attach_recordings(recording.stop(keep_artifacts(request.node)))
+        failed = request.node.rep_call.failed if hasattr(request.node, 'rep_call') else False
+        context_pool.release(pooled, failed=failed)
+        return
+    recorder = get_trace_recorder()
+    if identity:
+        context = auth_state_cache.new_context(identity, **CONTEXT_OPTIONS, **recorder.video_options())
+    else:
+        context = browser.new_context(**CONTEXT_OPTIONS, **recorder.video_options())
+    install_observer(context)
+    install_dom_watcher(context)
+    install_asset_cache(context)
+    block_resources(context, blocking_profiles(request.node))
+    recording = recorder.record(context, request.node.nodeid, started=False)
     yield context
-    context.close()
+    # Closes the context; the trace chunk and videos are kept only if the modes ask for them
+    attach_recordings(recording.close(keep_artifacts(request.node)))
 
 @pytest.fixture(scope="function")
-def page(context, request):
+def browser_events(request):
+    """Buffer of browser console messages, page errors and failed requests
+    
+    Written to the log and Allure only if the test fails, together with the
+    test's streamed DOM changes; call flush() to write them regardless.
+    """
+    buffer = BrowserEventBuffer(settings.BROWSER_EVENTS_MAX, settings.BROWSER_EVENT_MAX_CHARS)
+    yield buffer
+    buffer.detach()
+    if request.node.rep_call.failed if hasattr(request.node, 'rep_call') else False:
+        buffer.flush("test failed")
+        flush_changes(request.node.nodeid, "test failed")
+
+@pytest.fixture(scope="function")
+def page(context, context_mode, browser_events, request):
     """Create a new page for each test with screenshot capture on failure"""
-    page = context.new_page()
+    # Pooled contexts come with their page already open
+    page = context.pages[0] if context.pages else context.new_page()
     
-    # Add listeners for console logs
-    page.on("console", lambda msg: logger.info(f"Browser console: {msg.text}"))
+    # Buffer console logs, page errors and failed requests
+    browser_events.attach(page)
+    page.set_default_timeout(settings.TIMEOUT)
     
     yield page
     
-    # Capture screenshot on test failure
+    # Capture screenshot on test failure; written to disk in the background
     if request.node.rep_call.failed if hasattr(request.node, 'rep_call') else False:
-        screenshot_dir = os.path.join(os.getcwd(), 'screenshots')
-        os.makedirs(screenshot_dir, exist_ok=True)
-        screenshot_path = os.path.join(
-            screenshot_dir,
-            f"{request.node.name}.png"
-        )
-        page.screenshot(path=screenshot_path)
-        allure.attach.file(
-            screenshot_path,
-            name="screenshot",
-            attachment_type=allure.attachment_type.PNG
-        )
+        capture_screenshot(page, request.node.nodeid)
+    
+    if context_mode != "pooled":
+        page.close()
+
+@pytest.fixture(scope="function")
+def cart_state(page):
+    """Seed the cart directly in localStorage before the test's first navigation
+    
+    Usage: cart_state([Products.BACKPACK, Products.ONESIE])
+    """
+    def seed(products: list[str]):
+        unknown = [name for name in products if name not in Products.IDS]
+        if unknown:
+            raise ValueError(f"No item id known for products: {', '.join(unknown)}")
+        ids = [Products.IDS[name] for name in products]
+        logger.info(f"Seeding cart with: {', '.join(products)}")
+        write_local_storage(page, {CART_STORAGE_KEY: json.dumps(ids)})
+    return seed
+
+@pytest.fixture(scope="function")
+def checkpoint(page, checkpoint_store, request):
+    """Start the test where a shared flow prefix ends, restored from its checkpoint after the first run
     
-    page.close()
\ No newline at end of file
+    Usage: checkpoint("checkout_step_one") or checkpoint(CHECKOUT_STEP_ONE)
+    """
+    identity = auth_identity(request.node)
+    def reach(flow):
+        if isinstance(flow, str):
+            if flow not in FLOWS:
+                raise ValueError(f"Unknown flow '{flow}', expected one of: {', '.join(FLOWS)}")
+            flow = FLOWS[flow]
+        return checkpoint_store.reach(page, flow, identity)
+    return reach
@@ -1,8 +1,15 @@
+from typing import Optional
 from enum import Enum
 from .settings import get_settings
 
 settings = get_settings()
 
+# Options every browser context is created with
+CONTEXT_OPTIONS = {
+    'viewport': {'width': 1920, 'height': 1080},
+    'ignore_https_errors': True
+}
+
 class SortOptions(Enum):
     PRICE_LOW_TO_HIGH = "Price (low to high)"
     PRICE_HIGH_TO_LOW = "Price (high to low)"
@@ -17,6 +24,19 @@ class Products:
     ONESIE = "Sauce Labs Onesie"
     TEST_SHIRT = "Test.allTheThings() T-Shirt (Red)"
 
+    # Item ids the app uses in URLs and in the cart stored in localStorage
+    IDS = {
+        BACKPACK: 4,
+        BIKE_LIGHT: 0,
+        BOLT_SHIRT: 1,
+        FLEECE_JACKET: 5,
+        ONESIE: 2,
+        TEST_SHIRT: 3,
+    }
+
+# localStorage key holding the JSON list of item ids in the cart
+CART_STORAGE_KEY = "cart-contents"
+
 class TestData:
     SHIPPING = {
         "first_name": "John",
@@ -25,14 +45,33 @@ class TestData:
     }
 
 class URLs:
-    BASE_URL = settings.BASE_URL
-    LOGIN = f"{BASE_URL}/index.html"
-    INVENTORY = f"{BASE_URL}/inventory.html"
-    CART = f"{BASE_URL}/cart.html"
-    CHECKOUT_STEP_ONE = f"{BASE_URL}/checkout-step-one.html"
-    CHECKOUT_STEP_TWO = f"{BASE_URL}/checkout-step-two.html"
-    CHECKOUT_COMPLETE = f"{BASE_URL}/checkout-complete.html"
-    CHECKOUT = f"{BASE_URL}/checkout-step-one.html"
+    PATHS = {
+        "LOGIN": "index.html",
+        "INVENTORY": "inventory.html",
+        "CART": "cart.html",
+        "CHECKOUT_STEP_ONE": "checkout-step-one.html",
+        "CHECKOUT_STEP_TWO": "checkout-step-two.html",
+        "CHECKOUT_COMPLETE": "checkout-complete.html",
+        "CHECKOUT": "checkout-step-one.html",
+    }
+
+    @classmethod
+    def rebase(cls, base_url: str):
+        """Point every page URL at another deployment of the app"""
+        cls.BASE_URL = base_url
+        for name, path in cls.PATHS.items():
+            setattr(cls, name, f"{base_url}/{path}")
+
+    @classmethod
+    def name_of(cls, url: str) -> Optional[str]:
+        """Name of the page a URL points at (ignoring query and fragment), or None"""
+        url = url.split("#", 1)[0].split("?", 1)[0]
+        for name in cls.PATHS:
+            if getattr(cls, name) == url:
+                return name
+        return None
+
+URLs.rebase(settings.BASE_URL)
 
 class Credentials:
     STANDARD_USER = settings.STANDARD_USER
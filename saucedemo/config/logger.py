@@ -1,26 +1,157 @@
+"""Logging for the test framework
+
+Nothing is opened at import time: the first record logged under "saucedemo"
+sets up a QueueHandler whose QueueListener thread does the console and file
+I/O, so test threads never block on disk. Each process (xdist worker or the
+single pytest process) writes its own JSON-lines file under
+logs/<run id>/, and the controller merges them at session end.
+
+Verbosity is LOG_LEVEL for everything, with per-module overrides in
+LOG_LEVELS, e.g. "saucedemo.pages=DEBUG,saucedemo.utils.local_site=WARNING".
+"""
+import json
 import logging
 import os
+import queue
+import threading
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
 
-# Create logs directory if it doesn't exist
-logs_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'logs')
-os.makedirs(logs_dir, exist_ok=True)
-
-# Configure logger
-logger = logging.getLogger('saucedemo')
-logger.setLevel(logging.INFO)
+from saucedemo.utils.xdist import current_test_id, worker_id
 
-# Create handlers
-console_handler = logging.StreamHandler()
-file_handler = logging.FileHandler(
-    os.path.join(logs_dir, f'test_run_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log')
-)
+ROOT_LOGGER = 'saucedemo'
+RUN_ID_ENV = 'SAUCEDEMO_RUN_ID'
+MERGED_LOG = 'merged.jsonl'
 
-# Create formatters and add it to handlers
+logs_dir = Path(__file__).resolve().parent.parent / 'logs'
 log_format = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-console_handler.setFormatter(log_format)
-file_handler.setFormatter(log_format)
 
-# Add handlers to the logger
-logger.addHandler(console_handler)
-logger.addHandler(file_handler) 
\ No newline at end of file
+_lock = threading.Lock()
+_listener = None
+_queue_handler = None
+
+
+def run_id() -> str:
+    """Id shared by the controller and all xdist workers of one test run"""
+    return os.environ.setdefault(RUN_ID_ENV, f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.getpid()}")
+
+
+def run_logs_dir() -> Path:
+    """Directory holding the per-process log streams of the current run"""
+    return logs_dir / run_id()
+
+
+class ContextFilter(logging.Filter):
+    """Tag records with the worker and test while still on the calling thread"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.worker = worker_id()
+        record.test_id = current_test_id()
+        return True
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per record"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': record.created,
+            'time': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'worker': getattr(record, 'worker', worker_id()),
+            'test': getattr(record, 'test_id', ''),
+            'message': record.getMessage(),
+        }
+        return json.dumps(entry)
+
+
+class DeferredQueueHandler(logging.Handler):
+    """Forwards records to the logging queue, setting it up on first use"""
+
+    def emit(self, record: logging.LogRecord):
+        configure_logging()
+        _queue_handler.handle(record)
+
+
+def _apply_levels():
+    from saucedemo.config.settings import get_settings
+    settings = get_settings()
+    logging.getLogger(ROOT_LOGGER).setLevel(settings.LOG_LEVEL.upper())
+    for entry in filter(None, (part.strip() for part in settings.LOG_LEVELS.split(','))):
+        name, _, level = entry.partition('=')
+        logging.getLogger(name.strip()).setLevel(level.strip().upper())
+
+
+def configure_logging():
+    """Install the queue handler and start the listener thread (idempotent)"""
+    global _listener, _queue_handler
+    with _lock:
+        if _listener is not None:
+            return
+        run_dir = run_logs_dir()
+        run_dir.mkdir(parents=True, exist_ok=True)
+
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(log_format)
+        file_handler = logging.FileHandler(run_dir / f'{worker_id()}.jsonl')
+        file_handler.setFormatter(JsonLinesFormatter())
+
+        _queue_handler = QueueHandler(queue.SimpleQueue())
+        _queue_handler.addFilter(ContextFilter())
+        _listener = QueueListener(_queue_handler.queue, console_handler, file_handler)
+        _listener.start()
+
+
+def flush_logging():
+    """Write out everything queued so far; logging keeps working afterwards"""
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener.start()
+
+
+def shutdown_logging():
+    """Write out everything queued and close the log files
+
+    Logging again afterwards sets everything up anew, appending to the same files.
+    """
+    global _listener, _queue_handler
+    with _lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+        _queue_handler = None
+
+
+def merge_run_logs(run_dir: Path = None) -> Path:
+    """Merge every process's stream of a run into one file ordered by time"""
+    run_dir = run_dir or run_logs_dir()
+    entries = []
+    for path in sorted(run_dir.glob('*.jsonl')):
+        if path.name == MERGED_LOG:
+            continue
+        with open(path) as f:
+            entries.extend(json.loads(line) for line in f if line.strip())
+    entries.sort(key=lambda entry: entry['ts'])
+    merged_path = run_dir / MERGED_LOG
+    with open(merged_path, 'w') as f:
+        for entry in entries:
+            f.write(json.dumps(entry) + '\n')
+    return merged_path
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger for a framework module; use __name__ so LOG_LEVELS can target it"""
+    if name != ROOT_LOGGER and not name.startswith(ROOT_LOGGER + '.'):
+        name = f'{ROOT_LOGGER}.{name}'
+    return logging.getLogger(name)
+
+
+logger = logging.getLogger(ROOT_LOGGER)
+logger.addHandler(DeferredQueueHandler())
+_apply_levels()
@@ -22,6 +22,50 @@ class Settings(BaseSettings):
     BROWSER: str = os.getenv('BROWSER', 'chromium')
     SLOWMO: int = int(os.getenv('SLOWMO', '0'))
     TIMEOUT: int = int(os.getenv('TIMEOUT', '30000'))
+    ADAPTIVE_TIMEOUTS: bool = os.getenv('ADAPTIVE_TIMEOUTS', 'true').lower() == 'true'
+    ADAPTIVE_TIMEOUTS_HISTORY: str = os.getenv('ADAPTIVE_TIMEOUTS_HISTORY', '.action_latency.json')
+    ADAPTIVE_TIMEOUT_FACTOR: float = float(os.getenv('ADAPTIVE_TIMEOUT_FACTOR', '3'))
+    ADAPTIVE_TIMEOUT_FLOOR: int = int(os.getenv('ADAPTIVE_TIMEOUT_FLOOR', '1000'))
+    ADAPTIVE_TIMEOUT_CEILING: int = int(os.getenv('ADAPTIVE_TIMEOUT_CEILING', '30000'))
+    ADAPTIVE_TIMEOUT_MIN_SAMPLES: int = int(os.getenv('ADAPTIVE_TIMEOUT_MIN_SAMPLES', '5'))
+    LOCAL_SITE: bool = os.getenv('LOCAL_SITE', 'false').lower() == 'true'
+    CONTEXT_MODE: str = os.getenv('CONTEXT_MODE', 'strict')
+    CONTEXT_POOL_MAX_USES: int = int(os.getenv('CONTEXT_POOL_MAX_USES', '50'))
+    BROWSER_SERVER: str = os.getenv('BROWSER_SERVER', 'auto')
+    BROWSER_SERVER_DIR: str = os.getenv('BROWSER_SERVER_DIR', '.browser_servers')
+    BROWSER_SERVER_IDLE_TIMEOUT: float = float(os.getenv('BROWSER_SERVER_IDLE_TIMEOUT', '900'))
+    ASSET_CACHE: str = os.getenv('ASSET_CACHE', 'passthrough')
+    ASSET_CACHE_DIR: str = os.getenv('ASSET_CACHE_DIR', '.asset_cache')
+    ASSET_CACHE_MAX_AGE: float = float(os.getenv('ASSET_CACHE_MAX_AGE', '86400'))
+    ASSET_CACHE_INVALIDATE: str = os.getenv('ASSET_CACHE_INVALIDATE', '')
+    CONCURRENCY: int = int(os.getenv('CONCURRENCY', '0'))
+    FLOW_CHECKPOINTS: bool = os.getenv('FLOW_CHECKPOINTS', 'true').lower() == 'true'
+    
+    # Reporting
+    RESULTS_DIR: str = os.getenv('RESULTS_DIR', 'test-results')
+    DURATIONS_FILE: str = os.getenv('DURATIONS_FILE', '.test_durations.json')
+    LOG_LEVEL: str = os.getenv('LOG_LEVEL', 'INFO')
+    LOG_LEVELS: str = os.getenv('LOG_LEVELS', '')
+    BROWSER_EVENTS_MAX: int = int(os.getenv('BROWSER_EVENTS_MAX', '200'))
+    BROWSER_EVENT_MAX_CHARS: int = int(os.getenv('BROWSER_EVENT_MAX_CHARS', '2000'))
+    WEB_VITALS: bool = os.getenv('WEB_VITALS', 'true').lower() == 'true'
+    WEB_VITALS_HISTORY: str = os.getenv('WEB_VITALS_HISTORY', '.web_vitals.json')
+    WEB_VITALS_REGRESSION_PCT: float = float(os.getenv('WEB_VITALS_REGRESSION_PCT', '20'))
+    WEB_VITALS_MIN_SAMPLES: int = int(os.getenv('WEB_VITALS_MIN_SAMPLES', '5'))
+    SCREENSHOT_DIR: str = os.getenv('SCREENSHOT_DIR', 'screenshots')
+    SCREENSHOT_FORMAT: str = os.getenv('SCREENSHOT_FORMAT', 'png')
+    SCREENSHOT_QUALITY: int = int(os.getenv('SCREENSHOT_QUALITY', '80'))
+    SCREENSHOT_FULL_PAGE: bool = os.getenv('SCREENSHOT_FULL_PAGE', 'false').lower() == 'true'
+    ARTIFACT_WRITERS: int = int(os.getenv('ARTIFACT_WRITERS', '2'))
+    TRACE_MODE: str = os.getenv('TRACE_MODE', 'on-failure')
+    VIDEO_MODE: str = os.getenv('VIDEO_MODE', 'off')
+    TRACE_DIR: str = os.getenv('TRACE_DIR', 'test-results/traces')
+    TRACE_SCREENSHOTS: bool = os.getenv('TRACE_SCREENSHOTS', 'true').lower() == 'true'
+    RECORDING_MAX_MB: int = int(os.getenv('RECORDING_MAX_MB', '50'))
+    RECORDING_TOTAL_MAX_MB: int = int(os.getenv('RECORDING_TOTAL_MAX_MB', '500'))
+    PERF_BUDGETS: str = os.getenv('PERF_BUDGETS', 'perf_budgets.json')
+    PERF_BUDGET_HISTORY: str = os.getenv('PERF_BUDGET_HISTORY', '.perf_budget_history.json')
+    PERF_BUDGET_MIN_SAMPLES: int = int(os.getenv('PERF_BUDGET_MIN_SAMPLES', '5'))
     
     class Config:
         env_file = '.env'
@@ -47,5 +91,47 @@ def get_settings() -> Settings:
             HEADLESS=True,
             BROWSER='chromium',
             SLOWMO=0,
-            TIMEOUT=30000
+            TIMEOUT=30000,
+            ADAPTIVE_TIMEOUTS=True,
+            ADAPTIVE_TIMEOUTS_HISTORY='.action_latency.json',
+            ADAPTIVE_TIMEOUT_FACTOR=3,
+            ADAPTIVE_TIMEOUT_FLOOR=1000,
+            ADAPTIVE_TIMEOUT_CEILING=30000,
+            ADAPTIVE_TIMEOUT_MIN_SAMPLES=5,
+            LOCAL_SITE=False,
+            CONTEXT_MODE='strict',
+            CONTEXT_POOL_MAX_USES=50,
+            BROWSER_SERVER='auto',
+            BROWSER_SERVER_DIR='.browser_servers',
+            BROWSER_SERVER_IDLE_TIMEOUT=900,
+            ASSET_CACHE='passthrough',
+            ASSET_CACHE_DIR='.asset_cache',
+            ASSET_CACHE_MAX_AGE=86400,
+            ASSET_CACHE_INVALIDATE='',
+            CONCURRENCY=0,
+            FLOW_CHECKPOINTS=True,
+            RESULTS_DIR='test-results',
+            DURATIONS_FILE='.test_durations.json',
+            LOG_LEVEL='INFO',
+            LOG_LEVELS='',
+            BROWSER_EVENTS_MAX=200,
+            BROWSER_EVENT_MAX_CHARS=2000,
+            WEB_VITALS=True,
+            WEB_VITALS_HISTORY='.web_vitals.json',
+            WEB_VITALS_REGRESSION_PCT=20,
+            WEB_VITALS_MIN_SAMPLES=5,
+            SCREENSHOT_DIR='screenshots',
+            SCREENSHOT_FORMAT='png',
+            SCREENSHOT_QUALITY=80,
+            SCREENSHOT_FULL_PAGE=False,
+            ARTIFACT_WRITERS=2,
+            TRACE_MODE='on-failure',
+            VIDEO_MODE='off',
+            TRACE_DIR='test-results/traces',
+            TRACE_SCREENSHOTS=True,
+            RECORDING_MAX_MB=50,
+            RECORDING_TOTAL_MAX_MB=500,
+            PERF_BUDGETS='perf_budgets.json',
+            PERF_BUDGET_HISTORY='.perf_budget_history.json',
+            PERF_BUDGET_MIN_SAMPLES=5
         ) 
\ No newline at end of file
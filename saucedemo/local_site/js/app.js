@@ -0,0 +1,323 @@
+// Local stand-in for the SauceDemo v1 client-side app.
+// Session is a cookie, the cart is a list of item ids in localStorage.
+(function () {
+    var PASSWORD = 'secret_sauce';
+    var USERS = ['standard_user', 'locked_out_user', 'problem_user', 'performance_glitch_user'];
+    var SESSION_COOKIE = 'session-username';
+    var CART_KEY = 'cart-contents';
+    var BROKEN_IMAGE = 'img/sl-404.svg';
+
+    var PRODUCTS = [
+        {id: 4, name: 'Sauce Labs Backpack', price: 29.99, image: 'img/sauce-backpack.svg',
+            desc: 'carry.allTheThings() with the sleek, streamlined Sly Pack that melds uncompromising style with unequaled laptop and tablet protection.'},
+        {id: 0, name: 'Sauce Labs Bike Light', price: 9.99, image: 'img/bike-light.svg',
+            desc: "A red light isn't the desired state in testing but it sure helps when riding your bike at night. Water-resistant with 3 lighting modes, 1 AAA battery included."},
+        {id: 1, name: 'Sauce Labs Bolt T-Shirt', price: 15.99, image: 'img/bolt-shirt.svg',
+            desc: 'Get your testing superhero on with the Sauce Labs bolt T-shirt. From American Apparel, 100% ringspun combed cotton, heather gray with red bolt.'},
+        {id: 5, name: 'Sauce Labs Fleece Jacket', price: 49.99, image: 'img/sauce-pullover.svg',
+            desc: "It's not every day that you come across a midweight quarter-zip fleece jacket capable of handling everything from a relaxing day outdoors to a busy day at the office."},
+        {id: 2, name: 'Sauce Labs Onesie', price: 7.99, image: 'img/red-onesie.svg',
+            desc: "Rib snap infant onesie for the junior automation engineer in development. Reinforced 3-snap bottom closure, two-needle hemmed sleeved and bottom won't unravel."},
+        {id: 3, name: 'Test.allTheThings() T-Shirt (Red)', price: 15.99, image: 'img/red-tatt.svg',
+            desc: 'This classic Sauce Labs t-shirt is perfect to wear when cozying up to your keyboard to automate a few tests. Super-soft and comfy ringspun combed cotton.'}
+    ];
+
+    var SORTERS = {
+        az: function (a, b) { return a.name.localeCompare(b.name); },
+        za: function (a, b) { return b.name.localeCompare(a.name); },
+        lohi: function (a, b) { return a.price - b.price; },
+        hilo: function (a, b) { return b.price - a.price; }
+    };
+
+    function currentUser() {
+        var match = document.cookie.match(new RegExp('(?:^|; )' + SESSION_COOKIE + '=([^;]*)'));
+        return match ? decodeURIComponent(match[1]) : null;
+    }
+
+    function setUser(username) {
+        if (username) {
+            document.cookie = SESSION_COOKIE + '=' + encodeURIComponent(username) + '; path=/';
+        } else {
+            document.cookie = SESSION_COOKIE + '=; path=/; expires=Thu, 01 Jan 1970 00:00:00 GMT';
+        }
+    }
+
+    function getCart() {
+        try {
+            return JSON.parse(window.localStorage.getItem(CART_KEY)) || [];
+        } catch (e) {
+            return [];
+        }
+    }
+
+    function saveCart(ids) {
+        if (ids.length) {
+            window.localStorage.setItem(CART_KEY, JSON.stringify(ids));
+        } else {
+            window.localStorage.removeItem(CART_KEY);
+        }
+        updateBadge();
+    }
+
+    function addToCart(id) {
+        var ids = getCart();
+        if (ids.indexOf(id) === -1) {
+            ids.push(id);
+        }
+        saveCart(ids);
+    }
+
+    function removeFromCart(id) {
+        saveCart(getCart().filter(function (itemId) { return itemId !== id; }));
+    }
+
+    function findProduct(id) {
+        for (var i = 0; i < PRODUCTS.length; i++) {
+            if (PRODUCTS[i].id === id) {
+                return PRODUCTS[i];
+            }
+        }
+        return null;
+    }
+
+    function imageFor(product) {
+        return currentUser() === 'problem_user' ? BROKEN_IMAGE : product.image;
+    }
+
+    function formatPrice(price) {
+        return '$' + price.toFixed(2);
+    }
+
+    function escapeHtml(text) {
+        var div = document.createElement('div');
+        div.textContent = text;
+        return div.innerHTML;
+    }
+
+    function updateBadge() {
+        var link = document.querySelector('.shopping_cart_link');
+        if (!link) {
+            return;
+        }
+        var badge = link.querySelector('.shopping_cart_badge');
+        var count = getCart().length;
+        if (count === 0) {
+            if (badge) {
+                badge.remove();
+            }
+            return;
+        }
+        if (!badge) {
+            badge = document.createElement('span');
+            badge.className = 'fa-layers-counter shopping_cart_badge';
+            link.appendChild(badge);
+        }
+        badge.textContent = String(count);
+    }
+
+    function renderHeader() {
+        var header = document.getElementById('header_container');
+        if (!header) {
+            return;
+        }
+        header.innerHTML =
+            '<div class="bm-burger-button"><button type="button">Open Menu</button></div>' +
+            '<nav class="bm-menu-wrap" hidden>' +
+            '<a id="inventory_sidebar_link" class="bm-item menu-item" href="./inventory.html">All Items</a>' +
+            '<a id="logout_sidebar_link" class="bm-item menu-item" href="./index.html">Logout</a>' +
+            '<a id="reset_sidebar_link" class="bm-item menu-item" href="#">Reset App State</a>' +
+            '<button type="button" class="bm-cross-button">Close Menu</button>' +
+            '</nav>' +
+            '<div class="app_logo"></div>' +
+            '<div id="shopping_cart_container" class="shopping_cart_container">' +
+            '<a href="./cart.html" class="shopping_cart_link"></a></div>';
+
+        var menu = header.querySelector('.bm-menu-wrap');
+        header.querySelector('.bm-burger-button').addEventListener('click', function () {
+            menu.hidden = false;
+        });
+        header.querySelector('.bm-cross-button').addEventListener('click', function () {
+            menu.hidden = true;
+        });
+        document.getElementById('logout_sidebar_link').addEventListener('click', function () {
+            setUser(null);
+        });
+        document.getElementById('reset_sidebar_link').addEventListener('click', function (event) {
+            event.preventDefault();
+            saveCart([]);
+            window.location.reload();
+        });
+        updateBadge();
+    }
+
+    function cartButton(button, id) {
+        var inCart = getCart().indexOf(id) !== -1;
+        button.textContent = inCart ? 'REMOVE' : 'ADD TO CART';
+        button.className = (inCart ? 'btn_secondary' : 'btn_primary') + ' btn_inventory';
+    }
+
+    function bindCartButton(button, id) {
+        cartButton(button, id);
+        button.addEventListener('click', function () {
+            if (getCart().indexOf(id) === -1) {
+                addToCart(id);
+            } else {
+                removeFromCart(id);
+            }
+            cartButton(button, id);
+        });
+    }
+
+    function cartItemHtml(product, withRemove) {
+        return '<div class="cart_item" data-item-id="' + product.id + '">' +
+            '<div class="cart_quantity">1</div>' +
+            '<div class="cart_item_label">' +
+            '<a href="./inventory-item.html?id=' + product.id + '" id="item_' + product.id + '_title_link">' +
+            '<div class="inventory_item_name">' + escapeHtml(product.name) + '</div></a>' +
+            '<div class="inventory_item_desc">' + escapeHtml(product.desc) + '</div>' +
+            '<div class="item_pricebar"><div class="inventory_item_price">' + formatPrice(product.price) + '</div>' +
+            (withRemove ? '<button class="btn_secondary cart_button">REMOVE</button>' : '') +
+            '</div></div></div>';
+    }
+
+    var pages = {
+        login: function () {
+            var form = document.getElementById('login_form');
+            var error = document.getElementById('login_error');
+            form.addEventListener('submit', function (event) {
+                event.preventDefault();
+                var username = document.getElementById('user-name').value;
+                var password = document.getElementById('password').value;
+                var message = null;
+                if (!username) {
+                    message = 'Epic sadface: Username is required';
+                } else if (!password) {
+                    message = 'Epic sadface: Password is required';
+                } else if (USERS.indexOf(username) === -1 || password !== PASSWORD) {
+                    message = 'Epic sadface: Username and password do not match any user in this service';
+                } else if (username === 'locked_out_user') {
+                    message = 'Epic sadface: Sorry, this user has been locked out.';
+                }
+                if (message) {
+                    error.innerHTML = '<h3 data-test="error">' + escapeHtml(message) + '</h3>';
+                    return;
+                }
+                setUser(username);
+                window.location.href = './inventory.html';
+            });
+        },
+
+        inventory: function () {
+            var list = document.querySelector('.inventory_list');
+            var sort = document.querySelector('.product_sort_container');
+
+            function render() {
+                var products = PRODUCTS.slice().sort(SORTERS[sort.value]);
+                list.innerHTML = products.map(function (product) {
+                    var link = './inventory-item.html?id=' + product.id;
+                    return '<div class="inventory_item">' +
+                        '<div class="inventory_item_img"><a href="' + link + '" id="item_' + product.id + '_img_link">' +
+                        '<img class="inventory_item_img" src="' + imageFor(product) + '" alt="' + escapeHtml(product.name) + '"></a></div>' +
+                        '<div class="inventory_item_label"><a href="' + link + '" id="item_' + product.id + '_title_link">' +
+                        '<div class="inventory_item_name">' + escapeHtml(product.name) + '</div></a>' +
+                        '<div class="inventory_item_desc">' + escapeHtml(product.desc) + '</div></div>' +
+                        '<div class="pricebar"><div class="inventory_item_price">' + formatPrice(product.price) + '</div>' +
+                        '<button data-item-id="' + product.id + '"></button></div>' +
+                        '</div>';
+                }).join('');
+                list.querySelectorAll('button[data-item-id]').forEach(function (button) {
+                    bindCartButton(button, Number(button.getAttribute('data-item-id')));
+                });
+            }
+
+            sort.addEventListener('change', render);
+            render();
+        },
+
+        item: function () {
+            var id = Number(new URLSearchParams(window.location.search).get('id'));
+            var product = findProduct(id);
+            var container = document.querySelector('.inventory_details_container');
+            if (!product) {
+                container.innerHTML = '<div class="inventory_details_name">ITEM NOT FOUND</div>';
+                return;
+            }
+            container.innerHTML =
+                '<button class="inventory_details_back_button">&lt;- Back</button>' +
+                '<img class="inventory_details_img" src="' + imageFor(product) + '" alt="' + escapeHtml(product.name) + '">' +
+                '<div class="inventory_details_desc_container">' +
+                '<div class="inventory_details_name">' + escapeHtml(product.name) + '</div>' +
+                '<div class="inventory_details_desc">' + escapeHtml(product.desc) + '</div>' +
+                '<div class="inventory_details_price">' + formatPrice(product.price) + '</div>' +
+                '<button data-item-id="' + product.id + '"></button></div>';
+            bindCartButton(container.querySelector('button[data-item-id]'), product.id);
+            container.querySelector('.inventory_details_back_button').addEventListener('click', function () {
+                window.location.href = './inventory.html';
+            });
+        },
+
+        cart: function () {
+            var list = document.querySelector('.cart_list');
+            list.insertAdjacentHTML('beforeend', getCart().map(function (id) {
+                return cartItemHtml(findProduct(id), true);
+            }).join(''));
+            list.querySelectorAll('.cart_item').forEach(function (item) {
+                item.querySelector('button').addEventListener('click', function () {
+                    removeFromCart(Number(item.getAttribute('data-item-id')));
+                    item.remove();
+                });
+            });
+        },
+
+        checkoutStepOne: function () {
+            var form = document.getElementById('checkout_info_form');
+            var error = document.getElementById('checkout_error');
+            form.addEventListener('submit', function (event) {
+                event.preventDefault();
+                var message = null;
+                if (!document.getElementById('first-name').value) {
+                    message = 'Error: First Name is required';
+                } else if (!document.getElementById('last-name').value) {
+                    message = 'Error: Last Name is required';
+                } else if (!document.getElementById('postal-code').value) {
+                    message = 'Error: Postal Code is required';
+                }
+                if (message) {
+                    error.innerHTML = '<h3 data-test="error">' + escapeHtml(message) + '</h3>';
+                    return;
+                }
+                window.location.href = './checkout-step-two.html';
+            });
+        },
+
+        checkoutStepTwo: function () {
+            var products = getCart().map(findProduct);
+            var subtotal = products.reduce(function (sum, product) { return sum + product.price; }, 0);
+            var tax = Math.round(subtotal * 8) / 100;
+            document.querySelector('.cart_list').insertAdjacentHTML('beforeend', products.map(function (product) {
+                return cartItemHtml(product, false);
+            }).join(''));
+            document.querySelector('.summary_subtotal_label').textContent = 'Item total: ' + formatPrice(subtotal);
+            document.querySelector('.summary_tax_label').textContent = 'Tax: ' + formatPrice(tax);
+            document.querySelector('.summary_total_label').textContent = 'Total: ' + formatPrice(subtotal + tax);
+            document.querySelector('a.cart_button').addEventListener('click', function () {
+                saveCart([]);
+            });
+        },
+
+        checkoutComplete: function () {}
+    };
+
+    window.SauceDemo = {
+        products: PRODUCTS,
+        getCart: getCart
+    };
+
+    document.addEventListener('DOMContentLoaded', function () {
+        renderHeader();
+        var page = document.body.getAttribute('data-page');
+        if (pages[page]) {
+            pages[page]();
+        }
+    });
+})();
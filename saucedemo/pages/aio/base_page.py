@@ -0,0 +1,19 @@
+"""asyncio counterpart of saucedemo.pages.base_page
+
+Page objects here drive a playwright.async_api Page, so several flows can run
+concurrently in one event loop. They inherit every method of the sync page
+objects, written once as steps (see saucedemo.utils.steps), and await the
+Playwright calls those steps make, so each method returns a coroutine here.
+"""
+from playwright.async_api import Page
+from saucedemo.pages.base_page import PageCore
+from saucedemo.utils.dom_watcher import AsyncDomWatcher
+from saucedemo.utils.steps import run_steps_async
+
+class AsyncBasePage(PageCore):
+    """Page object driving a playwright.async_api Page"""
+    dom_watcher = AsyncDomWatcher
+    run_steps = staticmethod(run_steps_async)
+
+    def __init__(self, page: Page):
+        super().__init__(page)
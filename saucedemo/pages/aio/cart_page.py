@@ -0,0 +1,5 @@
+from .base_page import AsyncBasePage
+from saucedemo.pages.cart_page import CartSelectors
+
+class AsyncCartPage(CartSelectors, AsyncBasePage):
+    """Cart page on a playwright.async_api Page"""
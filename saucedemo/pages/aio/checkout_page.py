@@ -0,0 +1,5 @@
+from .base_page import AsyncBasePage
+from saucedemo.pages.checkout_page import CheckoutSelectors
+
+class AsyncCheckoutPage(CheckoutSelectors, AsyncBasePage):
+    """Checkout pages on a playwright.async_api Page"""
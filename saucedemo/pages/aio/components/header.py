@@ -0,0 +1,5 @@
+from saucedemo.pages.aio.base_page import AsyncBasePage
+from saucedemo.pages.components.header import HeaderSelectors
+
+class AsyncHeader(HeaderSelectors, AsyncBasePage):
+    """Page header on a playwright.async_api Page"""
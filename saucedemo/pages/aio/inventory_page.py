@@ -0,0 +1,5 @@
+from .base_page import AsyncBasePage
+from saucedemo.pages.inventory_page import InventorySelectors
+
+class AsyncInventoryPage(InventorySelectors, AsyncBasePage):
+    """Inventory page on a playwright.async_api Page"""
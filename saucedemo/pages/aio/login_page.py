@@ -0,0 +1,5 @@
+from .base_page import AsyncBasePage
+from saucedemo.pages.login_page import LoginSelectors
+
+class AsyncLoginPage(LoginSelectors, AsyncBasePage):
+    """Login page on a playwright.async_api Page"""
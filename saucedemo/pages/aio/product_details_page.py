@@ -0,0 +1,5 @@
+from .base_page import AsyncBasePage
+from saucedemo.pages.product_details_page import ProductDetailsSelectors
+
+class AsyncProductDetailsPage(ProductDetailsSelectors, AsyncBasePage):
+    """Product details page on a playwright.async_api Page"""
@@ -1,60 +1,213 @@
+import re
 from playwright.sync_api import Page, TimeoutError
-from config.logger import logger
-from typing import Optional
+from saucedemo.config.logger import get_logger
+from saucedemo.pages.selectors import locators_for
+from saucedemo.pages.snapshot import SNAPSHOT_SCRIPT, PageSnapshot
+from saucedemo.utils.action_timings import timed_action
+from saucedemo.utils.adaptive_timeouts import adaptive_timeout
+from saucedemo.utils.browser_matrix import page_engine
+from saucedemo.utils.dom_watcher import DomWatcher
+from saucedemo.utils.steps import run_steps, stepwise
+from saucedemo.utils.web_vitals import records_navigation
+from typing import Optional, Union
 
-class BasePage:
-    def __init__(self, page: Page):
+logger = get_logger(__name__)
+
+# Evaluated in the page on every animation frame; returns the name of the
+# first condition that holds, or false to keep waiting
+RACE_SCRIPT = """conditions => {
+    const isVisible = element => !!element &&
+        !!(element.offsetWidth || element.offsetHeight || element.getClientRects().length);
+    const find = selector => selector.startsWith('//')
+        ? document.evaluate(selector, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+        : document.querySelector(selector);
+    for (const [name, kind, value] of conditions) {
+        let met = false;
+        if (kind === 'selector') {
+            met = isVisible(find(value));
+        } else if (kind === 'url') {
+            met = window.location.href === value;
+        } else if (kind === 'url_pattern') {
+            met = new RegExp(value).test(window.location.href);
+        } else if (kind === 'predicate') {
+            const result = (0, eval)(value);
+            met = typeof result === 'function' ? result() : result;
+        }
+        if (met) {
+            return name;
+        }
+    }
+    return false;
+}"""
+
+# Default wait budget in milliseconds for page-object waits
+DEFAULT_TIMEOUT = 10000
+# Default for clicks, fills and other single-element actions
+ACTION_TIMEOUT = 5000
+
+
+def race_conditions(outcomes: dict[str, tuple[str, Union[str, re.Pattern]]]) -> list[list[str]]:
+    """Translate wait_for_any outcomes into the [name, kind, value] list RACE_SCRIPT expects"""
+    conditions = []
+    for name, (kind, value) in outcomes.items():
+        if kind == 'url' and isinstance(value, re.Pattern):
+            kind, value = 'url_pattern', value.pattern
+        elif kind not in ('selector', 'url', 'predicate'):
+            raise ValueError(f"Unknown condition kind '{kind}' for outcome '{name}'")
+        conditions.append([name, kind, value])
+    return conditions
+
+class PageCore:
+    """Page-object methods shared by BasePage and AsyncBasePage
+    
+    Methods that talk to the page are written once as steps (see
+    saucedemo.utils.steps): BasePage runs them on a playwright.sync_api page,
+    AsyncBasePage awaits them on a playwright.async_api page.
+    """
+    dom_watcher = DomWatcher
+    
+    def __init__(self, page):
         self.page = page
-        self.default_timeout = 10000  # 10 seconds
+        self.default_timeout = DEFAULT_TIMEOUT  # 10 seconds
+        self.dom = self.dom_watcher(page)
+        self.locators = locators_for(page)
+        
+    def locator(self, selector: str):
+        """Cached Locator for the selector, shared by every page object on this page"""
+        return self.locators.get(selector)
+        
+    def timeout_for(self, method: str, selector: str, timeout: int = None, default: int = None):
+        """Context manager yielding the timeout for a wait, learned from its past latency
         
+        An explicit timeout wins; otherwise see saucedemo.utils.adaptive_timeouts.
+        """
+        return adaptive_timeout(
+            type(self).__name__, method, selector, timeout, default or self.default_timeout, page_engine(self.page)
+        )
+        
+    @stepwise
+    @records_navigation
+    @timed_action
     def navigate_to(self, url: str):
         """Navigate to the specified URL"""
         logger.info(f"Navigating to {url}")
-        self.page.goto(url)
+        yield self.page.goto(url)
         
-    def click(self, selector: str, timeout: int = 5000):
+    @stepwise
+    @timed_action
+    def click(self, selector: str, timeout: int = None):
         """Click an element with logging and error handling"""
         try:
             logger.info(f"Clicking element: {selector}")
-            self.page.click(selector, timeout=timeout)
+            with self.timeout_for("click", selector, timeout, ACTION_TIMEOUT) as budget:
+                yield self.page.click(selector, timeout=budget)
         except Exception as e:
             logger.error(f"Failed to click element {selector}: {str(e)}")
             raise
         
-    def fill(self, selector: str, value: str, timeout: int = 5000):
+    @stepwise
+    @timed_action
+    def fill(self, selector: str, value: str, timeout: int = None):
         """Fill a form field with logging and error handling"""
         try:
             logger.info(f"Filling {selector} with value: {value}")
-            self.page.fill(selector, value, timeout=timeout)
+            with self.timeout_for("fill", selector, timeout, ACTION_TIMEOUT) as budget:
+                yield self.page.fill(selector, value, timeout=budget)
         except Exception as e:
             logger.error(f"Failed to fill {selector}: {str(e)}")
             raise
         
+    @stepwise
+    @timed_action
     def wait_for_selector(self, selector: str, timeout: int = None) -> bool:
         """Wait for element to be present"""
         try:
-            self.page.wait_for_selector(selector, timeout=timeout or self.default_timeout)
+            with self.timeout_for("wait_for_selector", selector, timeout) as budget:
+                yield self.page.wait_for_selector(selector, timeout=budget)
             return True
         except TimeoutError:
             logger.warning(f"Element not found: {selector}")
             return False
             
+    @stepwise
+    @timed_action
+    def wait_for_state(self, watch: str, selector: str, value: Optional[str], timeout: int = None) -> Optional[str]:
+        """Wait until a watched element's text is value (None: no such element), without polling
+        
+        The page's MutationObserver settles the wait on the mutation that reaches
+        the state; see saucedemo.utils.dom_watcher.
+        """
+        with self.timeout_for("wait_for_state", watch, timeout, ACTION_TIMEOUT) as budget:
+            return (yield self.dom.wait_for(watch, selector, value, budget))
+            
+    @stepwise
+    @timed_action
+    def wait_for_any(self, outcomes: dict[str, tuple[str, Union[str, re.Pattern]]],
+                     timeout: int = None) -> str:
+        """Wait for the first of several outcomes and return the name of the one that won
+        
+        Args:
+            outcomes: Outcome name mapped to a (kind, value) condition, where kind is
+                'selector' (element visible), 'url' (exact URL or compiled regex) or
+                'predicate' (JS expression or function). Earlier entries win ties.
+            timeout: Maximum time to wait in milliseconds
+            
+        Returns:
+            str: Name of the first outcome whose condition holds
+        """
+        try:
+            with self.timeout_for("wait_for_any", ",".join(outcomes), timeout) as budget:
+                handle = yield self.page.wait_for_function(
+                    RACE_SCRIPT,
+                    arg=race_conditions(outcomes),
+                    timeout=budget
+                )
+        except TimeoutError:
+            logger.error(f"None of the expected outcomes occurred: {', '.join(outcomes)}")
+            raise
+        winner = yield handle.json_value()
+        logger.info(f"Outcome reached: {winner}")
+        return winner
+        
+    @stepwise
+    @timed_action
     def get_text(self, selector: str, timeout: int = None) -> Optional[str]:
         """Get text content with better error handling"""
         try:
-            if self.wait_for_selector(selector, timeout):
-                element = self.page.locator(selector)
-                return element.text_content()
+            if (yield self.wait_for_selector(selector, timeout)):
+                return (yield self.locator(selector).text_content())
             return None
         except Exception as e:
             logger.error(f"Failed to get text from {selector}: {str(e)}")
             return None
             
+    @stepwise
     def get_element_text_safe(self, selector: str, default: str = "") -> str:
         """Safely get element text with default value"""
-        text = self.get_text(selector)
+        text = yield self.get_text(selector)
         return text if text is not None else default
         
+    @stepwise
+    @timed_action
+    def snapshot_items(self, item_selector: str, name_selector: str = ".inventory_item_name",
+                       price_selector: str = ".inventory_item_price",
+                       badge_selector: str = ".shopping_cart_badge") -> PageSnapshot:
+        """Collect names, prices, button labels, image srcs and the cart badge in one call"""
+        raw = yield self.locator(item_selector).evaluate_all(
+            SNAPSHOT_SCRIPT,
+            {"name": name_selector, "price": price_selector, "badge": badge_selector}
+        )
+        return PageSnapshot.from_raw(raw)
+        
+    @stepwise
+    @timed_action
     def is_visible(self, selector: str) -> bool:
         """Check if an element is visible"""
-        return self.page.locator(selector).is_visible() 
\ No newline at end of file
+        return (yield self.locator(selector).is_visible())
+
+class BasePage(PageCore):
+    """Page object driving a playwright.sync_api Page"""
+    run_steps = staticmethod(run_steps)
+    
+    def __init__(self, page: Page):
+        super().__init__(page)
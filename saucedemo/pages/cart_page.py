@@ -1,45 +1,70 @@
 from .base_page import BasePage
-from saucedemo.config.logger import logger
+from saucedemo.config.logger import get_logger
+from saucedemo.pages.selectors import PageSelectors, selector
+from saucedemo.utils.action_timings import timed_action
+from saucedemo.utils.steps import stepwise
+from saucedemo.utils.web_vitals import records_navigation
 from saucedemo.config.constants import URLs
+from saucedemo.pages.snapshot import PageSnapshot
 from playwright.sync_api import Page
+from typing import Optional
 
-class CartPage(BasePage):
-    def __init__(self, page: Page):
-        super().__init__(page)
-        self.checkout_button = "a.checkout_button"
-        self.cart_badge = ".shopping_cart_badge"
-        self.remove_button = lambda item: f"//div[text()='{item}']/ancestor::div[@class='cart_item']//button[text()='REMOVE']"
-        self.cart_items = ".cart_item"
-        self.item_price = ".inventory_item_price"
-        self.url = URLs.CART
+logger = get_logger(__name__)
+
+class CartSelectors(PageSelectors, page="cart"):
+    """Selectors and steps shared by CartPage and AsyncCartPage"""
+    
+    @property
+    def url(self) -> str:
+        return URLs.CART
+        
+    @staticmethod
+    def remove_button(item: str) -> str:
+        return selector("cart.remove_button", item)
         
+    @staticmethod
+    def badge_text(count: int) -> Optional[str]:
+        """Badge text for a cart count, None when the badge is hidden"""
+        return str(count) if count > 0 else None
+        
+    @staticmethod
+    def parse_cart_count(text: str) -> int:
+        """Badge text as a number, 0 when it is empty or not a number"""
+        try:
+            return int(text or '0')
+        except (ValueError, TypeError) as e:
+            logger.warning(f"Invalid cart count value: {e}")
+            return 0
+            
+    @stepwise
     def navigate(self):
         """Navigate to cart page"""
-        self.page.goto(self.url)
+        yield self.navigate_to(self.url)
         
+    @stepwise
+    @records_navigation
+    @timed_action
     def proceed_to_checkout(self):
         """Click the checkout button"""
         logger.info("Proceeding to checkout")
         # Document the security issue: Checkout is possible with empty cart
         # This should be fixed in future versions
-        if self.get_cart_count() == 0:
+        if (yield self.get_cart_count()) == 0:
             logger.warning("Security/UX Issue: Proceeding to checkout with empty cart")
-        self.click(self.checkout_button)
+        yield self.click(self.checkout_button)
         # Wait for navigation to checkout page
-        self.page.wait_for_url(URLs.CHECKOUT_STEP_ONE)
+        yield self.wait_for_any({"checkout": ("url", URLs.CHECKOUT_STEP_ONE)})
         
+    @stepwise
     def get_cart_count(self) -> int:
         """Get number of items in cart with better error handling"""
-        badge = self.page.locator(self.cart_badge)
-        if badge.count() == 0:
-            return 0
-            
-        try:
-            return int(badge.text_content() or '0')
-        except (ValueError, TypeError) as e:
-            logger.warning(f"Invalid cart count value: {e}")
+        badge = self.locator(self.cart_badge)
+        if (yield badge.count()) == 0:
             return 0
+        return self.parse_cart_count((yield badge.text_content()))
             
+    @stepwise
+    @timed_action
     def remove_item(self, item_name: str) -> bool:
         """Remove an item from the cart
         
@@ -50,37 +75,44 @@ class CartPage(BasePage):
             bool: True if item was removed, False if item wasn't found
         """
         logger.info(f"Attempting to remove {item_name} from cart")
-        remove_button = self.page.locator(self.remove_button(item_name))
+        remove_button = self.locator(self.remove_button(item_name))
         
-        if remove_button.count() == 0:
+        if (yield remove_button.count()) == 0:
             logger.warning(f"Item '{item_name}' not found in cart")
             return False
         
         # Get current cart count
-        initial_count = self.get_cart_count()
+        initial_count = yield self.get_cart_count()
         
         # Click remove and wait for cart count to update if cart isn't empty
-        remove_button.click()
+        yield remove_button.click()
         if initial_count > 0:
             try:
-                self.page.wait_for_function(
-                    f"count => !document.querySelector('.shopping_cart_badge') || \
-                    document.querySelector('.shopping_cart_badge').textContent === '{initial_count - 1}'",
-                    timeout=5000
-                )
+                yield self.wait_for_state("cart_badge", self.cart_badge, self.badge_text(initial_count - 1))
             except Exception as e:
                 logger.error(f"Error waiting for cart count update: {e}")
                 
         return True
         
+    @stepwise
+    def snapshot(self) -> PageSnapshot:
+        """Get names, prices and badge count of the cart in one call"""
+        return (yield self.snapshot_items(self.cart_items))
+        
+    @stepwise
     def get_cart_total(self) -> float:
-        """Calculate total price of items in cart"""
-        prices = self.page.locator(self.item_price).all()
-        total = sum(float(price.text_content().replace('$', '')) for price in prices)
+        """Calculate total price of items in cart; raises ValueError if an item shows no price"""
+        total = sum((yield self.snapshot()).require_prices())
         logger.info(f"Cart total: ${total}")
         return total
         
+    @stepwise
     def is_checkout_enabled(self) -> bool:
         """Check if checkout button is enabled"""
-        checkout_button = self.page.locator(self.checkout_button)
-        return checkout_button.is_enabled() if checkout_button.count() > 0 else False
+        checkout_button = self.locator(self.checkout_button)
+        if (yield checkout_button.count()) == 0:
+            return False
+        return (yield checkout_button.is_enabled())
+
+class CartPage(CartSelectors, BasePage):
+    """Cart page on a playwright.sync_api Page"""
@@ -1,50 +1,71 @@
 from .base_page import BasePage
-from saucedemo.config.logger import logger
+from saucedemo.config.logger import get_logger
+from saucedemo.pages.selectors import PageSelectors
+from saucedemo.utils.action_timings import timed_action
+from saucedemo.utils.steps import stepwise
+from saucedemo.utils.web_vitals import records_navigation
 from saucedemo.config.constants import URLs
 from playwright.sync_api import Page
 
-class CheckoutPage(BasePage):
-    def __init__(self, page: Page):
-        super().__init__(page)
-        self.first_name_input = "input[data-test='firstName']"
-        self.last_name_input = "input[data-test='lastName']"
-        self.postal_code_input = "input[data-test='postalCode']"
-        self.continue_button = "input.cart_button"
-        self.finish_button = "a.cart_button"
-        self.confirmation_message = "h2.complete-header"
-        self.error_message = "h3[data-test='error']"
+logger = get_logger(__name__)
+
+class CheckoutSelectors(PageSelectors, page="checkout"):
+    """Selectors, wait outcomes and steps shared by CheckoutPage and AsyncCheckoutPage"""
+    
+    def shipping_fields(self, first_name: str, last_name: str, postal_code: str) -> list[tuple[str, str]]:
+        """(selector, value) pairs for the shipping fields that were given a value"""
+        fields = [
+            (self.first_name_input, first_name),
+            (self.last_name_input, last_name),
+            (self.postal_code_input, postal_code)
+        ]
+        return [(selector, value) for selector, value in fields if value]
+        
+    def continue_outcomes(self) -> dict:
+        """Stop at a validation error, otherwise wait for navigation to step two"""
+        return {
+            "error": ("selector", self.error_message),
+            "step_two": ("url", URLs.CHECKOUT_STEP_TWO)
+        }
         
+    @stepwise
+    @timed_action
     def fill_shipping_details(self, first_name: str = '', last_name: str = '', postal_code: str = ''):
         """Fill in shipping information with validation"""
         logger.info(f"Filling shipping details for {first_name} {last_name}")
-        if first_name:
-            self.fill(self.first_name_input, first_name)
-        if last_name:
-            self.fill(self.last_name_input, last_name)
-        if postal_code:
-            self.fill(self.postal_code_input, postal_code)
+        for selector, value in self.shipping_fields(first_name, last_name, postal_code):
+            yield self.fill(selector, value)
             
+    @stepwise
     def fill_checkout_info(self, first_name: str = '', last_name: str = '', postal_code: str = ''):
         """Alias for fill_shipping_details for compatibility"""
-        self.fill_shipping_details(first_name, last_name, postal_code)
+        yield self.fill_shipping_details(first_name, last_name, postal_code)
         
-    def continue_checkout(self):
-        """Click continue button"""
+    @stepwise
+    @records_navigation
+    @timed_action
+    def continue_checkout(self) -> str:
+        """Click continue button and return the outcome ("error" or "step_two")"""
         logger.info("Continuing checkout process")
-        self.click(self.continue_button)
-        # Only wait for navigation if there's no error
-        if not self.get_error_message():
-            self.page.wait_for_url(URLs.CHECKOUT_STEP_TWO)
+        yield self.click(self.continue_button)
+        return (yield self.wait_for_any(self.continue_outcomes()))
         
+    @stepwise
+    @records_navigation
+    @timed_action
     def finish_checkout(self):
         """Click finish button"""
         logger.info("Finishing checkout process")
-        self.click(self.finish_button)
-        self.page.wait_for_url(URLs.CHECKOUT_COMPLETE)
+        yield self.click(self.finish_button)
+        yield self.page.wait_for_url(URLs.CHECKOUT_COMPLETE)
         
     def get_confirmation_message(self):
-        return self.page.locator(".complete-header") 
+        return self.locator(self.confirmation_message)
         
+    @stepwise
     def get_error_message(self) -> str:
         """Get the error message text"""
-        return self.get_text(self.error_message)
+        return (yield self.get_text(self.error_message))
+
+class CheckoutPage(CheckoutSelectors, BasePage):
+    """Checkout pages on a playwright.sync_api Page"""
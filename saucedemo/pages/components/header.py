@@ -1,18 +1,24 @@
 from saucedemo.pages.base_page import BasePage
-from saucedemo.config.logger import logger
+from saucedemo.config.logger import get_logger
+from saucedemo.pages.selectors import PageSelectors
+from saucedemo.utils.steps import stepwise
 
-class Header(BasePage):
-    def __init__(self, page):
-        super().__init__(page)
-        self.menu_button = ".bm-burger-button"
-        self.logout_link = "#logout_sidebar_link"
-        
+logger = get_logger(__name__)
+
+class HeaderSelectors(PageSelectors, page="header"):
+    """Selectors and steps shared by Header and AsyncHeader"""
+    
+    @stepwise
     def open_menu(self):
         """Open the side menu"""
         logger.info("Opening side menu")
-        self.click(self.menu_button)
+        yield self.click(self.menu_button)
         
+    @stepwise
     def logout(self):
         """Click the logout link"""
         logger.info("Clicking logout")
-        self.click(self.logout_link)
+        yield self.click(self.logout_link)
+
+class Header(HeaderSelectors, BasePage):
+    """Page header on a playwright.sync_api Page"""
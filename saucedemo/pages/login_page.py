@@ -1,47 +1,62 @@
 from .base_page import BasePage
 from saucedemo.config.constants import URLs, Credentials
-from saucedemo.config.logger import logger
+from saucedemo.config.logger import get_logger
+from saucedemo.pages.selectors import PageSelectors
+from saucedemo.utils.action_timings import timed_action
+from saucedemo.utils.steps import stepwise
+from saucedemo.utils.web_vitals import records_navigation
 from playwright.sync_api import Page
 
-class LoginPage(BasePage):
-    def __init__(self, page: Page):
-        super().__init__(page)
-        self.username_input = "#user-name"
-        self.password_input = "#password"
-        self.login_button = "#login-button"
-        self.error_message = "[data-test='error']"
-        self.url = URLs.LOGIN
+logger = get_logger(__name__)
+
+class LoginSelectors(PageSelectors, page="login"):
+    """Selectors and steps shared by LoginPage and AsyncLoginPage"""
+    
+    @property
+    def url(self) -> str:
+        return URLs.LOGIN
+        
+    def login_outcomes(self) -> dict:
+        """Either an error message or successful navigation, whichever comes first"""
+        return {
+            "error": ("selector", self.error_message),
+            "inventory": ("url", URLs.INVENTORY)
+        }
         
+    @stepwise
     def navigate(self):
         """Navigate to login page"""
-        self.page.goto(self.url)
+        yield self.navigate_to(self.url)
         
-    def login(self, username: str, password: str):
-        """Login with given credentials"""
+    @stepwise
+    @records_navigation
+    @timed_action
+    def login(self, username: str, password: str) -> str:
+        """Login with given credentials and return the outcome ("error" or "inventory")"""
         logger.info(f"Logging in with username: {username}")
-        self.navigate()
-        self.fill(self.username_input, username)
-        self.fill(self.password_input, password)
-        self.click(self.login_button)
-        # Wait for either error message or successful navigation
-        try:
-            error = self.page.wait_for_selector(self.error_message, timeout=2000)
-            if error:
-                return
-        except:
-            # No error found, wait for navigation
-            self.page.wait_for_url(URLs.INVENTORY)
+        yield self.navigate()
+        yield self.fill(self.username_input, username)
+        yield self.fill(self.password_input, password)
+        yield self.click(self.login_button)
+        return (yield self.wait_for_any(self.login_outcomes()))
         
+    @stepwise
     def get_error_message(self) -> str:
         """Get error message with better error handling"""
-        return self.get_element_text_safe("[data-test='error']", "No error message found")
+        return (yield self.get_element_text_safe(self.error_message, "No error message found"))
         
     def get_current_url(self) -> str:
         """Get the current page URL"""
         return self.page.url 
 
+    @stepwise
+    @records_navigation
+    @timed_action
     def logout(self):
         """Logout the current user"""
-        self.click(".bm-burger-button")  
-        self.click("#logout_sidebar_link")  
-        self.page.wait_for_url(self.url)
\ No newline at end of file
+        yield self.click(self.menu_button)
+        yield self.click(self.logout_link)
+        yield self.page.wait_for_url(self.url)
+
+class LoginPage(LoginSelectors, BasePage):
+    """Login page on a playwright.sync_api Page"""
\ No newline at end of file
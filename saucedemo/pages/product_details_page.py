@@ -1,45 +1,59 @@
 from .base_page import BasePage
-from saucedemo.config.logger import logger
+from saucedemo.config.logger import get_logger
+from saucedemo.pages.selectors import PageSelectors
+from saucedemo.utils.action_timings import timed_action
+from saucedemo.utils.steps import stepwise
+from saucedemo.utils.web_vitals import records_navigation
 
-class ProductDetailsPage(BasePage):
-    def __init__(self, page):
-        super().__init__(page)
-        self.remove_button = "button.btn_secondary"
-        self.back_button = "button.inventory_details_back_button"
-        self.backpack_image = "#item_4_img_link img"
-        self.product_name = ".inventory_details_name"
-        self.product_price = ".inventory_details_price"
-        self.product_description = ".inventory_details_desc"
-        
-        
+logger = get_logger(__name__)
+
+class ProductDetailsSelectors(PageSelectors, page="product_details"):
+    """Selectors and steps shared by ProductDetailsPage and AsyncProductDetailsPage"""
+    
+    @stepwise
+    @timed_action
     def remove_from_cart(self):
         """Remove product from cart"""
         logger.info("Removing product from cart")
-        self.click(self.remove_button)
+        yield self.click(self.remove_button)
         
+    @stepwise
+    @records_navigation
+    @timed_action
     def return_to_inventory(self):
         """Return to inventory page"""
         logger.info("Returning to inventory page")
-        self.click(self.back_button) 
+        yield self.click(self.back_button) 
 
+    @stepwise
+    @timed_action
     def click_backpack_image(self):
         """Click on the backpack image"""
         logger.info("Clicking on backpack image")
-        self.click(self.backpack_image)
+        yield self.click(self.backpack_image)
         
+    @stepwise
     def get_product_name(self) -> str:
         """Get the product name from details page"""
-        return self.page.locator(self.product_name).text_content()
+        return (yield self.locator(self.product_name).text_content())
         
+    @stepwise
     def get_product_price(self) -> str:
         """Get the product price from details page"""
-        return self.page.locator(self.product_price).text_content()
+        return (yield self.locator(self.product_price).text_content())
         
+    @stepwise
     def get_product_description(self) -> str:
         """Get the product description from details page"""
-        return self.page.locator(self.product_description).text_content()
+        return (yield self.locator(self.product_description).text_content())
         
+    @stepwise
+    @records_navigation
+    @timed_action
     def back_to_products(self):
         """Click back to products button"""
         logger.info("Navigating back to products")
-        self.click(self.back_button)
\ No newline at end of file
+        yield self.click(self.back_button)
+
+class ProductDetailsPage(ProductDetailsSelectors, BasePage):
+    """Product details page on a playwright.sync_api Page"""
@@ -0,0 +1,136 @@
+"""Every page's selectors, declared once
+
+SELECTORS holds each page's fixed selectors; the per-page mixins (e.g.
+LoginSelectors) get them as class attributes by subclassing PageSelectors.
+
+Selectors for a given product are built by selector() from TEMPLATES. They
+find the product by the id SauceDemo puts on its links (#item_4_title_link)
+and scope with CSS :has(), which the browser matches natively, instead of an
+ancestor XPath over the product name that walks the whole document. Names
+missing from Products.IDS fall back to the name-based XPath in FALLBACKS.
+Built selectors are cached, and so are their Locators per page (LocatorCache).
+"""
+import weakref
+from functools import lru_cache
+
+from saucedemo.config.constants import Products
+
+HEADER = {
+    "menu_button": ".bm-burger-button",
+    "logout_link": "#logout_sidebar_link",
+}
+
+SELECTORS = {
+    "header": HEADER,
+    "login": {
+        "username_input": "#user-name",
+        "password_input": "#password",
+        "login_button": "#login-button",
+        "error_message": "[data-test='error']",
+        **HEADER,
+    },
+    "inventory": {
+        "sort_dropdown": ".product_sort_container",
+        "product_prices": ".inventory_item_price",
+        "cart_badge": ".shopping_cart_badge",
+        "cart_link": ".shopping_cart_link",
+        "inventory_items": ".inventory_item",
+        "product_images": ".inventory_item img",
+    },
+    "product_details": {
+        "remove_button": "button.btn_secondary",
+        "back_button": "button.inventory_details_back_button",
+        "backpack_image": f"#item_{Products.IDS[Products.BACKPACK]}_img_link img",
+        "product_name": ".inventory_details_name",
+        "product_price": ".inventory_details_price",
+        "product_description": ".inventory_details_desc",
+    },
+    "cart": {
+        "checkout_button": "a.checkout_button",
+        "cart_badge": ".shopping_cart_badge",
+        "cart_items": ".cart_item",
+        "item_price": ".inventory_item_price",
+    },
+    "checkout": {
+        "first_name_input": "input[data-test='firstName']",
+        "last_name_input": "input[data-test='lastName']",
+        "postal_code_input": "input[data-test='postalCode']",
+        "continue_button": "input.cart_button",
+        "finish_button": "a.cart_button",
+        "confirmation_message": "h2.complete-header",
+        "error_message": "h3[data-test='error']",
+    },
+}
+
+# Selectors for one product, by its id in Products.IDS
+TEMPLATES = {
+    "inventory.item_button": ".inventory_item:has(#item_{id}_title_link) .btn_inventory",
+    "inventory.add_to_cart_button": ".inventory_item:has(#item_{id}_title_link) .btn_inventory.btn_primary",
+    "inventory.remove_button": ".inventory_item:has(#item_{id}_title_link) .btn_inventory.btn_secondary",
+    "inventory.product_image": "#item_{id}_img_link img",
+    "cart.remove_button": ".cart_item:has(#item_{id}_title_link) .cart_button",
+}
+
+# The same, by product name, for products without a known id
+FALLBACKS = {
+    "inventory.item_button": "//div[text()='{item}']/ancestor::div[@class='inventory_item']//button",
+    "inventory.add_to_cart_button":
+        "//div[text()='{item}']/ancestor::div[@class='inventory_item']//button[text()='ADD TO CART']",
+    "inventory.remove_button":
+        "//div[text()='{item}']/ancestor::div[@class='inventory_item']//button[text()='REMOVE']",
+    "inventory.product_image": "//div[text()='{item}']/ancestor::div[@class='inventory_item']//img",
+    "cart.remove_button": "//div[text()='{item}']/ancestor::div[@class='cart_item']//button[text()='REMOVE']",
+}
+
+
+@lru_cache(maxsize=None)
+def selector(name: str, item: str) -> str:
+    """The TEMPLATES selector called name for a product, e.g. selector("cart.remove_button", Products.ONESIE)"""
+    product_id = Products.IDS.get(item)
+    if product_id is None:
+        return FALLBACKS[name].format(item=item)
+    return TEMPLATES[name].format(id=product_id)
+
+
+class PageSelectors:
+    """Base of the per-page selector mixins
+
+    class LoginSelectors(PageSelectors, page="login") gets every SELECTORS["login"]
+    entry as a class attribute.
+    """
+
+    def __init_subclass__(cls, page: str = None, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if page is not None:
+            for name, value in SELECTORS[page].items():
+                setattr(cls, name, value)
+
+
+class LocatorCache:
+    """Locators of one Playwright page (sync or async), created once per selector
+
+    Locators are lazy and re-resolve on every use, so they stay valid across
+    navigations and can be shared by every page object on the page.
+    """
+
+    def __init__(self, page):
+        self.page = page
+        self._locators = {}
+
+    def get(self, selector: str):
+        locator = self._locators.get(selector)
+        if locator is None:
+            locator = self._locators[selector] = self.page.locator(selector)
+        return locator
+
+
+# One cache per page, dropped with the page
+_caches = weakref.WeakKeyDictionary()
+
+
+def locators_for(page) -> LocatorCache:
+    """The page's LocatorCache"""
+    cache = _caches.get(page)
+    if cache is None:
+        cache = _caches[page] = LocatorCache(page)
+    return cache
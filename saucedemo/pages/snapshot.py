@@ -0,0 +1,67 @@
+from typing import NamedTuple, Optional
+
+# Runs once over all matched item elements and also reads the cart badge,
+# so a whole page is collected in a single round trip
+SNAPSHOT_SCRIPT = """(items, selectors) => {
+    const text = (root, selector) => {
+        const element = root.querySelector(selector);
+        return element ? element.textContent.trim() : null;
+    };
+    const image = (root) => {
+        const element = root.querySelector('img');
+        return element ? element.getAttribute('src') : null;
+    };
+    return {
+        items: items.map(item => [
+            text(item, selectors.name),
+            text(item, selectors.price),
+            text(item, 'button'),
+            image(item)
+        ]),
+        badge: text(document, selectors.badge)
+    };
+}"""
+
+
+class ItemRecord(NamedTuple):
+    """One product row as rendered on the inventory, cart or checkout page"""
+    name: str
+    # None when the row has no price element, so assertions on it fail loudly
+    price: Optional[float]
+    button: Optional[str]
+    image_src: Optional[str]
+
+
+class PageSnapshot(NamedTuple):
+    """Structured data of a product listing page captured in one round trip"""
+    items: tuple[ItemRecord, ...]
+    badge_count: int
+
+    @property
+    def names(self) -> list[str]:
+        return [item.name for item in self.items]
+
+    @property
+    def prices(self) -> list[Optional[float]]:
+        return [item.price for item in self.items]
+
+    def require_prices(self) -> list[float]:
+        """Prices of all items; raises ValueError naming the items that show no price"""
+        missing = [item.name for item in self.items if item.price is None]
+        if missing:
+            raise ValueError(f"No price shown for: {', '.join(missing)}")
+        return [item.price for item in self.items]
+
+    @property
+    def image_srcs(self) -> list[str]:
+        return [item.image_src for item in self.items if item.image_src]
+
+    @classmethod
+    def from_raw(cls, raw: dict) -> "PageSnapshot":
+        """Build a snapshot from the plain data returned by SNAPSHOT_SCRIPT"""
+        items = tuple(
+            ItemRecord(name, float(price.replace('$', '')) if price else None, button, image_src)
+            for name, price, button, image_src in raw["items"]
+        )
+        badge = raw["badge"]
+        return cls(items, int(badge) if badge and badge.isdigit() else 0)
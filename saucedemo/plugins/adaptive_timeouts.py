@@ -0,0 +1,65 @@
+"""Action latency history behind the page objects' adaptive timeouts
+
+Each process starts from ADAPTIVE_TIMEOUTS_HISTORY. At session end each
+xdist worker (or the single process) writes the latencies of the waits that
+succeeded; the controller appends them to the history and writes the
+timeouts the next run will use to RESULTS_DIR/adaptive_timeouts.json.
+"""
+import json
+from pathlib import Path
+
+from saucedemo.config.logger import get_logger
+from saucedemo.config.settings import get_settings
+from saucedemo.utils.adaptive_timeouts import AdaptiveTimeouts, get_adaptive_timeouts, use_timeouts
+from saucedemo.utils.stats import merge_samples, percentile
+from saucedemo.utils.xdist import clear_worker_stats, is_worker, merge_worker_stats, write_worker_stats
+
+logger = get_logger(__name__)
+
+settings = get_settings()
+
+
+def _results_dir() -> Path:
+    return Path(settings.RESULTS_DIR)
+
+
+def _history_path(config) -> Path:
+    return Path(config.rootpath) / settings.ADAPTIVE_TIMEOUTS_HISTORY
+
+
+def pytest_configure(config):
+    """Load the latency history, and drop samples left over from a previous run"""
+    use_timeouts(AdaptiveTimeouts.load(_history_path(config), enabled=settings.ADAPTIVE_TIMEOUTS))
+    clear_worker_stats(config, "adaptive_timeouts")
+
+
+def pytest_sessionfinish(session):
+    """Write this process's latencies, then extend the history on the controller"""
+    timeouts = get_adaptive_timeouts()
+    write_worker_stats("adaptive_timeouts", timeouts.recent())
+    if is_worker(session.config):
+        return
+
+    merged = merge_samples(merge_worker_stats("adaptive_timeouts"))
+    if not merged:
+        return
+
+    history = timeouts.updated_history(merged)
+    with open(_history_path(session.config), "w") as f:
+        json.dump(history, f, indent=2)
+        f.write("\n")
+
+    report_path = _results_dir() / "adaptive_timeouts.json"
+    with open(report_path, "w") as f:
+        json.dump({
+            target: {
+                key: {
+                    "samples": len(values),
+                    "p99_ms": percentile(values, timeouts.policy.percentile),
+                    "timeout_ms": timeouts.policy.derive(values),
+                }
+                for key, values in sorted(keys.items())
+            }
+            for target, keys in history.items()
+        }, f, indent=2)
+    logger.info(f"Adaptive timeout report written to {report_path}")
@@ -0,0 +1,22 @@
+"""Lifecycle of the background artifact writer
+
+Failure screenshots are written to disk off the test thread; the session
+does not end until every queued write has finished.
+"""
+import pytest
+from saucedemo.config.logger import get_logger
+from saucedemo.utils.artifacts import artifact_writer
+
+logger = get_logger(__name__)
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_sessionfinish(session):
+    """Finish the writes still queued, after the other plugins' session-end work"""
+    pending = artifact_writer.drain()
+    if pending:
+        logger.info(f"Finished writing {pending} queued artifacts")
+
+
+def pytest_unconfigure(config):
+    artifact_writer.close()
@@ -0,0 +1,67 @@
+"""Asset cache mode and hit rates
+
+--asset-cache (default ASSET_CACHE) picks the mode of the cache every
+browser context is routed through, in ASSET_CACHE_DIR under the rootdir. At
+session end each xdist worker (or the single process) writes its hit and miss
+counts; the controller adds them up into RESULTS_DIR/asset_cache.json.
+"""
+import json
+from pathlib import Path
+
+from saucedemo.config.logger import get_logger
+from saucedemo.config.settings import get_settings
+from saucedemo.utils.asset_cache import MODES, AssetCache, get_asset_cache, use_asset_cache
+from saucedemo.utils.xdist import clear_worker_stats, is_worker, merge_worker_stats, write_worker_stats
+
+logger = get_logger(__name__)
+
+settings = get_settings()
+
+
+def _results_dir() -> Path:
+    return Path(settings.RESULTS_DIR)
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--asset-cache",
+        action="store",
+        default=settings.ASSET_CACHE,
+        choices=MODES,
+        help="passthrough: no cache; record: refresh it; static: serve CSS/JS/images from it; replay: serve every GET"
+    )
+
+
+def pytest_configure(config):
+    """Open the cache in the selected mode, and drop counts left over from a previous run"""
+    use_asset_cache(AssetCache.from_settings(
+        Path(config.rootpath) / settings.ASSET_CACHE_DIR,
+        mode=config.getoption("--asset-cache")
+    ))
+    clear_worker_stats(config, "asset_cache")
+
+
+def pytest_sessionfinish(session):
+    """Write this process's counts, then add them up on the controller"""
+    cache = get_asset_cache()
+    if not cache.enabled:
+        return
+    write_worker_stats("asset_cache", cache.stats())
+    if is_worker(session.config):
+        return
+
+    totals = {"hits": 0, "misses": 0, "stored": 0, "bytes_served": 0}
+    for stats in merge_worker_stats("asset_cache"):
+        for key in totals:
+            totals[key] += stats[key]
+    requests = totals["hits"] + totals["misses"]
+    totals["hit_rate"] = round(totals["hits"] / requests, 3) if requests else None
+    totals["mode"] = cache.mode
+
+    report_path = _results_dir() / "asset_cache.json"
+    with open(report_path, "w") as f:
+        json.dump(totals, f, indent=2)
+    logger.info(
+        f"Asset cache ({cache.mode}): {totals['hits']} hits, {totals['misses']} misses, "
+        f"{totals['bytes_served']} bytes served from {cache.root}"
+    )
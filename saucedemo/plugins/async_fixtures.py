@@ -0,0 +1,151 @@
+"""Fixtures for the asyncio page objects in saucedemo.pages.aio
+
+Async tests (marked @pytest.mark.asyncio) share one event loop, Playwright
+instance and browser per worker, so flows started with asyncio.gather overlap
+their network waits instead of running back to back. Contexts honour the same
+no_auth and login_as markers as the sync fixtures; context pooling is sync-only.
+
+Sync Playwright keeps its event loop registered as running for as long as it
+is started, and no other loop can run in the meantime. Asyncio tests
+therefore run in their own phase after the sync ones: they are moved to the
+end of the collection, and before each of them the process's sync Playwright
+session (saucedemo.utils.sync_session) is stopped, which the sync fixtures
+read from on every test. A sync test that still comes later (e.g. under
+xdist) starts it again.
+"""
+import asyncio
+import os
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+from playwright.async_api import async_playwright as start_async_playwright
+from saucedemo.config.constants import CONTEXT_OPTIONS
+from saucedemo.config.logger import get_logger
+from saucedemo.config.settings import get_settings
+from saucedemo.utils.artifacts import capture_screenshot_async
+from saucedemo.utils.asset_cache import install_asset_cache_async
+from saucedemo.utils.auth_state import AsyncAuthStateCache, auth_identity
+from saucedemo.utils.browser_matrix import primary_engine
+from saucedemo.utils.dom_watcher import install_dom_watcher_async
+from saucedemo.utils.recordings import attach_recordings, get_trace_recorder, keep_artifacts
+from saucedemo.utils.resource_blocking import block_resources_async, blocking_profiles
+from saucedemo.utils.sync_session import get_sync_session
+from saucedemo.utils.web_vitals import install_observer_async
+
+logger = get_logger(__name__)
+
+settings = get_settings()
+
+
+def uses_event_loop(item) -> bool:
+    """Whether an item runs on the session event loop: asyncio tests and tests with async fixtures"""
+    return "event_loop" in getattr(item, "fixturenames", ())
+
+
+class AsyncContextFactory:
+    """Contexts for one test, set up like the sync context fixture; also used by the concurrent runner"""
+
+    def __init__(self, browser, auth_state_cache: AsyncAuthStateCache, item):
+        self.browser = browser
+        self.auth_state_cache = auth_state_cache
+        self.item = item
+        self.recordings = []
+
+    async def __call__(self, identity=None):
+        """A new context, logged in as identity or logged out when it is None"""
+        recorder = get_trace_recorder()
+        if identity:
+            context = await self.auth_state_cache.new_context(
+                identity, **CONTEXT_OPTIONS, **recorder.video_options()
+            )
+        else:
+            context = await self.browser.new_context(**CONTEXT_OPTIONS, **recorder.video_options())
+        await install_observer_async(context)
+        await install_dom_watcher_async(context)
+        await install_asset_cache_async(context)
+        await block_resources_async(context, blocking_profiles(self.item))
+        self.recordings.append(await recorder.record_async(
+            context, self.item.nodeid, index=len(self.recordings) + 1, started=False
+        ))
+        return context
+
+    async def close(self, failed: bool) -> list[Path]:
+        """Close every context created; returns the traces and videos kept"""
+        kept = await asyncio.gather(*(recording.close(failed) for recording in self.recordings))
+        return [path for paths in kept for path in paths]
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_collection_modifyitems(config, items):
+    """Move asyncio tests after the sync ones, keeping each group's order"""
+    yield
+    items[:] = [item for item in items if not uses_event_loop(item)] + \
+        [item for item in items if uses_event_loop(item)]
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_setup(item):
+    """Stop sync Playwright before any fixture of an asyncio test runs the event loop"""
+    if uses_event_loop(item):
+        get_sync_session().stop()
+
+
+@pytest.fixture(scope="session")
+def event_loop():
+    """One event loop for the session, so browser fixtures can be session-scoped"""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def async_playwright():
+    """Create an async Playwright instance"""
+    async with start_async_playwright() as playwright:
+        yield playwright
+
+
+@pytest_asyncio.fixture(scope="session")
+async def async_browser(async_playwright, request):
+    """Launch the (first) browser selected with --browser-type"""
+    browser = await getattr(async_playwright, primary_engine(request.config)).launch(
+        headless=os.getenv('HEADLESS', 'true').lower() == 'true',
+        args=['--disable-gpu']
+    )
+    yield browser
+    await browser.close()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def async_auth_state_cache(async_browser, tmp_path_factory):
+    """Logged-in storage state per identity for async contexts on this worker"""
+    return AsyncAuthStateCache(async_browser, tmp_path_factory.mktemp("async_auth_state"))
+
+
+@pytest_asyncio.fixture
+async def async_context_factory(async_browser, async_auth_state_cache, request):
+    """Create extra contexts for concurrent flows; all are closed after the test
+    
+    Usage: context = await async_context_factory("problem"), or None for logged out
+    """
+    factory = AsyncContextFactory(async_browser, async_auth_state_cache, request.node)
+    yield factory
+    attach_recordings(await factory.close(keep_artifacts(request.node)))
+
+
+@pytest_asyncio.fixture
+async def async_context(async_context_factory, request):
+    """Create a browser context, logged in unless the test is marked no_auth"""
+    return await async_context_factory(auth_identity(request.node))
+
+
+@pytest_asyncio.fixture
+async def async_page(async_context, request):
+    """Create a new page for each async test with screenshot capture on failure"""
+    page = await async_context.new_page()
+    page.set_default_timeout(settings.TIMEOUT)
+    yield page
+    if request.node.rep_call.failed if hasattr(request.node, 'rep_call') else False:
+        await capture_screenshot_async(page, request.node.nodeid)
+    await page.close()
@@ -0,0 +1,351 @@
+"""In-process concurrent mode for independent async tests
+
+With --concurrency N (or CONCURRENCY), tests marked ``concurrent`` run as
+asyncio tasks in this process after the rest of the session, at most N at a
+time, each in its own browser contexts on one shared browser. This replaces
+a process per xdist worker, with its own interpreter, Playwright driver and
+browser, for tests that do not need one. The other tests run one by one
+first, as usual.
+
+A test is run this way when it is a coroutine marked ``concurrent``, takes
+no fixtures other than async_page, async_context and async_context_factory
+(which the runner provides with the same behaviour as the async fixtures),
+and has no skip, skipif or xfail marks. Other tests marked ``concurrent``
+run in the normal loop. Autouse fixtures are not set up for these tests.
+
+Once the batch is done, each test's setup, call and teardown outcomes are
+replayed through pytest's runtest hooks with pytest's own runner left out,
+so the terminal, JUnit and Allure reports and this repo's plugins see every
+test as if it had run alone, with the durations it had in the batch. Logs
+written during a test are tagged with its id (current_test_id() follows the
+asyncio task) and added to its report, a failed test that used async_page
+gets a screenshot, and its kept traces and videos are attached. Not available together with xdist.
+"""
+import asyncio
+import inspect
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+import pytest
+from playwright.async_api import async_playwright
+from saucedemo.config.constants import URLs
+from saucedemo.config.logger import ROOT_LOGGER, get_logger, log_format
+from saucedemo.config.settings import get_settings
+from saucedemo.plugins.async_fixtures import AsyncContextFactory
+from saucedemo.plugins.timing_report import attach_action_timings
+from saucedemo.plugins.web_vitals_report import attach_web_vitals
+from saucedemo.utils.artifacts import publish_screenshot, take_screenshot_async
+from saucedemo.utils.auth_state import AsyncAuthStateCache, auth_identity
+from saucedemo.utils.browser_matrix import primary_engine
+from saucedemo.utils.local_site import LocalSiteServer
+from saucedemo.utils.recordings import attach_recordings
+from saucedemo.utils.sync_session import get_sync_session
+from saucedemo.utils.xdist import current_test_id, is_worker, running_test
+
+logger = get_logger(__name__)
+
+settings = get_settings()
+
+# Fixtures the runner provides itself
+RUNNER_FIXTURES = {"async_page", "async_context", "async_context_factory"}
+
+# Marks whose handling needs pytest's own runner
+RUNNER_ONLY_MARKS = ("skip", "skipif", "xfail", "usefixtures")
+
+PHASES = ("setup", "call", "teardown")
+
+# What a test body may raise without taking the batch down: pytest.skip,
+# pytest.fail and pytest.xfail raise BaseExceptions
+TEST_OUTCOMES = (Exception, pytest.skip.Exception, pytest.fail.Exception, pytest.xfail.Exception)
+
+
+class PhaseOutcome(NamedTuple):
+    start: float
+    stop: float
+    duration: float
+    error: Optional[BaseException]
+
+
+class TaskOutcome:
+    """Phase outcomes, screenshot and kept recordings of one test run in the batch"""
+
+    def __init__(self):
+        self.phases = {}
+        self.screenshot: Optional[bytes] = None
+        self.recordings: list[Path] = []
+
+    @classmethod
+    def setup_error(cls, error: BaseException) -> "TaskOutcome":
+        outcome = cls()
+        now = time.time()
+        outcome.phases["setup"] = PhaseOutcome(now, now, 0.0, error)
+        return outcome
+
+    @property
+    def failed(self) -> bool:
+        return any(phase.error is not None for phase in self.phases.values())
+
+
+async def _timed(step) -> PhaseOutcome:
+    start, started = time.time(), time.perf_counter()
+    error = None
+    try:
+        await step()
+    except TEST_OUTCOMES as e:
+        error = e
+    return PhaseOutcome(start, time.time(), time.perf_counter() - started, error)
+
+
+def function_args(item) -> set:
+    """Arguments of the test function; item.fixturenames adds autouse fixtures and dependencies"""
+    return set(inspect.signature(item.obj).parameters)
+
+
+def runnable(item) -> bool:
+    """Whether the runner can run an item as a task"""
+    if item.get_closest_marker("concurrent") is None:
+        return False
+    if not inspect.iscoroutinefunction(getattr(item, "obj", None)):
+        return False
+    if any(item.get_closest_marker(name) for name in RUNNER_ONLY_MARKS):
+        return False
+    params = set(item.callspec.params) if hasattr(item, "callspec") else set()
+    return function_args(item) - params <= RUNNER_FIXTURES
+
+
+class TaskLogBuffer(logging.Handler):
+    """Formatted records per test id, taken on the task that logged them"""
+
+    def __init__(self):
+        super().__init__()
+        self.setFormatter(log_format)
+        self.records = {}
+
+    def emit(self, record: logging.LogRecord):
+        test_id = current_test_id()
+        if test_id:
+            self.records.setdefault(test_id, []).append(self.format(record))
+
+    def text(self, test_id: str) -> str:
+        return "\n".join(self.records.get(test_id, []))
+
+
+class TaskFixtures:
+    """async_page, async_context and async_context_factory for one test in the batch"""
+
+    def __init__(self, batch: "ConcurrentBatch", item):
+        self.item = item
+        self.new_context = AsyncContextFactory(batch.browser, batch.auth_state_cache, item)
+        self.page = None
+        self.values = dict(item.callspec.params) if hasattr(item, "callspec") else {}
+
+    @property
+    def kwargs(self) -> dict:
+        """The arguments of the test function"""
+        argnames = function_args(self.item)
+        return {name: value for name, value in self.values.items() if name in argnames}
+
+    async def setup(self):
+        # item.fixturenames also holds what the requested fixtures depend on,
+        # e.g. async_context for async_page
+        fixturenames = self.item.fixturenames
+        if "async_context_factory" in fixturenames:
+            self.values["async_context_factory"] = self.new_context
+        if "async_context" in fixturenames:
+            context = await self.new_context(auth_identity(self.item))
+            self.values["async_context"] = context
+            if "async_page" in fixturenames:
+                self.page = await context.new_page()
+                self.page.set_default_timeout(settings.TIMEOUT)
+                self.values["async_page"] = self.page
+
+    async def teardown(self, outcome: TaskOutcome):
+        if self.page and outcome.failed:
+            outcome.screenshot = await take_screenshot_async(self.page, self.item.nodeid)
+        outcome.recordings = await self.new_context.close(outcome.failed)
+
+
+class ConcurrentBatch:
+    """Runs items as asyncio tasks on one browser, at most concurrency at a time"""
+
+    def __init__(self, config, concurrency: int):
+        self.config = config
+        self.concurrency = concurrency
+        self.browser = None
+        self.auth_state_cache = None
+
+    async def run(self, items) -> dict:
+        """TaskOutcome per node id"""
+        async with async_playwright() as playwright:
+            try:
+                self.browser = await getattr(playwright, primary_engine(self.config)).launch(
+                    headless=os.getenv('HEADLESS', 'true').lower() == 'true',
+                    args=['--disable-gpu']
+                )
+            except Exception as e:
+                logger.error(f"Failed to launch browser: {str(e)}")
+                return {item.nodeid: TaskOutcome.setup_error(e) for item in items}
+            try:
+                with tempfile.TemporaryDirectory(prefix="concurrent_auth_state_") as state_dir:
+                    self.auth_state_cache = AsyncAuthStateCache(self.browser, Path(state_dir))
+                    semaphore = asyncio.Semaphore(self.concurrency)
+                    outcomes = await asyncio.gather(*(self._run_item(item, semaphore) for item in items))
+            finally:
+                await self.browser.close()
+        return {item.nodeid: outcome for item, outcome in zip(items, outcomes)}
+
+    async def _run_item(self, item, semaphore) -> TaskOutcome:
+        outcome = TaskOutcome()
+        async with semaphore:
+            with running_test(item.nodeid):
+                fixtures = TaskFixtures(self, item)
+                outcome.phases["setup"] = await _timed(fixtures.setup)
+                if outcome.phases["setup"].error is None:
+                    outcome.phases["call"] = await _timed(lambda: item.obj(**fixtures.kwargs))
+                outcome.phases["teardown"] = await _timed(lambda: fixtures.teardown(outcome))
+        return outcome
+
+
+class ConcurrentRunner:
+    """Runs the concurrent batch, then replays its outcomes through the runtest hooks"""
+
+    def __init__(self, config, concurrency: int):
+        self.config = config
+        self.concurrency = concurrency
+        self.outcomes = {}
+        self.logs = TaskLogBuffer()
+        self._replaying = None
+        # The runtest phase hooks of every plugin except pytest's runner, which
+        # would set the test's fixtures up and run it again, and nose, which
+        # registers setup functions with the runner
+        skipped = [config.pluginmanager.get_plugin(name) for name in ("runner", "nose")]
+        self._phase_hooks = {
+            when: config.pluginmanager.subset_hook_caller(
+                f"pytest_runtest_{when}", remove_plugins=[plugin for plugin in skipped if plugin]
+            )
+            for when in PHASES
+        }
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtestloop(self, session):
+        batch = [] if session.config.option.collectonly else [item for item in session.items if runnable(item)]
+        # The default loop runs the other tests first
+        session.items = [item for item in session.items if item not in batch]
+        outcome = yield
+        if not batch or outcome.excinfo is not None:
+            return
+
+        logger.info(f"Running {len(batch)} tests concurrently, {self.concurrency} at a time")
+        self.outcomes = self._run_batch(batch)
+        for item in batch:
+            item.config.hook.pytest_runtest_protocol(item=item, nextitem=None)
+            if session.shouldfail:
+                raise session.Failed(session.shouldfail)
+            if session.shouldstop:
+                raise session.Interrupted(session.shouldstop)
+
+    def _run_batch(self, batch) -> dict:
+        # Sync Playwright would keep the batch's event loop from running
+        get_sync_session().stop()
+        root_logger = logging.getLogger(ROOT_LOGGER)
+        root_logger.addHandler(self.logs)
+        try:
+            if self.config.getoption("--local-site"):
+                original_base_url = URLs.BASE_URL
+                with LocalSiteServer() as server:
+                    URLs.rebase(server.base_url)
+                    settings.BASE_URL = server.base_url
+                    try:
+                        return asyncio.run(ConcurrentBatch(self.config, self.concurrency).run(batch))
+                    finally:
+                        URLs.rebase(original_base_url)
+                        settings.BASE_URL = original_base_url
+            return asyncio.run(ConcurrentBatch(self.config, self.concurrency).run(batch))
+        finally:
+            root_logger.removeHandler(self.logs)
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        outcome = self.outcomes.pop(item.nodeid, None)
+        if outcome is None:
+            return None
+        item.ihook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+        item.add_report_section("call", "log", self.logs.text(item.nodeid))
+        with running_test(item.nodeid):
+            for when in PHASES:
+                if when in outcome.phases:
+                    self._replay(item, when, outcome)
+        item.ihook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
+        return True
+
+    def _replay(self, item, when: str, outcome: TaskOutcome):
+        phase = outcome.phases[when]
+        self._replaying = (item, when, outcome)
+        try:
+            kwargs = {"item": item, "nextitem": None} if when == "teardown" else {"item": item}
+            call = pytest.CallInfo.from_call(
+                lambda: self._phase_hooks[when](**kwargs),
+                when=when,
+                reraise=(pytest.exit.Exception, KeyboardInterrupt)
+            )
+        finally:
+            self._replaying = None
+        call.start, call.stop, call.duration = phase.start, phase.stop, phase.duration
+        report = item.ihook.pytest_runtest_makereport(item=item, call=call)
+        item.ihook.pytest_runtest_logreport(report=report)
+
+    def _replayed_phase(self, item, when: str) -> Optional[TaskOutcome]:
+        if self._replaying is None or self._replaying[:2] != (item, when):
+            return None
+        return self._replaying[2]
+
+    def pytest_runtest_setup(self, item):
+        outcome = self._replayed_phase(item, "setup")
+        if outcome and outcome.phases["setup"].error:
+            raise outcome.phases["setup"].error
+
+    def pytest_runtest_call(self, item):
+        outcome = self._replayed_phase(item, "call")
+        if outcome and outcome.phases["call"].error:
+            raise outcome.phases["call"].error
+
+    def pytest_runtest_teardown(self, item, nextitem):
+        outcome = self._replayed_phase(item, "teardown")
+        if outcome is None:
+            return
+        # What the autouse attachment fixtures and async_page do at teardown
+        attach_action_timings(item.nodeid)
+        attach_web_vitals(item.config, item.nodeid)
+        if outcome.screenshot:
+            publish_screenshot(outcome.screenshot, item.nodeid)
+        attach_recordings(outcome.recordings)
+        if outcome.phases["teardown"].error:
+            raise outcome.phases["teardown"].error
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--concurrency",
+        action="store",
+        type=int,
+        default=settings.CONCURRENCY,
+        help="Run tests marked concurrent as asyncio tasks in this process, this many at a time (0: off)"
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "concurrent: independent async test that may run as an asyncio task next to others"
+    )
+    concurrency = config.getoption("--concurrency")
+    if not concurrency:
+        return
+    if concurrency < 0:
+        raise pytest.UsageError("--concurrency must be 0 (off) or a positive number of tasks")
+    if is_worker(config) or getattr(config.option, "dist", "no") != "no":
+        raise pytest.UsageError("--concurrency runs tests in this process and cannot be combined with xdist")
+    config.pluginmanager.register(ConcurrentRunner(config, concurrency), "concurrent_runner")
@@ -0,0 +1,182 @@
+"""Duration history, longest-first xdist scheduling and deterministic CI shards
+
+Every run records each test's setup + call + teardown time into a JSON
+history file (DURATIONS_FILE). Under xdist, workers order their collection
+longest-first from that history, so the load scheduler hands out the slowest
+tests first and the run ends close to sum(durations) / workers. --shard=i/n
+splits the selected tests into n partitions balanced by the same history;
+given the same history file every CI node computes the same partition.
+
+CI restores one history for all shards and merges the files the shards
+wrote back into it afterwards:
+
+    python -m saucedemo.plugins.duration_scheduling --merge base.json shard-1.json shard-2.json
+"""
+import argparse
+import json
+import re
+from collections import defaultdict
+from pathlib import Path
+
+import pytest
+from saucedemo.config.logger import get_logger
+from saucedemo.config.settings import get_settings
+from saucedemo.utils.xdist import is_worker
+
+logger = get_logger(__name__)
+
+settings = get_settings()
+
+# Weight of the newest sample when updating a test's recorded duration
+SMOOTHING = 0.5
+# Assumed duration of tests with no history yet
+DEFAULT_DURATION = 1.0
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--shard",
+        action="store",
+        default=None,
+        help="Run only shard i of n (e.g. 2/4), balanced by recorded test durations"
+    )
+    parser.addoption(
+        "--no-duration-schedule",
+        action="store_true",
+        default=False,
+        help="Keep collection order under xdist instead of scheduling longest-first"
+    )
+
+
+def parse_shard(value: str) -> tuple[int, int]:
+    """Parse "i/n" into a 1-based shard index and shard count"""
+    match = re.fullmatch(r"\s*(\d+)\s*/\s*(\d+)\s*", value or "")
+    if not match:
+        raise pytest.UsageError(f"--shard must look like i/n (e.g. 1/4), got '{value}'")
+    index, count = int(match.group(1)), int(match.group(2))
+    if count < 1 or not 1 <= index <= count:
+        raise pytest.UsageError(f"--shard index must be between 1 and {count}, got {index}")
+    return index, count
+
+
+class DurationHistory:
+    """Recorded test durations in seconds, keyed by node id"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.durations = {}
+        if path.exists():
+            try:
+                with open(path) as f:
+                    self.durations = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable duration history {path}: {e}")
+        self.default = (
+            sum(self.durations.values()) / len(self.durations) if self.durations else DEFAULT_DURATION
+        )
+
+    def estimate(self, nodeid: str) -> float:
+        """Recorded duration, or the mean of known tests for new ones"""
+        return self.durations.get(nodeid, self.default)
+
+    def update(self, measured: dict[str, float]):
+        for nodeid, duration in measured.items():
+            previous = self.durations.get(nodeid)
+            if previous is None:
+                self.durations[nodeid] = round(duration, 4)
+            else:
+                self.durations[nodeid] = round(SMOOTHING * duration + (1 - SMOOTHING) * previous, 4)
+
+    def save(self):
+        with open(self.path, "w") as f:
+            json.dump(dict(sorted(self.durations.items())), f, indent=2)
+            f.write("\n")
+
+
+def longest_first(items: list, history: DurationHistory) -> list:
+    """Items ordered by descending estimated duration, ties kept in collection order"""
+    return sorted(items, key=lambda item: -history.estimate(item.nodeid))
+
+
+def partition(items: list, count: int, history: DurationHistory) -> list[list]:
+    """Split items into count shards by greedy longest-processing-time assignment"""
+    shards = [[] for _ in range(count)]
+    loads = [0.0] * count
+    for item in sorted(items, key=lambda item: (-history.estimate(item.nodeid), item.nodeid)):
+        target = loads.index(min(loads))
+        shards[target].append(item)
+        loads[target] += history.estimate(item.nodeid)
+    return shards
+
+
+class DurationScheduler:
+    """Registered per session; reorders, shards and records test durations"""
+
+    def __init__(self, config):
+        self.config = config
+        self.history = DurationHistory(Path(config.rootpath) / settings.DURATIONS_FILE)
+        self.measured = defaultdict(float)
+        shard = config.getoption("--shard")
+        self.shard = parse_shard(shard) if shard else None
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, config, items):
+        """Keep only this shard's tests, then order longest-first for xdist workers"""
+        if self.shard:
+            index, count = self.shard
+            selected = set(id(item) for item in partition(items, count, self.history)[index - 1])
+            deselected = [item for item in items if id(item) not in selected]
+            if deselected:
+                config.hook.pytest_deselected(items=deselected)
+            items[:] = [item for item in items if id(item) in selected]
+
+        # Every worker must collect the same order, which holds because they
+        # all read the same history file before the controller rewrites it
+        if is_worker(config) and not config.getoption("--no-duration-schedule"):
+            items[:] = longest_first(items, self.history)
+
+    def pytest_runtest_logreport(self, report):
+        """Sum setup, call and teardown time; on the controller this sees every worker's tests"""
+        if not is_worker(self.config):
+            self.measured[report.nodeid] += report.duration
+
+    def pytest_sessionfinish(self, session):
+        """Fold this run's durations into the history; only the controller writes it"""
+        if is_worker(self.config) or not self.measured:
+            return
+        self.history.update(self.measured)
+        self.history.save()
+        logger.info(f"Recorded {len(self.measured)} test durations in {self.history.path}")
+
+
+def pytest_configure(config):
+    config.pluginmanager.register(DurationScheduler(config), "duration_scheduler")
+
+
+def merge_histories(base: dict[str, float], shards: list[dict[str, float]]) -> dict[str, float]:
+    """Combine shard histories that each started from base and updated only their own tests"""
+    merged = dict(base)
+    for shard in shards:
+        for nodeid, duration in shard.items():
+            if base.get(nodeid) != duration:
+                merged[nodeid] = duration
+    return merged
+
+
+def main(argv: list[str] = None):
+    parser = argparse.ArgumentParser(description="Merge the duration histories written by CI shards")
+    parser.add_argument("--merge", nargs="+", required=True, metavar="FILE",
+                        help="History every shard started from, then the histories they wrote")
+    parser.add_argument("--output", default=settings.DURATIONS_FILE, help="Merged history file")
+    args = parser.parse_args(argv)
+
+    base, *shards = [DurationHistory(Path(path)).durations for path in args.merge]
+    history = DurationHistory(Path(args.output))
+    history.durations = merge_histories(base, shards)
+    history.save()
+    print(f"Merged {len(shards)} shard histories into {history.path} ({len(history.durations)} tests)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
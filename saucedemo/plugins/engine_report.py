@@ -0,0 +1,119 @@
+"""Side-by-side results of a browser matrix run
+
+Workers tag each report of a matrix-parametrised test with its engine; the
+controller (or single process) collects outcomes and durations per engine,
+prints them next to each other at the end of the run and writes
+RESULTS_DIR/engine_matrix.json.
+"""
+import json
+from collections import defaultdict
+from pathlib import Path
+
+import pytest
+from saucedemo.config.logger import get_logger
+from saucedemo.config.settings import get_settings
+from saucedemo.utils.browser_matrix import item_engine
+from saucedemo.utils.xdist import is_worker
+
+logger = get_logger(__name__)
+
+settings = get_settings()
+
+ENGINE_PROPERTY = "browser_engine"
+
+
+def base_test_id(nodeid: str, engine: str) -> str:
+    """Node id without the engine in its parameter id, shared by all engines of a test"""
+    if not nodeid.endswith("]") or "[" not in nodeid:
+        return nodeid
+    name, params = nodeid[:-1].split("[", 1)
+    rest = [part for part in params.split("-") if part != engine]
+    return f"{name}[{'-'.join(rest)}]" if rest else name
+
+
+class EngineReport:
+    """Outcome and setup + call + teardown time of every test, per engine"""
+
+    def __init__(self):
+        self.tests = defaultdict(dict)
+
+    def pytest_runtest_logreport(self, report):
+        """On the controller this sees every worker's reports"""
+        engine = dict(report.user_properties).get(ENGINE_PROPERTY)
+        if engine is None:
+            return
+        entry = self.tests[base_test_id(report.nodeid, engine)].setdefault(
+            engine, {"outcome": "passed", "duration_s": 0.0}
+        )
+        entry["duration_s"] = round(entry["duration_s"] + report.duration, 4)
+        if report.failed:
+            entry["outcome"] = "failed" if report.when == "call" else "error"
+        elif report.skipped and entry["outcome"] == "passed":
+            entry["outcome"] = "skipped"
+
+    def engines(self) -> list[str]:
+        return sorted({engine for results in self.tests.values() for engine in results})
+
+    def summary(self) -> dict:
+        engines = {}
+        for engine in self.engines():
+            results = [results[engine] for results in self.tests.values() if engine in results]
+            outcomes = defaultdict(int)
+            for result in results:
+                outcomes[result["outcome"]] += 1
+            total = sum(result["duration_s"] for result in results)
+            engines[engine] = {
+                **{outcome: outcomes[outcome] for outcome in ("passed", "failed", "error", "skipped")},
+                "total_s": round(total, 3),
+                "mean_s": round(total / len(results), 3) if results else 0.0,
+            }
+        return {"engines": engines, "tests": dict(sorted(self.tests.items()))}
+
+    def format(self) -> list[str]:
+        engines = self.engines()
+        width = max([len(test) for test in self.tests] + [4])
+        lines = [f"{'test':<{width}}  " + "  ".join(f"{engine:>18}" for engine in engines)]
+        for test, results in sorted(self.tests.items()):
+            cells = []
+            for engine in engines:
+                result = results.get(engine)
+                cells.append(f"{result['outcome']:>10} {result['duration_s']:>6.2f}s" if result else f"{'-':>18}")
+            lines.append(f"{test:<{width}}  " + "  ".join(cells))
+        summary = self.summary()["engines"]
+        cells = []
+        for engine in engines:
+            counts = summary[engine]
+            ran = counts["passed"] + counts["failed"] + counts["error"]
+            cells.append(f"{counts['passed']}/{ran} passed {counts['total_s']:.1f}s".rjust(18))
+        lines.append(f"{'total':<{width}}  " + "  ".join(cells))
+        return lines
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """Tag reports with the engine so the controller can group them"""
+    outcome = yield
+    engine = item_engine(item)
+    if engine:
+        outcome.get_result().user_properties.append((ENGINE_PROPERTY, engine))
+
+
+def pytest_configure(config):
+    if not is_worker(config):
+        config.pluginmanager.register(EngineReport(), "engine_report")
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_terminal_summary(terminalreporter, config):
+    engine_report = config.pluginmanager.get_plugin("engine_report")
+    if engine_report is None or not engine_report.tests:
+        return
+    terminalreporter.section("browser matrix")
+    for line in engine_report.format():
+        terminalreporter.write_line(line)
+
+    report_path = Path(settings.RESULTS_DIR) / "engine_matrix.json"
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(report_path, "w") as f:
+        json.dump(engine_report.summary(), f, indent=2)
+    terminalreporter.write_line(f"Browser matrix report written to {report_path}")
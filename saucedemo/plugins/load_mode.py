@@ -0,0 +1,66 @@
+"""pytest mode for the virtual-user load harness
+
+Tests marked ``load`` are skipped unless --load-users is given, so a normal
+run never generates load. With it, every other test is deselected, so a load
+run is only the load tests (and their async Playwright never shares the
+session with sync browser tests); the load_profile fixture carries the
+--load-* options and the report lands in RESULTS_DIR/load_report.json.
+
+The page objects' latencies under load are recorded under a separate
+"<host>/<engine>/load" run target (see browser_matrix.under_load), so a load
+run never skews the adaptive timeouts, performance budget history or web
+vitals baseline of functional runs.
+"""
+import pytest
+from saucedemo.utils.browser_matrix import primary_engine
+from saucedemo.utils.load_harness import LoadProfile, check_profile
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("load", "virtual-user load runs")
+    group.addoption("--load-users", type=int, default=None,
+                    help="Run tests marked load with this many concurrent virtual users")
+    group.addoption("--load-duration", type=float, default=None,
+                    help="Seconds to keep the virtual users running")
+    group.addoption("--load-iterations", type=int, default=None,
+                    help="Checkouts per virtual user (1 if neither this nor a duration is given)")
+    group.addoption("--load-ramp-up", type=float, default=0.0,
+                    help="Seconds over which the virtual users start")
+    group.addoption("--load-browsers", type=int, default=1,
+                    help="Browsers the virtual users' contexts are spread over")
+    group.addoption("--load-max-error-rate", type=float, default=0.0,
+                    help="Fail the load test when more of its iterations fail than this fraction")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "load: virtual-user load run, only selected with --load-users")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--load-users") is not None:
+        deselected = [item for item in items if not item.get_closest_marker("load")]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = [item for item in items if item.get_closest_marker("load")]
+        return
+    skip_load = pytest.mark.skip(reason="load runs need --load-users")
+    for item in items:
+        if item.get_closest_marker("load"):
+            item.add_marker(skip_load)
+
+
+@pytest.fixture(scope="session")
+def load_profile(request) -> LoadProfile:
+    """Load profile built from the --load-* options"""
+    config = request.config
+    try:
+        return check_profile(LoadProfile(
+            users=config.getoption("--load-users"),
+            duration=config.getoption("--load-duration"),
+            iterations=config.getoption("--load-iterations"),
+            ramp_up=config.getoption("--load-ramp-up"),
+            browsers=config.getoption("--load-browsers"),
+            browser_type=primary_engine(config)
+        ))
+    except ValueError as e:
+        raise pytest.UsageError(str(e))
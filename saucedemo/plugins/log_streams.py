@@ -0,0 +1,31 @@
+"""Lifecycle of the per-process log streams written by saucedemo.config.logger"""
+import pytest
+from saucedemo.config.logger import (
+    flush_logging, get_logger, merge_run_logs, run_id, run_logs_dir, shutdown_logging
+)
+from saucedemo.utils.xdist import is_worker
+
+logger = get_logger(__name__)
+
+
+def pytest_configure(config):
+    """Fix the run id in the environment so every xdist worker inherits it"""
+    if not is_worker(config):
+        run_id()
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_sessionfinish(session):
+    """Flush this process's stream; the controller then merges all workers' streams"""
+    flush_logging()
+    config = session.config
+    if is_worker(config) or getattr(config.option, "dist", "no") == "no":
+        return
+    if not run_logs_dir().exists():
+        return
+    merged_path = merge_run_logs()
+    logger.info(f"Merged worker logs into {merged_path}")
+
+
+def pytest_unconfigure(config):
+    shutdown_logging()
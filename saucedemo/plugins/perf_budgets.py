@@ -0,0 +1,96 @@
+"""Performance budgets on tests, and the sample history percentile budgets use
+
+A test marked @pytest.mark.perf_budget fails when any budget in PERF_BUDGETS
+for a page it loaded or a page-object action it ran is exceeded; with
+arguments, only the budgets of those pages and actions are checked:
+
+    @pytest.mark.perf_budget("INVENTORY", "CheckoutPage.finish_checkout")
+
+At session end each xdist worker (or the single process) writes the samples
+of every budgeted metric; the controller checks the budgets over the whole
+run into RESULTS_DIR/perf_budgets.json and appends the samples to
+PERF_BUDGET_HISTORY for the next runs' percentile checks, per host and engine.
+"""
+import json
+from pathlib import Path
+
+import pytest
+from saucedemo.config.logger import get_logger
+from saucedemo.config.settings import get_settings
+from saucedemo.utils.perf_budgets import (
+    PerfBudgets, current_values, get_perf_budgets, subject_of, use_budgets
+)
+from saucedemo.utils.stats import merge_samples
+from saucedemo.utils.xdist import clear_worker_stats, is_worker, merge_worker_stats, write_worker_stats
+
+logger = get_logger(__name__)
+
+settings = get_settings()
+
+
+def _results_dir() -> Path:
+    return Path(settings.RESULTS_DIR)
+
+
+def _history_path(config) -> Path:
+    return Path(config.rootpath) / settings.PERF_BUDGET_HISTORY
+
+
+def pytest_configure(config):
+    """Load the budgets and history, and drop samples left over from a previous run"""
+    config.addinivalue_line(
+        "markers", "perf_budget(*pages_or_actions): fail the test when it exceeds its performance budgets"
+    )
+    use_budgets(PerfBudgets.load(Path(config.rootpath) / settings.PERF_BUDGETS, _history_path(config)))
+    clear_worker_stats(config, "perf_budgets")
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    """Fail a passing perf_budget test whose samples exceed a budget"""
+    outcome = yield
+    marker = item.get_closest_marker("perf_budget")
+    if marker is None or outcome.excinfo is not None:
+        return
+    subjects = tuple(subject_of(target) for target in marker.args)
+    results = get_perf_budgets().check_test(item.nodeid, subjects)
+    failures = [result.describe() for result in results if not result.passed]
+    if failures:
+        outcome.force_exception(AssertionError("Performance budget exceeded: " + "; ".join(failures)))
+
+
+def pytest_sessionfinish(session):
+    """Write this process's budgeted samples, then check the run and extend the history on the controller"""
+    budgets = get_perf_budgets()
+    values = {}
+    for budget in budgets.budgets:
+        for target, budget_values in current_values(budget, None).items():
+            values.setdefault(target, {})[budget.key] = budget_values
+    write_worker_stats("perf_budgets", values)
+    if is_worker(session.config):
+        return
+
+    merged = merge_samples(merge_worker_stats("perf_budgets"))
+    if not merged:
+        return
+
+    results = [
+        budgets.check(budget, keys[budget.key], target)
+        for target, keys in sorted(merged.items())
+        for budget in budgets.budgets if budget.key in keys
+    ]
+    report_path = _results_dir() / "perf_budgets.json"
+    with open(report_path, "w") as f:
+        json.dump([
+            {**result.budget._asdict(), "target": result.target, "observed": result.observed,
+             "samples": result.samples, "passed": result.passed, "enforced": result.enforced}
+            for result in results
+        ], f, indent=2)
+    logger.info(f"Performance budget report written to {report_path}")
+    for result in results:
+        if not result.passed:
+            logger.warning(f"Performance budget exceeded: {result.describe()}")
+
+    with open(_history_path(session.config), "w") as f:
+        json.dump(budgets.updated_history(merged), f, indent=2)
+        f.write("\n")
@@ -0,0 +1,58 @@
+"""Trace and video modes
+
+--trace-mode and --video-mode (default TRACE_MODE and VIDEO_MODE) pick what
+the context fixtures record and keep. Each process keeps its own ring buffer
+of recordings under TRACE_DIR/<worker id>; the controller clears TRACE_DIR
+at the start of a run.
+"""
+import shutil
+from pathlib import Path
+
+from saucedemo.config.logger import get_logger
+from saucedemo.config.settings import get_settings
+from saucedemo.utils.recordings import MODES, TraceRecorder, get_trace_recorder, use_trace_recorder
+from saucedemo.utils.xdist import is_worker
+
+logger = get_logger(__name__)
+
+settings = get_settings()
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--trace-mode",
+        action="store",
+        default=settings.TRACE_MODE,
+        choices=MODES,
+        help="Playwright tracing: off, on-failure (keep failed or retried tests' traces) or always"
+    )
+    parser.addoption(
+        "--video-mode",
+        action="store",
+        default=settings.VIDEO_MODE,
+        choices=MODES,
+        help="Video of strict-mode contexts: off, on-failure or always"
+    )
+
+
+def pytest_configure(config):
+    """Set up the recorder in the selected modes, and drop recordings left over from a previous run"""
+    use_trace_recorder(TraceRecorder.from_settings(
+        trace_mode=config.getoption("--trace-mode"),
+        video_mode=config.getoption("--video-mode")
+    ))
+    if not is_worker(config):
+        shutil.rmtree(Path(settings.TRACE_DIR), ignore_errors=True)
+
+
+def pytest_sessionfinish(session):
+    recorder = get_trace_recorder()
+    if len(recorder.buffer) or recorder.buffer.dropped:
+        logger.info(
+            f"Kept {len(recorder.buffer)} recordings ({recorder.buffer.total_bytes} bytes) in "
+            f"{recorder.root}, deleted {recorder.buffer.dropped} over the size caps"
+        )
+
+
+def pytest_unconfigure(config):
+    get_trace_recorder().close()
@@ -0,0 +1,62 @@
+"""Per-action latency report for page-object actions
+
+Each xdist worker (or the single process) writes its raw samples at session
+end; the controller merges them into one JSON summary with p50/p95/p99 and
+histograms per page-object method and per selector. Every test also gets its
+own timings attached to the Allure report.
+"""
+import json
+from pathlib import Path
+
+import allure
+import pytest
+from saucedemo.config.logger import get_logger
+from saucedemo.config.settings import get_settings
+from saucedemo.utils.action_timings import ActionTiming, action_timings, summarize
+from saucedemo.utils.xdist import clear_worker_stats, is_worker, merge_worker_stats, write_worker_stats
+
+logger = get_logger(__name__)
+
+settings = get_settings()
+
+
+def _results_dir() -> Path:
+    return Path(settings.RESULTS_DIR)
+
+
+def pytest_configure(config):
+    """Drop samples left over from a previous run before any worker starts"""
+    clear_worker_stats(config, "action_timings")
+
+
+def attach_action_timings(test_id: str):
+    """Attach the timings of a test's page-object actions to the Allure report"""
+    samples = action_timings.samples(test_id)
+    if samples:
+        allure.attach(
+            json.dumps(summarize(samples), indent=2),
+            name="action timings",
+            attachment_type=allure.attachment_type.JSON
+        )
+
+
+@pytest.fixture(autouse=True)
+def action_timing_attachment(request):
+    """Attach the timings of this test's page-object actions to the Allure report"""
+    yield
+    attach_action_timings(request.node.nodeid)
+
+
+def pytest_sessionfinish(session):
+    """Write this process's samples, then merge all of them on the controller"""
+    write_worker_stats("action_timings", [sample._asdict() for sample in action_timings.samples()])
+    if is_worker(session.config):
+        return
+
+    merged = [ActionTiming(**sample) for part in merge_worker_stats("action_timings") for sample in part]
+    if not merged:
+        return
+    report_path = _results_dir() / "action_timings.json"
+    with open(report_path, "w") as f:
+        json.dump(summarize(merged), f, indent=2)
+    logger.info(f"Action timing report written to {report_path}")
@@ -0,0 +1,130 @@
+"""Web performance metrics report with run-over-run comparison
+
+Every test gets the metrics of the pages it loaded attached to the Allure
+report, next to the previous run's p50 for the same page. At session end each
+xdist worker (or the single process) writes its samples; the controller
+merges them into RESULTS_DIR/web_vitals.json with per-page p50/p95, the
+change against the baseline and any regressions, per host and engine.
+
+The baseline in WEB_VITALS_HISTORY is kept per host and engine too, and a
+page's baseline is only replaced by a run that loaded it at least
+WEB_VITALS_MIN_SAMPLES times, so a single-test run cannot reset it.
+"""
+import json
+from pathlib import Path
+
+import allure
+import pytest
+from saucedemo.config.logger import get_logger
+from saucedemo.config.settings import get_settings
+from saucedemo.utils.web_vitals import (
+    SUMMARY_METRICS, NavigationSample, compare, summarize, updated_baseline, web_vitals
+)
+from saucedemo.utils.xdist import clear_worker_stats, is_worker, merge_worker_stats, write_worker_stats
+
+logger = get_logger(__name__)
+
+settings = get_settings()
+
+# Per-target, per-page baseline summary, read once per process at startup
+baseline_key = pytest.StashKey[dict]()
+
+
+def _results_dir() -> Path:
+    return Path(settings.RESULTS_DIR)
+
+
+def _history_path(config) -> Path:
+    return Path(config.rootpath) / settings.WEB_VITALS_HISTORY
+
+
+def load_history(path: Path) -> dict:
+    """Per-target, per-page baseline summary, empty when there is none"""
+    if not path.exists():
+        return {}
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable web vitals history {path}: {e}")
+        return {}
+
+
+def pytest_configure(config):
+    """Drop samples left over from a previous run before any worker starts"""
+    config.stash[baseline_key] = load_history(_history_path(config))
+    clear_worker_stats(config, "web_vitals")
+
+
+def attach_web_vitals(config, test_id: str):
+    """Attach the metrics of the pages a test loaded to the Allure report"""
+    samples = web_vitals.samples(test_id)
+    if not samples:
+        return
+    baseline = config.stash[baseline_key]
+    navigations = []
+    for sample in samples:
+        previous = baseline.get(sample.target, {}).get(sample.page, {})
+        navigations.append({
+            "page": sample.page,
+            "target": sample.target,
+            "url": sample.metrics["url"],
+            "metrics": {
+                metric: {
+                    "value": sample.metrics.get(metric),
+                    "previous_p50": previous.get(metric, {}).get("p50"),
+                }
+                for metric in SUMMARY_METRICS
+            },
+            "slowest_resources": sample.metrics.get("slowest_resources", []),
+        })
+    allure.attach(
+        json.dumps(navigations, indent=2),
+        name="web vitals",
+        attachment_type=allure.attachment_type.JSON
+    )
+
+
+@pytest.fixture(autouse=True)
+def web_vitals_attachment(request):
+    """Attach the metrics of the pages this test loaded to the Allure report"""
+    yield
+    attach_web_vitals(request.config, request.node.nodeid)
+
+
+def pytest_sessionfinish(session):
+    """Write this process's samples, then merge, compare and save on the controller"""
+    write_worker_stats("web_vitals", [sample._asdict() for sample in web_vitals.samples()])
+    if is_worker(session.config):
+        return
+
+    merged = [NavigationSample(**sample) for part in merge_worker_stats("web_vitals") for sample in part]
+    if not merged:
+        return
+
+    summary = summarize(merged)
+    baseline = session.config.stash[baseline_key]
+    comparison = compare(summary, baseline, settings.WEB_VITALS_REGRESSION_PCT)
+    regressions = [
+        f"{target} {page} {metric} p50 {change['previous_p50']} -> {change['p50']} ({change['delta_pct']:+}%)"
+        for target, pages in comparison.items()
+        for page, changes in pages.items()
+        for metric, change in changes.items()
+        if change["regressed"]
+    ]
+    report_path = _results_dir() / "web_vitals.json"
+    with open(report_path, "w") as f:
+        json.dump({
+            "pages": summary,
+            "comparison": comparison,
+            "regressions": regressions,
+            "samples": [sample._asdict() for sample in merged],
+        }, f, indent=2)
+    logger.info(f"Web vitals report written to {report_path}")
+    for regression in regressions:
+        logger.warning(f"Web vitals regression: {regression}")
+
+    history_path = _history_path(session.config)
+    with open(history_path, "w") as f:
+        json.dump(updated_baseline(baseline, summary, settings.WEB_VITALS_MIN_SAMPLES), f, indent=2)
+        f.write("\n")
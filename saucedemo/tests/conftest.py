@@ -1,10 +1,10 @@
+import allure
 import pytest
-import os
-from playwright.sync_api import sync_playwright
-from saucedemo.config.settings import get_settings
-from saucedemo.config.logger import logger
+from saucedemo.config.logger import get_logger
+from saucedemo.utils.browser_matrix import item_engine, parse_engines, selected_engines
+from saucedemo.utils.browser_server import connect_or_launch, default_launch_args
 
-settings = get_settings()
+logger = get_logger(__name__)
 
 def pytest_addoption(parser):
     """Add command-line options to pytest"""
@@ -12,56 +12,66 @@ def pytest_addoption(parser):
         "--browser-type",
         action="store",
         default="chromium",
-        choices=["chromium", "firefox", "webkit"],
-        help="Browser to run tests: chromium, firefox, or webkit"
+        type=parse_engines,
+        help="Browser to run tests: chromium, firefox, webkit, a comma-separated list or all"
     )
 
+def pytest_generate_tests(metafunc):
+    """Run every browser test once per engine when several are given with --browser-type"""
+    engines = selected_engines(metafunc.config)
+    if len(engines) > 1 and "browser_type" in metafunc.fixturenames:
+        metafunc.parametrize("browser_type", engines, indirect=True, scope="session")
+
 @pytest.fixture(scope="session")
 def browser_type_launch_args():
     """Fixture to configure browser launch arguments"""
-    return {
-        "headless": os.getenv('HEADLESS', 'true').lower() == 'true',
-        "args": ['--disable-gpu', '--no-sandbox', '--disable-dev-shm-usage'],
-        "timeout": int(os.getenv('PLAYWRIGHT_TIMEOUT', '30000'))
-    }
+    return default_launch_args()
 
 @pytest.fixture(scope="session")
 def browser_type(request):
-    """Get the browser type from command line option"""
-    return request.config.getoption("--browser-type")
+    """Get the browser type from command line option, or this test's engine in matrix mode"""
+    return getattr(request, "param", selected_engines(request.config)[0])
 
-@pytest.fixture(scope="session")
-def browser(playwright, browser_type, browser_type_launch_args):
-    """Create a browser instance"""
-    try:
-        browser_instance = getattr(playwright, browser_type)
-        browser = browser_instance.launch(**browser_type_launch_args)
-        yield browser
+@pytest.fixture
+def browser(playwright, browser_type, browser_type_launch_args, engine_cache, request):
+    """Create a browser instance, connecting to a running browser server if there is one
+    
+    Each engine is launched once per worker and kept in engine_cache until sync
+    Playwright is stopped, at session end or before the asyncio tests.
+    """
+    def launch():
+        return connect_or_launch(
+            getattr(playwright, browser_type),
+            browser_type_launch_args,
+            request.config.getoption("--browser-server")
+        )
+    
+    def close(launched):
+        browser, lease = launched
         browser.close()
+        if lease:
+            lease.release()
+    
+    try:
+        browser, _ = engine_cache.get(browser_type, "browser", launch, close=close)
+        return browser
     except Exception as e:
         logger.error(f"Failed to launch browser: {str(e)}")
         raise
 
-@pytest.fixture
-def context(browser):
-    """Create a new browser context"""
-    context = browser.new_context(
-        viewport={'width': 1920, 'height': 1080},
-        ignore_https_errors=True
-    )
-    yield context
-    context.close()
-
-@pytest.fixture
-def page(context):
-    """Create a new page for each test"""
-    page = context.new_page()
-    page.set_default_timeout(30000)  # Set default timeout to 30 seconds
-    yield page
-    page.close()
+@pytest.fixture(autouse=True)
+def browser_engine_tag(request):
+    """Tag matrix runs with their engine in the Allure report"""
+    engine = item_engine(request.node)
+    if engine:
+        allure.dynamic.tag(engine)
+        allure.dynamic.parameter("browser", engine)
 
 def pytest_configure(config):
     """Add custom markers"""
     config.addinivalue_line("markers", "smoke: mark test as smoke test")
     config.addinivalue_line("markers", "regression: mark test as regression test")
-    config.addinivalue_line("markers", "negative: mark test as negative test") 
\ No newline at end of file
+    config.addinivalue_line("markers", "negative: mark test as negative test")
+    config.addinivalue_line("markers", "no_auth: start the test logged out")
+    config.addinivalue_line("markers", "login_as(identity): start the test logged in as the given identity") 
+    config.addinivalue_line("markers", "block_resources(*profiles): abort the requests of the named blocking profiles")
\ No newline at end of file
@@ -0,0 +1,25 @@
+import pytest
+from saucedemo.pages.base_page import ACTION_TIMEOUT
+from saucedemo.utils.adaptive_timeouts import AdaptiveTimeouts, TimeoutPolicy, action_key
+
+TARGET = "localhost/chromium"
+
+@pytest.mark.regression
+def test_fast_action_times_out_below_fixed_timeout():
+    """A click that usually takes 200ms gets a learned timeout well under the fixed 5s"""
+    policy = TimeoutPolicy.from_settings()
+    key = action_key("InventoryPage", "click", "#add-to-cart")
+    timeouts = AdaptiveTimeouts({TARGET: {key: [200.0] * policy.min_samples}}, policy)
+
+    timeout = timeouts.timeout(key, ACTION_TIMEOUT, TARGET)
+
+    assert timeout < ACTION_TIMEOUT, f"Learned timeout {timeout}ms is not below the fixed {ACTION_TIMEOUT}ms"
+
+@pytest.mark.regression
+def test_action_without_enough_samples_keeps_fixed_timeout():
+    """Too little history falls back to the caller's fixed timeout"""
+    policy = TimeoutPolicy.from_settings()
+    key = action_key("InventoryPage", "click", "#add-to-cart")
+    timeouts = AdaptiveTimeouts({TARGET: {key: [200.0] * (policy.min_samples - 1)}}, policy)
+
+    assert timeouts.timeout(key, ACTION_TIMEOUT, TARGET) == ACTION_TIMEOUT
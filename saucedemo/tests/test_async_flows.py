@@ -0,0 +1,50 @@
+import asyncio
+import pytest
+from saucedemo.config.constants import Credentials, Products
+from saucedemo.pages.aio.cart_page import AsyncCartPage
+from saucedemo.pages.aio.inventory_page import AsyncInventoryPage
+from saucedemo.pages.aio.login_page import AsyncLoginPage
+
+@pytest.mark.asyncio
+@pytest.mark.concurrent
+@pytest.mark.no_auth
+@pytest.mark.regression
+async def test_concurrent_logins(async_context_factory):
+    """Log in as several users at once, each in its own context"""
+    async def login(username, password):
+        context = await async_context_factory()
+        page = await context.new_page()
+        login_page = AsyncLoginPage(page)
+        outcome = await login_page.login(username, password)
+        return outcome, await login_page.get_error_message() if outcome == "error" else None
+    
+    standard, locked_out = await asyncio.gather(
+        login(Credentials.STANDARD_USER, Credentials.STANDARD_PASSWORD),
+        login(Credentials.LOCKED_OUT_USER, Credentials.LOCKED_OUT_PASSWORD)
+    )
+    
+    assert standard == ("inventory", None), f"Standard user should reach the inventory, got {standard}"
+    assert locked_out[0] == "error", f"Locked out user should see an error, got {locked_out}"
+    assert "locked out" in locked_out[1].lower(), f"Unexpected error message: {locked_out[1]}"
+
+@pytest.mark.asyncio
+@pytest.mark.concurrent
+@pytest.mark.regression
+async def test_concurrent_carts_are_isolated(async_context_factory):
+    """Fill two carts at once and check neither sees the other's items"""
+    async def fill_cart(products):
+        context = await async_context_factory("standard")
+        page = await context.new_page()
+        inventory_page = AsyncInventoryPage(page)
+        await inventory_page.navigate()
+        for product in products:
+            await inventory_page.add_to_cart(product)
+        await inventory_page.open_cart()
+        return (await AsyncCartPage(page).snapshot()).names
+    
+    first_cart = [Products.BACKPACK, Products.ONESIE]
+    second_cart = [Products.BIKE_LIGHT]
+    first, second = await asyncio.gather(fill_cart(first_cart), fill_cart(second_cart))
+    
+    assert sorted(first) == sorted(first_cart), f"First cart should hold {first_cart}, got {first}"
+    assert sorted(second) == sorted(second_cart), f"Second cart should hold {second_cart}, got {second}"
@@ -5,6 +5,10 @@ from saucedemo.pages.components.header import Header
 from saucedemo.pages.inventory_page import InventoryPage
 from playwright.sync_api import expect
 
+# These tests exercise the login form itself, so they never reuse a saved login,
+# and only read text, so they skip images, media, fonts and third-party requests
+pytestmark = [pytest.mark.no_auth, pytest.mark.block_resources("text-only")]
+
 @pytest.mark.smoke
 def test_successful_login(page):
     """Test successful login with standard user"""
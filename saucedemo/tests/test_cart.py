@@ -5,16 +5,18 @@ from saucedemo.pages.inventory_page import InventoryPage
 from saucedemo.pages.cart_page import CartPage
 from playwright.sync_api import expect
 
+# Cart tests only read names, counts and prices
+pytestmark = pytest.mark.block_resources("text-only")
+
 @pytest.mark.smoke
 @pytest.mark.regression
 def test_cart_management(page):
     """Test adding multiple items to cart and updating quantities"""
-    # Login
-    login_page = LoginPage(page)
-    login_page.login(Credentials.STANDARD_USER, Credentials.STANDARD_PASSWORD)
+    # Start on the inventory page, already logged in
+    inventory_page = InventoryPage(page)
+    inventory_page.navigate()
     
     # Add multiple items to cart
-    inventory_page = InventoryPage(page)
     test_items = [Products.BACKPACK, Products.BIKE_LIGHT, Products.ONESIE]
     
     for item in test_items:
@@ -48,13 +50,10 @@ def test_cart_management(page):
 @pytest.mark.negative
 def test_remove_nonexistent_item(page):
     """Test removing a non-existent item from cart"""
-    login_page = LoginPage(page)
     cart_page = CartPage(page)
     
-    # Login and go to cart
-    page.goto(URLs.LOGIN)
-    login_page.login(Credentials.STANDARD_USER, Credentials.STANDARD_PASSWORD)
-    page.goto(URLs.CART)
+    # Go straight to the cart, already logged in
+    cart_page.navigate()
     
     # Try to remove non-existent item
     initial_count = cart_page.get_cart_count()
@@ -67,12 +66,11 @@ def test_remove_nonexistent_item(page):
 @pytest.mark.regression
 def test_add_duplicate_item(page):
     """Test attempting to add the same item multiple times"""
-    # Login
-    login_page = LoginPage(page)
-    login_page.login(Credentials.STANDARD_USER, Credentials.STANDARD_PASSWORD)
+    # Start on the inventory page, already logged in
+    inventory_page = InventoryPage(page)
+    inventory_page.navigate()
     
     # Add same item twice
-    inventory_page = InventoryPage(page)
     inventory_page.add_to_cart(Products.BACKPACK)
     initial_count = inventory_page.get_cart_count()
     
@@ -85,12 +83,11 @@ def test_add_duplicate_item(page):
 @pytest.mark.smoke
 def test_remove_item_from_inventory(page):
     """Test removing item from cart while on inventory page"""
-    # Login
-    login_page = LoginPage(page)
-    login_page.login(Credentials.STANDARD_USER, Credentials.STANDARD_PASSWORD)
+    # Start on the inventory page, already logged in
+    inventory_page = InventoryPage(page)
+    inventory_page.navigate()
     
     # Add item to cart
-    inventory_page = InventoryPage(page)
     inventory_page.add_to_cart(Products.BACKPACK)
     assert inventory_page.get_cart_count() == 1, "Item should be added to cart"
     
@@ -101,6 +98,7 @@ def test_remove_item_from_inventory(page):
     assert inventory_page.get_cart_count() == 0, "Cart should be empty after removing item"
 
 @pytest.mark.regression
+@pytest.mark.no_auth
 def test_cart_persistence_after_logout(page):
     """Test that cart persists after logout in v1 of SauceDemo"""
     # Login
@@ -125,6 +123,7 @@ def test_cart_persistence_after_logout(page):
     assert final_count == initial_count, f"Cart should persist after logout with {initial_count} items, but found {final_count} items"
 
 @pytest.mark.negative
+@pytest.mark.no_auth
 def test_locked_out_user_cart(page):
     """Test cart access with locked out user"""
     login_page = LoginPage(page)
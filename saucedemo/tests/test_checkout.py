@@ -1,26 +1,18 @@
 import pytest
-from saucedemo.config.constants import Credentials, Products, URLs, TestData
-from saucedemo.pages.login_page import LoginPage
+from saucedemo.config.constants import URLs, TestData
 from saucedemo.pages.inventory_page import InventoryPage
 from saucedemo.pages.cart_page import CartPage
 from saucedemo.pages.checkout_page import CheckoutPage
+from saucedemo.utils.flow_checkpoints import CHECKOUT_STEP_ONE
+from saucedemo.utils.perf_budgets import expect_perf
 from playwright.sync_api import expect
 
 @pytest.mark.smoke
-def test_successful_checkout(page):
+@pytest.mark.perf_budget
+def test_successful_checkout(page, checkpoint):
     """Test complete checkout process with valid shipping details"""
-    # Login
-    login_page = LoginPage(page)
-    login_page.login(Credentials.STANDARD_USER, Credentials.STANDARD_PASSWORD)
-    
-    # Add item to cart
-    inventory_page = InventoryPage(page)
-    inventory_page.add_to_cart(Products.BACKPACK)
-    
-    # Navigate to cart and checkout
-    inventory_page.open_cart()
-    cart_page = CartPage(page)
-    cart_page.proceed_to_checkout()
+    # Start on checkout step one with the backpack in the cart
+    checkpoint(CHECKOUT_STEP_ONE)
     
     # Fill shipping details and complete checkout
     checkout_page = CheckoutPage(page)
@@ -31,16 +23,15 @@ def test_successful_checkout(page):
     # Verify confirmation message
     confirmation_message = checkout_page.get_confirmation_message()
     expect(checkout_page.get_confirmation_message()).to_have_text("THANK YOU FOR YOUR ORDER")
+    expect_perf(checkout_page.finish_checkout).to_meet_budget()
 
 @pytest.mark.negative
+@pytest.mark.block_resources("text-only")
 def test_checkout_missing_first_name(page):
     """Test checkout with missing first name"""
-    login_page = LoginPage(page)
     checkout_page = CheckoutPage(page)
     
-    # Login and go to checkout
-    page.goto(URLs.LOGIN)
-    login_page.login(Credentials.STANDARD_USER, Credentials.STANDARD_PASSWORD)
+    # Go straight to checkout, already logged in
     page.goto(URLs.CHECKOUT)
     
     # Try to checkout without first name
@@ -52,20 +43,11 @@ def test_checkout_missing_first_name(page):
     assert error and "first name is required" in error.lower(), "Should show first name required error"
 
 @pytest.mark.negative
-def test_checkout_missing_last_name(page):
+@pytest.mark.block_resources("text-only")
+def test_checkout_missing_last_name(page, checkpoint):
     """Test checkout validation when last name is missing"""
-    # Login
-    login_page = LoginPage(page)
-    login_page.login(Credentials.STANDARD_USER, Credentials.STANDARD_PASSWORD)
-    
-    # Add item to cart
-    inventory_page = InventoryPage(page)
-    inventory_page.add_to_cart(Products.BACKPACK)
-    
-    # Navigate to cart and checkout
-    inventory_page.open_cart()
-    cart_page = CartPage(page)
-    cart_page.proceed_to_checkout()
+    # Start on checkout step one with the backpack in the cart
+    checkpoint(CHECKOUT_STEP_ONE)
     
     # Fill shipping details with missing last name
     checkout_page = CheckoutPage(page)
@@ -81,20 +63,11 @@ def test_checkout_missing_last_name(page):
     assert error_message == "Error: Last Name is required"
 
 @pytest.mark.negative
-def test_checkout_missing_postal_code(page):
+@pytest.mark.block_resources("text-only")
+def test_checkout_missing_postal_code(page, checkpoint):
     """Test checkout validation when postal code is missing"""
-    # Login
-    login_page = LoginPage(page)
-    login_page.login(Credentials.STANDARD_USER, Credentials.STANDARD_PASSWORD)
-    
-    # Add item to cart
-    inventory_page = InventoryPage(page)
-    inventory_page.add_to_cart(Products.BACKPACK)
-    
-    # Navigate to cart and checkout
-    inventory_page.open_cart()
-    cart_page = CartPage(page)
-    cart_page.proceed_to_checkout()
+    # Start on checkout step one with the backpack in the cart
+    checkpoint(CHECKOUT_STEP_ONE)
     
     # Fill shipping details with missing postal code
     checkout_page = CheckoutPage(page)
@@ -122,13 +95,11 @@ def test_checkout_empty_cart(page):
     
     This test will fail to highlight this issue.
     """
-    login_page = LoginPage(page)
+    inventory_page = InventoryPage(page)
     cart_page = CartPage(page)
-    checkout_page = CheckoutPage(page)
     
-    # Login and verify cart is empty
-    page.goto(URLs.LOGIN)
-    login_page.login(Credentials.STANDARD_USER, Credentials.STANDARD_PASSWORD)
+    # Start logged in and verify cart is empty
+    inventory_page.navigate()
     assert cart_page.get_cart_count() == 0, "Cart should be empty"
     
     # Attempt checkout with empty cart
@@ -1,35 +1,33 @@
 import pytest
 from playwright.sync_api import expect
-from saucedemo.config.constants import Credentials, URLs, Products
-from saucedemo.pages.login_page import LoginPage
+from saucedemo.config.constants import URLs, Products
+from saucedemo.config.logger import get_logger
 from saucedemo.pages.inventory_page import InventoryPage
 from saucedemo.pages.product_details_page import ProductDetailsPage
+from saucedemo.utils.dom_watcher import dom_changes
+
+logger = get_logger(__name__)
 
 @pytest.mark.smoke
 @pytest.mark.regression
 def test_sort_products_by_price(page):
     """Test sorting products by price low to high"""
-    # Login
-    login_page = LoginPage(page)
-    login_page.login(Credentials.STANDARD_USER, Credentials.STANDARD_PASSWORD)
+    # Start on the inventory page, already logged in
+    inventory_page = InventoryPage(page)
+    inventory_page.navigate()
     
     # Sort and verify products
-    inventory_page = InventoryPage(page)
     inventory_page.sort_products("Price (low to high)")
     prices = inventory_page.get_product_prices()
     assert prices == sorted(prices), "Products are not sorted by price correctly"
 
 @pytest.mark.smoke
-def test_cart_management(page):
-    """Test adding and removing items from cart via product details"""
-    # Login
-    login_page = LoginPage(page)
-    login_page.login(Credentials.STANDARD_USER, Credentials.STANDARD_PASSWORD)
-    
-    # Manage cart items
+def test_cart_management(page, cart_state):
+    """Test removing a seeded cart item via product details"""
+    # Start on the inventory page, already logged in with two items in the cart
+    cart_state([Products.BACKPACK, Products.ONESIE])
     inventory_page = InventoryPage(page)
-    inventory_page.add_to_cart(Products.BACKPACK)
-    inventory_page.add_to_cart(Products.ONESIE)
+    inventory_page.navigate()
     
     # Remove item through product details
     inventory_page.open_product_details(Products.BACKPACK)
@@ -39,16 +37,35 @@ def test_cart_management(page):
     # Verify cart count
     expect(page.locator(".shopping_cart_badge")).to_have_text("1")
 
+@pytest.mark.regression
+def test_cart_badge_follows_add_and_remove(page, request):
+    """Test the cart badge settles after each add and remove, as streamed by the DOM watcher"""
+    # Start on the inventory page, already logged in with an empty cart
+    inventory_page = InventoryPage(page)
+    inventory_page.navigate()
+    
+    # Each action returns once its button label has flipped
+    inventory_page.add_to_cart(Products.BACKPACK)
+    assert inventory_page.get_cart_count() == 1
+    inventory_page.add_to_cart(Products.ONESIE)
+    assert inventory_page.get_cart_count() == 2
+    inventory_page.remove_from_cart(Products.BACKPACK)
+    assert inventory_page.get_cart_count() == 1
+    
+    # Verify the badge transitions were pushed to Python in order
+    badge = [change.value for change in dom_changes.changes(request.node.nodeid)
+             if change.watch == "cart_badge"]
+    assert badge[-3:] == ["1", "2", "1"]
+
 @pytest.mark.smoke
 @pytest.mark.regression
 def test_product_details(page):
     """Test product details page functionality"""
-    # Login
-    login_page = LoginPage(page)
-    login_page.login(Credentials.STANDARD_USER, Credentials.STANDARD_PASSWORD)
+    # Start on the inventory page, already logged in
+    inventory_page = InventoryPage(page)
+    inventory_page.navigate()
     
     # Open product details
-    inventory_page = InventoryPage(page)
     inventory_page.open_product_details(Products.BACKPACK)
     
     # Verify product details page
@@ -62,17 +79,18 @@ def test_product_details(page):
     expect(page).to_have_url(URLs.INVENTORY)
 
 @pytest.mark.negative
+@pytest.mark.login_as("problem")
+@pytest.mark.block_resources("no-images")
 def test_problem_user_inventory(page):
     """Test inventory page with problem user - known to have image loading issues"""
-    # Login as problem user
-    login_page = LoginPage(page)
-    login_page.login(Credentials.PROBLEM_USER, Credentials.STANDARD_PASSWORD)
+    # Start on the inventory page, already logged in as problem user
+    inventory_page = InventoryPage(page)
+    inventory_page.navigate()
     
     # Verify inventory page loads
     expect(page).to_have_url(URLs.INVENTORY)
     
     # Document known issues with problem user
-    inventory_page = InventoryPage(page)
     product_count = inventory_page.get_products_count()
     assert product_count > 0, "No products displayed for problem user"
     
@@ -87,6 +105,7 @@ def test_problem_user_inventory(page):
 
 @pytest.mark.smoke
 @pytest.mark.negative
+@pytest.mark.no_auth
 def test_direct_inventory_access(page):
     """Test direct access to inventory URL when not logged in.
     
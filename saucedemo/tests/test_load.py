@@ -0,0 +1,28 @@
+import json
+from pathlib import Path
+import allure
+import pytest
+from saucedemo.config.logger import get_logger
+from saucedemo.config.settings import get_settings
+from saucedemo.utils.load_harness import format_report, run_load, write_report
+
+logger = get_logger(__name__)
+
+settings = get_settings()
+
+@pytest.mark.load
+@pytest.mark.asyncio
+async def test_checkout_load(async_playwright, load_profile, request):
+    """Run virtual users through the checkout flow and check the error rate"""
+    report = await run_load(load_profile, async_playwright)
+    
+    report_path = write_report(report, Path(settings.RESULTS_DIR) / "load_report.json")
+    logger.info(f"Load report written to {report_path}:\n{format_report(report)}")
+    allure.attach(json.dumps(report, indent=2), name="load report",
+                  attachment_type=allure.attachment_type.JSON)
+    
+    max_error_rate = request.config.getoption("--load-max-error-rate")
+    error_rate = report["iterations"]["error_rate"]
+    assert report["iterations"]["started"] > 0, "Load run did not start any iterations"
+    assert error_rate <= max_error_rate, \
+        f"Iteration error rate {error_rate:.2%} exceeds {max_error_rate:.2%}: {report['errors']}"
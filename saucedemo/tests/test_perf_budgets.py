@@ -0,0 +1,30 @@
+import pytest
+from saucedemo.pages.checkout_page import CheckoutPage
+from saucedemo.utils.perf_budgets import ACTION_METRIC, Budget, PerfBudgets, subject_of
+
+TARGET = "localhost/chromium"
+
+class FakePage:
+    """Enough of a Page for a page object that never drives it"""
+    def locator(self, selector):
+        return selector
+
+@pytest.mark.regression
+def test_inherited_action_budget_uses_recorded_key():
+    """finish_checkout is defined on a mixin but recorded under CheckoutPage, like its budget"""
+    checkout_page = CheckoutPage(FakePage())
+
+    assert subject_of(checkout_page.finish_checkout) == "action:CheckoutPage.finish_checkout"
+    assert subject_of("CheckoutPage.finish_checkout") == "action:CheckoutPage.finish_checkout"
+
+@pytest.mark.regression
+def test_percentile_budget_needs_min_samples():
+    """A slow percentile over too few samples is reported, not enforced"""
+    budget = Budget("action:CheckoutPage.finish_checkout", ACTION_METRIC, 1000.0, 90)
+    budgets = PerfBudgets([budget], {}, min_samples=5)
+
+    early = budgets.check(budget, [3000.0] * 4, TARGET)
+    enforced = budgets.check(budget, [3000.0] * 5, TARGET)
+
+    assert early.passed and not early.enforced
+    assert not enforced.passed and enforced.enforced
@@ -0,0 +1,22 @@
+import pytest
+from saucedemo.plugins.async_fixtures import uses_event_loop
+
+# Sync and asyncio Playwright in one session: the sync test comes first in
+# this module, so the asyncio test only passes once sync Playwright is stopped
+
+@pytest.mark.regression
+def test_sync_playwright_before_asyncio(playwright):
+    """Start sync Playwright, as every sync browser test does"""
+    assert playwright.chromium.name == "chromium"
+
+@pytest.mark.asyncio
+@pytest.mark.regression
+async def test_async_playwright_after_sync(async_playwright):
+    """Run on the session event loop after a sync Playwright test"""
+    assert async_playwright.chromium.name == "chromium"
+
+@pytest.mark.regression
+def test_asyncio_tests_run_last(request):
+    """Every asyncio test is scheduled after the sync ones"""
+    phases = [uses_event_loop(item) for item in request.session.items]
+    assert phases == sorted(phases), "A sync test is scheduled after an asyncio test"
\ No newline at end of file
@@ -0,0 +1,120 @@
+import functools
+import threading
+import time
+from collections import defaultdict
+from typing import NamedTuple
+
+from saucedemo.utils.browser_matrix import page_engine, run_target
+from saucedemo.utils.stats import histogram, latency_summary
+from saucedemo.utils.xdist import current_test_id
+
+
+class ActionTiming(NamedTuple):
+    """One timed page-object action"""
+    page_object: str
+    method: str
+    selector: str
+    test_id: str
+    duration_ms: float
+    ok: bool
+    # run_target() of the page: host and engine the action ran against
+    target: str
+
+
+class ActionTimings:
+    """In-process store of page-object action timings"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples = []
+        self._by_test = defaultdict(list)
+
+    def record(self, timing: ActionTiming):
+        with self._lock:
+            self._samples.append(timing)
+            self._by_test[timing.test_id].append(timing)
+
+    def samples(self, test_id: str = None) -> list[ActionTiming]:
+        """All samples, or only those recorded during the given test"""
+        with self._lock:
+            if test_id is None:
+                return list(self._samples)
+            return list(self._by_test.get(test_id, ()))
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+            self._by_test.clear()
+
+
+# Shared by every page object in this process
+action_timings = ActionTimings()
+
+
+def _target(args: tuple, kwargs: dict) -> str:
+    """Selector or URL an action operated on, taken from its first argument"""
+    target = args[0] if args else kwargs.get("selector", kwargs.get("url", ""))
+    if isinstance(target, dict):
+        return ",".join(target)
+    return str(target)
+
+
+def timed_action(method):
+    """Record the wall-clock duration of a page-object action written as steps
+
+    Apply under @stepwise (see saucedemo.utils.steps); an async page's awaited
+    calls happen between the steps, so they are part of the duration.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        start = time.perf_counter()
+        ok = False
+        try:
+            result = yield from method(self, *args, **kwargs)
+            ok = True
+            return result
+        finally:
+            action_timings.record(ActionTiming(
+                page_object=type(self).__name__,
+                method=method.__name__,
+                selector=_target(args, kwargs),
+                test_id=current_test_id(),
+                duration_ms=(time.perf_counter() - start) * 1000,
+                ok=ok,
+                target=run_target(page_engine(self.page))
+            ))
+    return wrapper
+
+
+def summarize(samples: list[ActionTiming]) -> dict:
+    """Latency percentiles and histograms per page-object method and per selector
+
+    Groups are sorted by total time so the interactions that dominate the
+    suite's wall-clock time come first.
+    """
+    by_method = defaultdict(list)
+    by_selector = defaultdict(list)
+    failures = defaultdict(int)
+    for sample in samples:
+        method_key = (sample.page_object, sample.method)
+        by_method[method_key].append(sample.duration_ms)
+        by_selector[method_key + (sample.selector,)].append(sample.duration_ms)
+        if not sample.ok:
+            failures[method_key + (sample.selector,)] += 1
+
+    methods = [
+        {"page_object": page_object, "method": method, **latency_summary(values),
+         "histogram": histogram(values)}
+        for (page_object, method), values in by_method.items()
+    ]
+    selectors = [
+        {"page_object": page_object, "method": method, "selector": selector,
+         "failures": failures[(page_object, method, selector)], **latency_summary(values),
+         "histogram": histogram(values)}
+        for (page_object, method, selector), values in by_selector.items()
+    ]
+    return {
+        "total_actions": len(samples),
+        "by_method": sorted(methods, key=lambda group: group["total_ms"], reverse=True),
+        "by_selector": sorted(selectors, key=lambda group: group["total_ms"], reverse=True),
+    }
@@ -0,0 +1,152 @@
+"""Page-object timeouts derived from how long each action usually takes
+
+Every wait made through PageCore.timeout_for records how long it took
+when it succeeded, keyed by page object, method and selector. Once a key has
+ADAPTIVE_TIMEOUT_MIN_SAMPLES successful samples, its timeout becomes
+
+    clamp(p99 of the samples x ADAPTIVE_TIMEOUT_FACTOR, FLOOR, CEILING)
+
+so a missing element fails in a few multiples of its usual latency instead of
+the full fixed timeout, while an action that is slow but normal for it keeps
+enough headroom. Keys with too little history use the caller's fixed default.
+
+Samples are kept per target host and engine (a local replica answers in a
+fraction of the public site's time, and chromium is faster than webkit) and
+carried across runs in ADAPTIVE_TIMEOUTS_HISTORY.
+"""
+import json
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import NamedTuple, Optional
+from saucedemo.config.logger import get_logger
+from saucedemo.config.settings import get_settings
+from saucedemo.utils.browser_matrix import run_target
+from saucedemo.utils.stats import percentile
+
+logger = get_logger(__name__)
+
+settings = get_settings()
+
+# Successful samples per key and host kept across runs
+HISTORY_WINDOW = 50
+
+
+class TimeoutPolicy(NamedTuple):
+    """How a key's latency samples turn into a timeout"""
+    factor: float = 3.0
+    floor: int = 1000
+    ceiling: int = 30000
+    min_samples: int = 5
+    percentile: float = 99
+
+    @classmethod
+    def from_settings(cls) -> "TimeoutPolicy":
+        return cls(
+            factor=settings.ADAPTIVE_TIMEOUT_FACTOR,
+            floor=settings.ADAPTIVE_TIMEOUT_FLOOR,
+            ceiling=settings.ADAPTIVE_TIMEOUT_CEILING,
+            min_samples=settings.ADAPTIVE_TIMEOUT_MIN_SAMPLES
+        )
+
+    def derive(self, samples: list[float]) -> Optional[int]:
+        """Timeout for these samples, or None when there are too few to go by"""
+        if len(samples) < self.min_samples:
+            return None
+        return int(min(self.ceiling, max(self.floor, percentile(samples, self.percentile) * self.factor)))
+
+
+def action_key(page_object: str, method: str, selector: str) -> str:
+    return f"{page_object}.{method} {selector}"
+
+
+class AdaptiveTimeouts:
+    """Earlier runs' samples plus this process's, and the timeouts derived from them"""
+
+    def __init__(self, history: dict[str, dict[str, list[float]]], policy: TimeoutPolicy,
+                 enabled: bool = True):
+        self.history = history
+        self.policy = policy
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._recent = defaultdict(lambda: defaultdict(list))
+
+    @classmethod
+    def load(cls, path: Path, policy: TimeoutPolicy = None, enabled: bool = True) -> "AdaptiveTimeouts":
+        history = {}
+        if path.exists():
+            try:
+                with open(path) as f:
+                    history = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable action latency history {path}: {e}")
+        return cls(history, policy or TimeoutPolicy.from_settings(), enabled)
+
+    def samples(self, key: str, target: str) -> list[float]:
+        with self._lock:
+            recent = list(self._recent[target].get(key, ()))
+        return (self.history.get(target, {}).get(key, []) + recent)[-HISTORY_WINDOW:]
+
+    def timeout(self, key: str, default: int, target: str) -> int:
+        """Derived timeout for the key on a run_target(), or default while it has too little history"""
+        if not self.enabled:
+            return default
+        derived = self.policy.derive(self.samples(key, target))
+        if derived is None:
+            return default
+        logger.debug(f"Adaptive timeout {derived}ms for {key} (fixed {default}ms)")
+        return derived
+
+    def record(self, key: str, duration_ms: float, target: str):
+        with self._lock:
+            self._recent[target][key].append(round(duration_ms, 1))
+
+    def recent(self) -> dict[str, dict[str, list[float]]]:
+        """Samples recorded in this process, by target and key"""
+        with self._lock:
+            return {target: {key: list(values) for key, values in keys.items()}
+                    for target, keys in self._recent.items()}
+
+    def updated_history(self, new_samples: dict[str, dict[str, list[float]]]) -> dict:
+        """History with new samples appended, keeping the newest HISTORY_WINDOW per key"""
+        history = {target: dict(keys) for target, keys in self.history.items()}
+        for target, keys in new_samples.items():
+            target_history = history.setdefault(target, {})
+            for key, values in keys.items():
+                target_history[key] = (target_history.get(key, []) + values)[-HISTORY_WINDOW:]
+        return history
+
+
+# Timeouts in use in this process, set by the adaptive_timeouts plugin or loaded on first use
+_active: Optional[AdaptiveTimeouts] = None
+
+
+def use_timeouts(timeouts: Optional[AdaptiveTimeouts]):
+    global _active
+    _active = timeouts
+
+
+def get_adaptive_timeouts() -> AdaptiveTimeouts:
+    """Timeouts in use, loaded from ADAPTIVE_TIMEOUTS_HISTORY relative to the working directory by default"""
+    global _active
+    if _active is None:
+        _active = AdaptiveTimeouts.load(Path(settings.ADAPTIVE_TIMEOUTS_HISTORY),
+                                        enabled=settings.ADAPTIVE_TIMEOUTS)
+    return _active
+
+
+@contextmanager
+def adaptive_timeout(page_object: str, method: str, selector: str,
+                     timeout: Optional[int], default: int, engine: str):
+    """Yield the timeout for a wait on an engine, and record its latency if the wait succeeds
+
+    An explicit timeout from the caller is used as is, but still recorded.
+    """
+    timeouts = get_adaptive_timeouts()
+    key = action_key(page_object, method, selector)
+    target = run_target(engine)
+    start = time.perf_counter()
+    yield timeout or timeouts.timeout(key, default, target)
+    timeouts.record(key, (time.perf_counter() - start) * 1000, target)
@@ -0,0 +1,49 @@
+from playwright.sync_api import Page
+from saucedemo.config.constants import URLs
+
+# Blank document on the app origin, fulfilled locally so its storage can be
+# read and written without loading any real page
+BLANK_PATH = "__app_storage__"
+BLANK_BODY = "<!DOCTYPE html><html><head></head><body></body></html>"
+
+
+def blank_app_url() -> str:
+    """URL of the locally fulfilled blank page on the app origin"""
+    return f"{URLs.BASE_URL}/{BLANK_PATH}"
+
+
+def fulfill_blank(route):
+    route.fulfill(status=200, content_type="text/html", body=BLANK_BODY)
+
+
+def write_local_storage(page: Page, entries: dict[str, str]):
+    """Write localStorage entries for the app origin, then leave the page blank"""
+    write_app_storage(page, entries)
+
+
+def write_app_storage(page: Page, local: dict[str, str], session: dict[str, str] = None,
+                      clear: bool = False):
+    """Write localStorage and, optionally, this tab's sessionStorage entries for the app origin
+
+    With clear, both storages are emptied first. The page is left blank;
+    sessionStorage survives the navigation as it belongs to the tab, not the
+    document.
+    """
+    url = blank_app_url()
+    page.route(url, fulfill_blank)
+    try:
+        page.goto(url)
+        page.evaluate(
+            """([local, session, clear]) => {
+                if (clear) {
+                    window.localStorage.clear();
+                    window.sessionStorage.clear();
+                }
+                Object.entries(local).forEach(([k, v]) => window.localStorage.setItem(k, v));
+                Object.entries(session).forEach(([k, v]) => window.sessionStorage.setItem(k, v));
+            }""",
+            [local, session or {}, clear]
+        )
+    finally:
+        page.unroute(url, fulfill_blank)
+    page.goto("about:blank")
@@ -0,0 +1,138 @@
+"""Failure artifacts: captured in memory, attached to Allure, written in the background
+
+A failure screenshot is taken into a buffer (SCREENSHOT_FORMAT, _QUALITY and
+_FULL_PAGE), attached to the Allure report straight from that buffer, and
+handed to artifact_writer, whose threads write it to
+
+    <SCREENSHOT_DIR>/<worker id>/<test id>-<name>.<png|jpeg>
+
+so the test thread only waits for the browser to produce the image. Paths
+include the worker and the full test id (parameters included), so parametrised
+tests and xdist workers never overwrite each other's files. Pending writes are
+finished at session end.
+"""
+import hashlib
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+import allure
+from playwright.sync_api import Error
+from saucedemo.config.logger import get_logger
+from saucedemo.config.settings import get_settings
+from saucedemo.utils.xdist import worker_id
+
+logger = get_logger(__name__)
+
+settings = get_settings()
+
+FORMATS = ("png", "jpeg")
+
+ATTACHMENT_TYPES = {
+    "png": allure.attachment_type.PNG,
+    "jpeg": allure.attachment_type.JPG,
+}
+
+# Longest test id kept verbatim in a file name; longer ones are cut and keep their hash
+MAX_SLUG = 120
+
+
+def screenshot_options() -> dict:
+    """page.screenshot() arguments from the SCREENSHOT_* settings"""
+    image_format = settings.SCREENSHOT_FORMAT.lower()
+    if image_format not in FORMATS:
+        raise ValueError(f"Unknown SCREENSHOT_FORMAT '{image_format}', expected one of: {', '.join(FORMATS)}")
+    options = {"type": image_format, "full_page": settings.SCREENSHOT_FULL_PAGE}
+    if image_format == "jpeg":
+        options["quality"] = settings.SCREENSHOT_QUALITY
+    return options
+
+
+def artifact_path(test_id: str, name: str, extension: str, root: str = None) -> Path:
+    """Unique path of a test's artifact under this worker's directory of root (SCREENSHOT_DIR by default)"""
+    slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", test_id).strip("_")[:MAX_SLUG]
+    digest = hashlib.sha1(test_id.encode()).hexdigest()[:8]
+    return Path(root or settings.SCREENSHOT_DIR) / worker_id() / f"{slug}-{digest}-{name}.{extension}"
+
+
+class ArtifactWriter:
+    """Writes artifact buffers to disk on background threads"""
+
+    def __init__(self, max_workers: int = 2):
+        self.max_workers = max_workers
+        self._executor = None
+        self._pending = []
+        self._lock = threading.Lock()
+
+    def write(self, path: Path, data: bytes) -> Future:
+        """Queue a buffer to be written to path"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="artifact-writer")
+            future = self._executor.submit(self._write, path, data)
+            self._pending = [pending for pending in self._pending if not pending.done()]
+            self._pending.append(future)
+        return future
+
+    @staticmethod
+    def _write(path: Path, data: bytes) -> Path:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+        return path
+
+    def drain(self) -> int:
+        """Wait for every queued write; returns how many were still pending"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        for future in pending:
+            error = future.exception()
+            if error:
+                logger.warning(f"Failed to write artifact: {str(error)}")
+        return len(pending)
+
+    def close(self):
+        self.drain()
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+
+artifact_writer = ArtifactWriter(settings.ARTIFACT_WRITERS)
+
+
+def publish_screenshot(data: bytes, test_id: str, name: str = "screenshot") -> Path:
+    """Attach a screenshot buffer to the Allure report and queue it to be written to disk"""
+    image_format = screenshot_options()["type"]
+    allure.attach(data, name=name, attachment_type=ATTACHMENT_TYPES[image_format])
+    path = artifact_path(test_id, name, image_format)
+    artifact_writer.write(path, data)
+    logger.info(f"Screenshot of {test_id} queued for {path}")
+    return path
+
+
+def capture_screenshot(page, test_id: str, name: str = "screenshot") -> Optional[Path]:
+    """Screenshot a playwright.sync_api page into memory and publish it; None if the page is gone"""
+    try:
+        data = page.screenshot(**screenshot_options())
+    except Error as e:
+        logger.warning(f"Could not take screenshot of {test_id}: {str(e)}")
+        return None
+    return publish_screenshot(data, test_id, name)
+
+
+async def take_screenshot_async(page, test_id: str) -> Optional[bytes]:
+    """Screenshot a playwright.async_api page into memory; None if the page is gone"""
+    try:
+        return await page.screenshot(**screenshot_options())
+    except Error as e:
+        logger.warning(f"Could not take screenshot of {test_id}: {str(e)}")
+        return None
+
+
+async def capture_screenshot_async(page, test_id: str, name: str = "screenshot") -> Optional[Path]:
+    """capture_screenshot() for a playwright.async_api page"""
+    data = await take_screenshot_async(page, test_id)
+    return publish_screenshot(data, test_id, name) if data else None
@@ -0,0 +1,307 @@
+"""On-disk response cache served through context routes
+
+Every fresh browser context downloads the same CSS, JS and product images.
+install_asset_cache() routes a context's requests through the active
+AssetCache, which stores response bodies once, content-addressed by their
+SHA-256, and fulfills later requests for the same URL from disk.
+
+    <ASSET_CACHE_DIR>/objects/<sha256>        response bodies
+    <ASSET_CACHE_DIR>/entries/<sha1 of url>   status, headers and body hash per URL
+
+Modes:
+
+- passthrough: no routing, every request goes to the network
+- record: fetch everything from the network and (re)write the cache
+- static: serve stylesheets, scripts, images, fonts and media from the cache,
+  fetching and storing misses; documents and XHR go to the network
+- replay: serve every GET from the cache, fetching and storing misses
+
+Only GET responses with status 200 and no Set-Cookie header are stored.
+Entries older than max_age seconds, or whose URL matches one of the
+invalidate patterns (fnmatch globs), are fetched again. Files are written
+atomically, so xdist workers can share one cache directory.
+
+    python -m saucedemo.utils.asset_cache --list
+    python -m saucedemo.utils.asset_cache --invalidate "*/static/js/*" --older-than 3600
+"""
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+import time
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Optional
+
+from playwright.sync_api import Error
+from saucedemo.config.logger import get_logger
+from saucedemo.config.settings import get_settings
+
+logger = get_logger(__name__)
+
+settings = get_settings()
+
+PASSTHROUGH = "passthrough"
+RECORD = "record"
+STATIC = "static"
+REPLAY = "replay"
+MODES = (PASSTHROUGH, RECORD, STATIC, REPLAY)
+
+STATIC_RESOURCE_TYPES = {"stylesheet", "script", "image", "font", "media"}
+
+# The stored body is already decoded, and its length is set by fulfill
+DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+
+def parse_patterns(value: str) -> list[str]:
+    """URL globs from a comma-separated setting, e.g. "*.css,*/static/js/*" """
+    return [pattern.strip() for pattern in value.split(",") if pattern.strip()]
+
+
+def _write_atomic(path: Path, data: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+class AssetCache:
+    """Content-addressed response cache of one directory, with hit/miss counts for this process"""
+
+    def __init__(self, root: Path, mode: str = STATIC, max_age: float = 0,
+                 invalidate: list[str] = None):
+        if mode not in MODES:
+            raise ValueError(f"Unknown asset cache mode '{mode}', expected one of: {', '.join(MODES)}")
+        self.root = Path(root)
+        self.mode = mode
+        self.max_age = max_age
+        self.invalidate = invalidate or []
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+        self.bytes_served = 0
+        self._bodies = {}
+
+    @classmethod
+    def from_settings(cls, root: Path, mode: str = None) -> "AssetCache":
+        return cls(
+            root,
+            mode=mode or settings.ASSET_CACHE,
+            max_age=settings.ASSET_CACHE_MAX_AGE,
+            invalidate=parse_patterns(settings.ASSET_CACHE_INVALIDATE)
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != PASSTHROUGH
+
+    def _entry_path(self, url: str) -> Path:
+        return self.root / "entries" / hashlib.sha1(url.encode()).hexdigest()
+
+    def _object_path(self, digest: str) -> Path:
+        return self.root / "objects" / digest
+
+    def serves(self, request) -> bool:
+        """Whether a request goes through the cache in this mode"""
+        if request.method != "GET" or not request.url.startswith("http"):
+            return False
+        if self.mode == STATIC:
+            return request.resource_type in STATIC_RESOURCE_TYPES
+        return self.mode in (RECORD, REPLAY)
+
+    def is_fresh(self, entry: dict) -> bool:
+        if self.max_age and time.time() - entry["stored_at"] > self.max_age:
+            return False
+        return not any(fnmatch(entry["url"], pattern) for pattern in self.invalidate)
+
+    def lookup(self, url: str) -> Optional[dict]:
+        """The fresh entry stored for a URL, or None; always None in record mode"""
+        if self.mode == RECORD:
+            return None
+        try:
+            with open(self._entry_path(url)) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not self.is_fresh(entry) or not self._object_path(entry["sha256"]).exists():
+            return None
+        return entry
+
+    def body(self, entry: dict) -> bytes:
+        digest = entry["sha256"]
+        if digest not in self._bodies:
+            self._bodies[digest] = self._object_path(digest).read_bytes()
+        return self._bodies[digest]
+
+    def store(self, url: str, status: int, headers: dict, body: bytes) -> bool:
+        """Store a response if it is cacheable; returns whether it was stored"""
+        if status != 200 or "set-cookie" in headers:
+            return False
+        digest = hashlib.sha256(body).hexdigest()
+        object_path = self._object_path(digest)
+        if not object_path.exists():
+            _write_atomic(object_path, body)
+        entry = {
+            "url": url,
+            "status": status,
+            "headers": headers,
+            "sha256": digest,
+            "stored_at": time.time(),
+        }
+        _write_atomic(self._entry_path(url), json.dumps(entry).encode())
+        self._bodies[digest] = body
+        self.stored += 1
+        return True
+
+    def _served(self, entry: dict) -> dict:
+        body = self.body(entry)
+        self.hits += 1
+        self.bytes_served += len(body)
+        return {"status": entry["status"], "headers": entry["headers"], "body": body}
+
+    def _fetched(self, url: str, status: int, headers: dict, body: bytes) -> dict:
+        headers = {name: value for name, value in headers.items() if name not in DROPPED_HEADERS}
+        self.misses += 1
+        self.store(url, status, headers, body)
+        return {"status": status, "headers": headers, "body": body}
+
+    def handle(self, route):
+        """Route handler for a playwright.sync_api context"""
+        request = route.request
+        if not self.serves(request):
+            route.fallback()
+            return
+        entry = self.lookup(request.url)
+        if entry:
+            route.fulfill(**self._served(entry))
+            return
+        try:
+            # Redirects are passed on to the browser rather than followed here,
+            # so the page ends up on the URL it would have without the cache
+            response = route.fetch(max_redirects=0)
+            body = response.body()
+        except Error as e:
+            logger.debug(f"Asset cache fetch failed for {request.url}: {str(e)}")
+            route.fallback()
+            return
+        route.fulfill(**self._fetched(request.url, response.status, response.headers, body))
+
+    async def handle_async(self, route):
+        """handle() for a playwright.async_api context"""
+        request = route.request
+        if not self.serves(request):
+            await route.fallback()
+            return
+        entry = self.lookup(request.url)
+        if entry:
+            await route.fulfill(**self._served(entry))
+            return
+        try:
+            response = await route.fetch(max_redirects=0)
+            body = await response.body()
+        except Error as e:
+            logger.debug(f"Asset cache fetch failed for {request.url}: {str(e)}")
+            await route.fallback()
+            return
+        await route.fulfill(**self._fetched(request.url, response.status, response.headers, body))
+
+    def stats(self) -> dict:
+        """Hit, miss and store counts of this process"""
+        return {
+            "mode": self.mode,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stored": self.stored,
+            "bytes_served": self.bytes_served,
+        }
+
+    def entries(self) -> list[dict]:
+        """Every stored entry, fresh or not"""
+        entries = []
+        for path in sorted((self.root / "entries").glob("*")):
+            try:
+                with open(path) as f:
+                    entries.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return entries
+
+    def prune(self, patterns: list[str] = None, older_than: float = None) -> int:
+        """Delete entries matching any pattern or older than older_than seconds, then unused bodies
+
+        Returns the number of entries deleted.
+        """
+        now = time.time()
+        deleted = 0
+        for entry in self.entries():
+            matched = any(fnmatch(entry["url"], pattern) for pattern in patterns or [])
+            expired = older_than is not None and now - entry["stored_at"] > older_than
+            if matched or expired:
+                self._entry_path(entry["url"]).unlink(missing_ok=True)
+                deleted += 1
+        used = {entry["sha256"] for entry in self.entries()}
+        for path in (self.root / "objects").glob("*"):
+            if path.name not in used:
+                path.unlink(missing_ok=True)
+        return deleted
+
+
+_active: Optional[AssetCache] = None
+
+
+def use_asset_cache(cache: Optional[AssetCache]):
+    global _active
+    _active = cache
+
+
+def get_asset_cache() -> AssetCache:
+    """Cache in use, in ASSET_CACHE_DIR relative to the working directory by default"""
+    global _active
+    if _active is None:
+        _active = AssetCache.from_settings(Path(settings.ASSET_CACHE_DIR))
+    return _active
+
+
+def install_asset_cache(context):
+    """Route the context's requests through the active asset cache, unless it is in passthrough mode"""
+    cache = get_asset_cache()
+    if cache.enabled:
+        context.route("**/*", cache.handle)
+
+
+async def install_asset_cache_async(context):
+    """install_asset_cache() for a playwright.async_api BrowserContext"""
+    cache = get_asset_cache()
+    if cache.enabled:
+        await context.route("**/*", cache.handle_async)
+
+
+def main(argv: list[str] = None):
+    parser = argparse.ArgumentParser(description="List or invalidate entries of the asset cache")
+    parser.add_argument("--dir", default=settings.ASSET_CACHE_DIR, help="Cache directory")
+    parser.add_argument("--list", action="store_true", help="List the stored URLs and their age")
+    parser.add_argument("--invalidate", action="append", default=[], metavar="PATTERN",
+                        help="Delete entries whose URL matches this glob (repeatable)")
+    parser.add_argument("--older-than", type=float, default=None, metavar="SECONDS",
+                        help="Delete entries stored more than this many seconds ago")
+    args = parser.parse_args(argv)
+
+    cache = AssetCache(Path(args.dir), mode=PASSTHROUGH)
+    if args.invalidate or args.older_than is not None:
+        deleted = cache.prune(args.invalidate, args.older_than)
+        print(f"Deleted {deleted} entries from {cache.root}")
+    if args.list:
+        now = time.time()
+        for entry in cache.entries():
+            print(f"{now - entry['stored_at']:>10.0f}s  {entry['url']}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
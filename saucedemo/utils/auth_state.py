@@ -0,0 +1,164 @@
+import asyncio
+import json
+from pathlib import Path
+from typing import Optional
+
+from playwright.async_api import Browser as AsyncBrowser, BrowserContext as AsyncBrowserContext
+from playwright.sync_api import Browser, BrowserContext
+from saucedemo.config.constants import Credentials, URLs
+from saucedemo.config.logger import get_logger
+from saucedemo.pages.aio.login_page import AsyncLoginPage
+from saucedemo.pages.login_page import LoginPage
+
+logger = get_logger(__name__)
+
+# Identities that can log in through the form, keyed by the name used
+# in the ``login_as`` marker
+IDENTITIES = {
+    "standard": (Credentials.STANDARD_USER, Credentials.STANDARD_PASSWORD),
+    "problem": (Credentials.PROBLEM_USER, Credentials.PROBLEM_PASSWORD),
+}
+DEFAULT_IDENTITY = "standard"
+
+# Playwright's storage state only covers cookies and localStorage, so
+# sessionStorage is restored by an init script on the app origin
+SESSION_STORAGE_SCRIPT = """
+(() => {
+    const origin = %s;
+    const entries = %s;
+    if (window.location.origin !== origin || window.sessionStorage.length > 0) {
+        return;
+    }
+    for (const [key, value] of Object.entries(entries)) {
+        window.sessionStorage.setItem(key, value);
+    }
+})();
+"""
+
+
+def session_storage_script(state: dict) -> Optional[str]:
+    """Init script restoring a captured state's sessionStorage, or None if it had none"""
+    if not state["session_storage"]:
+        return None
+    return SESSION_STORAGE_SCRIPT % (
+        json.dumps(state["origin"]),
+        json.dumps(state["session_storage"])
+    )
+
+
+def _check_identity(identity: str):
+    if identity not in IDENTITIES:
+        raise ValueError(
+            f"Unknown identity '{identity}', expected one of: {', '.join(IDENTITIES)}"
+        )
+
+
+def auth_identity(node) -> Optional[str]:
+    """Get the identity a test should start logged in as, or None for no_auth tests"""
+    if node.get_closest_marker("no_auth"):
+        return None
+    marker = node.get_closest_marker("login_as")
+    return marker.args[0] if marker else DEFAULT_IDENTITY
+
+
+class AuthStateCache:
+    """Logged-in browser storage state per identity, captured once per worker"""
+
+    def __init__(self, browser: Browser, state_dir: Path):
+        self.browser = browser
+        self.state_dir = state_dir
+        self._states = {}
+
+    def get(self, identity: str) -> dict:
+        """Get the cached state for an identity, logging in on first use"""
+        if identity not in self._states:
+            self._states[identity] = self._capture(identity)
+        return self._states[identity]
+
+    def new_context(self, identity: str, **options) -> BrowserContext:
+        """Create a browser context that starts logged in as the given identity"""
+        state = self.get(identity)
+        context = self.browser.new_context(storage_state=state["path"], **options)
+        script = session_storage_script(state)
+        if script:
+            context.add_init_script(script)
+        return context
+
+    def _capture(self, identity: str) -> dict:
+        """Log in through the UI once and save the resulting storage state"""
+        _check_identity(identity)
+        username, password = IDENTITIES[identity]
+        logger.info(f"Capturing storage state for identity: {identity}")
+
+        context = self.browser.new_context(ignore_https_errors=True)
+        try:
+            page = context.new_page()
+            LoginPage(page).login(username, password)
+            if page.url != URLs.INVENTORY:
+                raise RuntimeError(f"Login as '{identity}' did not reach the inventory page")
+            path = self.state_dir / f"{identity}.json"
+            storage_state = context.storage_state(path=str(path))
+            session_storage = page.evaluate("() => Object.assign({}, window.sessionStorage)")
+            origin = page.evaluate("() => window.location.origin")
+        finally:
+            context.close()
+
+        return {
+            "path": str(path),
+            "storage_state": storage_state,
+            "session_storage": session_storage,
+            "origin": origin
+        }
+
+
+class AsyncAuthStateCache:
+    """AuthStateCache for an async browser; captures through AsyncLoginPage"""
+
+    def __init__(self, browser: AsyncBrowser, state_dir: Path):
+        self.browser = browser
+        self.state_dir = state_dir
+        self._states = {}
+        self._locks = {}
+
+    async def get(self, identity: str) -> dict:
+        """Get the cached state for an identity, logging in once even under concurrent calls"""
+        lock = self._locks.setdefault(identity, asyncio.Lock())
+        async with lock:
+            if identity not in self._states:
+                self._states[identity] = await self._capture(identity)
+        return self._states[identity]
+
+    async def new_context(self, identity: str, **options) -> AsyncBrowserContext:
+        """Create a browser context that starts logged in as the given identity"""
+        state = await self.get(identity)
+        context = await self.browser.new_context(storage_state=state["path"], **options)
+        script = session_storage_script(state)
+        if script:
+            await context.add_init_script(script)
+        return context
+
+    async def _capture(self, identity: str) -> dict:
+        """Log in through the UI once and save the resulting storage state"""
+        _check_identity(identity)
+        username, password = IDENTITIES[identity]
+        logger.info(f"Capturing storage state for identity: {identity}")
+
+        context = await self.browser.new_context(ignore_https_errors=True)
+        try:
+            page = await context.new_page()
+            await AsyncLoginPage(page).login(username, password)
+            if page.url != URLs.INVENTORY:
+                raise RuntimeError(f"Login as '{identity}' did not reach the inventory page")
+            path = self.state_dir / f"{identity}.json"
+            storage_state = await context.storage_state(path=str(path))
+            session_storage = await page.evaluate("() => Object.assign({}, window.sessionStorage)")
+            origin = await page.evaluate("() => window.location.origin")
+        finally:
+            await context.close()
+
+        return {
+            "path": str(path),
+            "storage_state": storage_state,
+            "session_storage": session_storage,
+            "origin": origin
+        }
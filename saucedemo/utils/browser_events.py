@@ -0,0 +1,86 @@
+import time
+from collections import deque
+from typing import NamedTuple
+
+import allure
+from playwright.sync_api import ConsoleMessage, Error, Page, Request
+from saucedemo.config.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class BrowserEvent(NamedTuple):
+    """One console message, uncaught page error or failed request"""
+    timestamp: float
+    kind: str
+    level: str
+    text: str
+
+
+class BrowserEventBuffer:
+    """Bounded in-memory ring buffer of browser events for a single test
+
+    Listeners only append to the buffer; nothing is logged or attached until
+    flush() is called, which the fixtures do when a test fails.
+    """
+
+    def __init__(self, max_events: int = 200, max_chars: int = 2000):
+        self.max_chars = max_chars
+        self.events = deque(maxlen=max_events)
+        self.total = 0
+        self._pages = []
+
+    def attach(self, page: Page):
+        """Start buffering events from the page"""
+        page.on("console", self._on_console)
+        page.on("pageerror", self._on_page_error)
+        page.on("requestfailed", self._on_request_failed)
+        self._pages.append(page)
+
+    def detach(self):
+        """Stop listening, e.g. before a pooled page is handed to the next test"""
+        for page in self._pages:
+            page.remove_listener("console", self._on_console)
+            page.remove_listener("pageerror", self._on_page_error)
+            page.remove_listener("requestfailed", self._on_request_failed)
+        self._pages.clear()
+
+    def _append(self, kind: str, level: str, text: str):
+        if len(text) > self.max_chars:
+            text = f"{text[:self.max_chars]}... [{len(text) - self.max_chars} chars truncated]"
+        self.events.append(BrowserEvent(time.time(), kind, level, text))
+        self.total += 1
+
+    def _on_console(self, message: ConsoleMessage):
+        self._append("console", message.type, message.text)
+
+    def _on_page_error(self, error: Error):
+        self._append("pageerror", "error", f"{error.name}: {error.message}")
+
+    def _on_request_failed(self, request: Request):
+        self._append("requestfailed", "error", f"{request.method} {request.url}: {request.failure}")
+
+    @property
+    def dropped(self) -> int:
+        """Events that were pushed out of the ring buffer"""
+        return self.total - len(self.events)
+
+    def format(self) -> str:
+        lines = [
+            f"{time.strftime('%H:%M:%S', time.localtime(event.timestamp))} "
+            f"[{event.kind}:{event.level}] {event.text}"
+            for event in self.events
+        ]
+        if self.dropped:
+            lines.insert(0, f"... {self.dropped} earlier events dropped")
+        return "\n".join(lines)
+
+    def flush(self, reason: str = "requested"):
+        """Write the buffered events to the log and attach them to the Allure report"""
+        if not self.events:
+            return
+        text = self.format()
+        logger.info(f"Browser events ({reason}):\n{text}")
+        allure.attach(text, name="browser events", attachment_type=allure.attachment_type.TEXT)
+        self.events.clear()
+        self.total = 0
@@ -0,0 +1,120 @@
+"""Running the suite against several browser engines in one session
+
+With --browser-type=chromium,firefox (or "all") every browser test is
+parametrised by engine. Parametrised session fixtures are set up again each
+time pytest moves to another engine, which under xdist's interleaved order
+would relaunch browsers all the time; EngineCache keeps each engine's
+browser and per-browser resources alive for the whole worker session instead
+(until sync Playwright is stopped, see saucedemo.utils.sync_session), so every
+engine is launched at most once per worker and engines run side by side on
+different workers.
+"""
+import argparse
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Optional
+from urllib.parse import urlparse
+
+from saucedemo.config.constants import URLs
+
+ENGINES = ("chromium", "firefox", "webkit")
+
+# Set while the load harness runs, whose latencies under many concurrent users
+# must not mix with functional runs' history
+_under_load: ContextVar[bool] = ContextVar("under_load", default=False)
+
+
+def parse_engines(value: str) -> list[str]:
+    """Parse "chromium", "chromium,webkit" or "all" into a list of engines"""
+    if value.strip() == "all":
+        return list(ENGINES)
+    engines = []
+    for engine in (part.strip() for part in value.split(",")):
+        if engine not in ENGINES:
+            raise argparse.ArgumentTypeError(
+                f"Unknown browser '{engine}', expected {', '.join(ENGINES)} or all"
+            )
+        if engine not in engines:
+            engines.append(engine)
+    return engines
+
+
+def selected_engines(config) -> list[str]:
+    """Engines given with --browser-type
+
+    The option's default only goes through parse_engines when the tests
+    conftest is loaded before argument parsing, so a raw string is parsed here.
+    """
+    value = config.getoption("--browser-type", None)
+    if value is None:
+        return [ENGINES[0]]
+    return parse_engines(value) if isinstance(value, str) else value
+
+
+def primary_engine(config) -> str:
+    """First engine given with --browser-type, for code that drives a single browser"""
+    return selected_engines(config)[0]
+
+
+def item_engine(item) -> Optional[str]:
+    """Engine a matrix-parametrised test runs on, or None outside matrix mode"""
+    callspec = getattr(item, "callspec", None)
+    return callspec.params.get("browser_type") if callspec else None
+
+
+def page_engine(page) -> str:
+    """Engine behind a playwright.sync_api or playwright.async_api page"""
+    browser = page.context.browser
+    return browser.browser_type.name if browser else ENGINES[0]
+
+
+def run_target(engine: str) -> str:
+    """Target host and engine, e.g. "www.saucedemo.com/firefox", which partition timing history
+
+    A local replica answers in a fraction of the public site's time, and each
+    engine has its own speed, so their samples must not be compared or mixed.
+    Inside under_load() the target gets a "/load" suffix for the same reason.
+    """
+    host = urlparse(URLs.BASE_URL).hostname or URLs.BASE_URL
+    target = f"{host}/{engine}"
+    return f"{target}/load" if _under_load.get() else target
+
+
+@contextmanager
+def under_load():
+    """Make run_target() name a separate load target in this thread or asyncio task
+
+    Latency histories (adaptive timeouts, performance budgets, the web vitals
+    baseline) then keep load runs apart from functional runs.
+    """
+    token = _under_load.set(True)
+    try:
+        yield
+    finally:
+        _under_load.reset(token)
+
+
+class EngineCache:
+    """Per-worker objects keyed by engine, created on first use and closed with sync Playwright"""
+
+    def __init__(self):
+        self._objects = {}
+        self._closers = []
+
+    def get(self, engine: str, name: str, factory: Callable, close: Callable = None):
+        """The engine's object called name, created with factory() the first time"""
+        key = (engine, name)
+        if key not in self._objects:
+            obj = factory()
+            self._objects[key] = obj
+            if close is not None:
+                self._closers.append((key, lambda: close(obj)))
+        return self._objects[key]
+
+    def close(self):
+        """Close everything in reverse creation order, so pools go before their browsers"""
+        while self._closers:
+            key, closer = self._closers.pop()
+            del self._objects[key]
+            closer()
+        self._objects.clear()
@@ -0,0 +1,273 @@
+"""Long-lived Playwright browser servers shared across pytest runs
+
+A server is a small daemon that runs ``playwright launch-server`` for one
+browser type and set of launch arguments and records its websocket endpoint
+in BROWSER_SERVER_DIR/<key>.json. The browser fixtures look for a record
+matching their own launch arguments, health-check it, and connect instead of
+launching; without a healthy server they launch locally as before.
+
+While connected, a run holds a lease file so the daemon knows it is in use.
+The daemon exits (taking the browser with it) once it has had no lease for
+its idle timeout, or when its browser process dies.
+
+    python -m saucedemo.utils.browser_server start --browser-type chromium
+    python -m saucedemo.utils.browser_server status
+    python -m saucedemo.utils.browser_server stop
+"""
+import argparse
+import hashlib
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+from playwright.sync_api import Browser, BrowserType
+from saucedemo.config.logger import get_logger
+from saucedemo.config.settings import get_settings
+
+logger = get_logger(__name__)
+
+settings = get_settings()
+
+# Seconds between the daemon's idle and health checks
+POLL_INTERVAL = 2.0
+# Milliseconds a client waits for a recorded server before launching locally
+CONNECT_TIMEOUT = 5000
+# Seconds `start` waits for a new daemon to record its endpoint
+START_TIMEOUT = 60.0
+
+
+def state_dir() -> Path:
+    return Path(settings.BROWSER_SERVER_DIR)
+
+
+def server_key(browser_type: str, launch_args: dict) -> str:
+    """Stable key for a browser type and its launch arguments"""
+    canonical = json.dumps({"browser_type": browser_type, **launch_args}, sort_keys=True)
+    return f"{browser_type}-{hashlib.sha1(canonical.encode()).hexdigest()[:12]}"
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def read_record(key: str) -> Optional[dict]:
+    """The recorded server for a key, or None when there is none or its daemon is gone"""
+    path = state_dir() / f"{key}.json"
+    try:
+        with open(path) as f:
+            record = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not _pid_alive(record["pid"]):
+        logger.info(f"Removing stale browser server record {path.name}")
+        path.unlink(missing_ok=True)
+        return None
+    return record
+
+
+def list_records() -> list[dict]:
+    records = []
+    for path in sorted(state_dir().glob("*.json")):
+        record = read_record(path.stem)
+        if record:
+            records.append(record)
+    return records
+
+
+class Lease:
+    """Marks a browser server as in use by this process until released"""
+
+    def __init__(self, key: str):
+        self.path = state_dir() / f"{key}.lease.{os.getpid()}"
+        self.path.touch()
+
+    def release(self):
+        self.path.unlink(missing_ok=True)
+
+
+def _leases_alive(key: str) -> bool:
+    """Whether any process holding a lease on the server is still running"""
+    alive = False
+    for path in state_dir().glob(f"{key}.lease.*"):
+        pid = int(path.name.rsplit(".", 1)[1])
+        if _pid_alive(pid):
+            alive = True
+        else:
+            path.unlink(missing_ok=True)
+    return alive
+
+
+def connect_or_launch(browser_type: BrowserType, launch_args: dict,
+                      mode: str = "auto") -> tuple[Browser, Optional[Lease]]:
+    """Connect to a healthy browser server for these launch arguments, else launch locally
+
+    mode is "off" (always launch), "auto" (connect when a server is running)
+    or "start" (start a server first when none is running). The returned
+    lease, if any, must be released after the browser is closed.
+    """
+    if mode != "off":
+        key = server_key(browser_type.name, launch_args)
+        record = read_record(key)
+        if record is None and mode == "start":
+            record = start_server(browser_type.name, launch_args)
+        if record is not None:
+            lease = Lease(key)
+            try:
+                browser = browser_type.connect(record["ws_endpoint"], timeout=CONNECT_TIMEOUT)
+                logger.info(f"Connected to browser server {key} at {record['ws_endpoint']}")
+                return browser, lease
+            except Exception as e:
+                lease.release()
+                logger.warning(f"Browser server {key} failed its health check, launching locally: {e}")
+    return browser_type.launch(**launch_args), None
+
+
+def start_server(browser_type: str, launch_args: dict, idle_timeout: float = None) -> Optional[dict]:
+    """Start a detached server daemon and wait for it to record its endpoint"""
+    key = server_key(browser_type, launch_args)
+    record = read_record(key)
+    if record is not None:
+        return record
+    state_dir().mkdir(parents=True, exist_ok=True)
+    idle_timeout = settings.BROWSER_SERVER_IDLE_TIMEOUT if idle_timeout is None else idle_timeout
+    log_path = state_dir() / f"{key}.log"
+    with open(log_path, "a") as log:
+        process = subprocess.Popen(
+            [sys.executable, "-m", "saucedemo.utils.browser_server", "serve",
+             "--browser-type", browser_type, "--launch-args", json.dumps(launch_args),
+             "--idle-timeout", str(idle_timeout)],
+            stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT,
+            start_new_session=True
+        )
+    deadline = time.monotonic() + START_TIMEOUT
+    while time.monotonic() < deadline:
+        record = read_record(key)
+        if record is not None:
+            logger.info(f"Started browser server {key} at {record['ws_endpoint']}")
+            return record
+        if process.poll() is not None:
+            break
+        time.sleep(0.2)
+    logger.warning(f"Browser server {key} did not start, see {log_path}")
+    return None
+
+
+def stop_server(record: dict):
+    """Ask a server daemon to shut down its browser and exit"""
+    try:
+        os.kill(record["pid"], signal.SIGTERM)
+    except ProcessLookupError:
+        pass
+
+
+def serve(browser_type: str, launch_args: dict, idle_timeout: float):
+    """Daemon body: run launch-server, record the endpoint, exit when idle or unhealthy"""
+    key = server_key(browser_type, launch_args)
+    directory = state_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    record_path = directory / f"{key}.json"
+    config_path = directory / f"{key}.config"
+    with open(config_path, "w") as f:
+        json.dump(launch_args, f)
+
+    # SIGTERM from `stop` unwinds through the finally block below
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    server = subprocess.Popen(
+        [sys.executable, "-m", "playwright", "launch-server",
+         "--browser", browser_type, "--config", str(config_path)],
+        stdout=subprocess.PIPE, text=True, start_new_session=True
+    )
+    try:
+        ws_endpoint = server.stdout.readline().strip()
+        if not ws_endpoint.startswith("ws"):
+            print(f"launch-server exited without an endpoint: {ws_endpoint!r}", flush=True)
+            return
+        with open(record_path, "w") as f:
+            json.dump({
+                "key": key,
+                "pid": os.getpid(),
+                "ws_endpoint": ws_endpoint,
+                "browser_type": browser_type,
+                "launch_args": launch_args,
+                "idle_timeout": idle_timeout,
+                "started": time.time(),
+            }, f, indent=2)
+        print(f"Serving {browser_type} at {ws_endpoint}", flush=True)
+
+        last_active = time.monotonic()
+        while True:
+            time.sleep(POLL_INTERVAL)
+            if server.poll() is not None:
+                print(f"Browser server exited with code {server.returncode}", flush=True)
+                return
+            if _leases_alive(key):
+                last_active = time.monotonic()
+            elif time.monotonic() - last_active > idle_timeout:
+                print(f"Idle for {idle_timeout}s, shutting down", flush=True)
+                return
+    finally:
+        record_path.unlink(missing_ok=True)
+        config_path.unlink(missing_ok=True)
+        if server.poll() is None:
+            # Also takes down the browser processes launch-server started
+            os.killpg(server.pid, signal.SIGTERM)
+            server.wait()
+
+
+def default_launch_args() -> dict:
+    """Launch arguments of the browser_type_launch_args fixture, so `start` matches the fixtures"""
+    return {
+        "headless": os.getenv('HEADLESS', 'true').lower() == 'true',
+        "args": ['--disable-gpu', '--no-sandbox', '--disable-dev-shm-usage'],
+        "timeout": int(os.getenv('PLAYWRIGHT_TIMEOUT', '30000'))
+    }
+
+
+def main(argv: list[str] = None):
+    parser = argparse.ArgumentParser(description="Manage long-lived Playwright browser servers")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    start = commands.add_parser("start", help="Start a server for the test fixtures' launch arguments")
+    start.add_argument("--browser-type", default="chromium", choices=["chromium", "firefox", "webkit"])
+    start.add_argument("--launch-args", default=None,
+                       help="JSON launch arguments (default: those of browser_type_launch_args)")
+    start.add_argument("--idle-timeout", type=float, default=settings.BROWSER_SERVER_IDLE_TIMEOUT)
+    commands.add_parser("status", help="List running servers")
+    commands.add_parser("stop", help="Stop all running servers")
+    serve_command = commands.add_parser("serve", help=argparse.SUPPRESS)
+    serve_command.add_argument("--browser-type", required=True)
+    serve_command.add_argument("--launch-args", required=True)
+    serve_command.add_argument("--idle-timeout", type=float, required=True)
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        serve(args.browser_type, json.loads(args.launch_args), args.idle_timeout)
+    elif args.command == "start":
+        launch_args = json.loads(args.launch_args) if args.launch_args else default_launch_args()
+        record = start_server(args.browser_type, launch_args, args.idle_timeout)
+        if record is None:
+            return 1
+        print(f"{record['key']}: {record['ws_endpoint']} (idle timeout {record['idle_timeout']}s)")
+    elif args.command == "status":
+        for record in list_records():
+            print(f"{record['key']}: {record['ws_endpoint']} pid {record['pid']} {record['launch_args']}")
+    elif args.command == "stop":
+        for record in list_records():
+            stop_server(record)
+            print(f"Stopped {record['key']}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,118 @@
+from typing import Optional
+
+from playwright.sync_api import Browser, BrowserContext, Page
+from saucedemo.config.constants import CONTEXT_OPTIONS
+from saucedemo.config.logger import get_logger
+from saucedemo.utils.app_storage import blank_app_url, fulfill_blank
+from saucedemo.utils.asset_cache import install_asset_cache
+from saucedemo.utils.auth_state import AuthStateCache
+from saucedemo.utils.dom_watcher import install_dom_watcher
+from saucedemo.utils.recordings import get_trace_recorder
+from saucedemo.utils.web_vitals import install_observer
+
+logger = get_logger(__name__)
+
+
+class PooledContext:
+    """A browser context and its page, leased to one test at a time"""
+
+    def __init__(self, context: BrowserContext, page: Page, identity: Optional[str]):
+        self.context = context
+        self.page = page
+        self.identity = identity
+        self.uses = 0
+
+
+class ContextPool:
+    """Reuses browser contexts across tests, resetting their state in between
+
+    Cookies, permissions, routes and app-origin localStorage/sessionStorage are
+    reset on release. Contexts are recycled after max_uses leases or when the
+    test that used them failed, since init scripts and other per-context state
+    cannot be undone.
+    """
+
+    def __init__(self, browser: Browser, auth_state_cache: AuthStateCache,
+                 max_uses: int = 50, context_options: dict = None):
+        self.browser = browser
+        self.auth_state_cache = auth_state_cache
+        self.max_uses = max_uses
+        self.context_options = context_options or CONTEXT_OPTIONS
+        self._idle = {}
+
+    def prewarm(self, identity: Optional[str], count: int = 1):
+        """Create idle contexts ahead of the first test that needs them"""
+        idle = self._idle.setdefault(identity, [])
+        while len(idle) < count:
+            idle.append(self._create(identity))
+
+    def acquire(self, identity: Optional[str]) -> PooledContext:
+        """Lease a clean context for the identity, creating one if none is idle"""
+        idle = self._idle.setdefault(identity, [])
+        pooled = idle.pop() if idle else self._create(identity)
+        pooled.uses += 1
+        return pooled
+
+    def release(self, pooled: PooledContext, failed: bool = False):
+        """Return a leased context, resetting it for reuse or closing it"""
+        if failed or pooled.uses >= self.max_uses:
+            reason = "test failure" if failed else f"{pooled.uses} uses"
+            logger.info(f"Recycling pooled context after {reason}")
+            pooled.context.close()
+            return
+        try:
+            self._reset(pooled)
+        except Exception as e:
+            logger.warning(f"Failed to reset pooled context, closing it: {str(e)}")
+            pooled.context.close()
+            return
+        self._idle[pooled.identity].append(pooled)
+
+    def close(self):
+        """Close every idle context"""
+        for idle in self._idle.values():
+            for pooled in idle:
+                pooled.context.close()
+        self._idle.clear()
+
+    def _create(self, identity: Optional[str]) -> PooledContext:
+        if identity:
+            context = self.auth_state_cache.new_context(identity, **self.context_options)
+        else:
+            context = self.browser.new_context(**self.context_options)
+        install_observer(context)
+        install_dom_watcher(context)
+        install_asset_cache(context)
+        context.route(blank_app_url(), fulfill_blank)
+        # Traced for its whole life; each lease records its own chunk
+        get_trace_recorder().start(context)
+        return PooledContext(context, context.new_page(), identity)
+
+    def _reset(self, pooled: PooledContext):
+        context = pooled.context
+        for page in context.pages:
+            if page is not pooled.page:
+                page.close()
+        if pooled.page.is_closed():
+            pooled.page = context.new_page()
+
+        context.unroute_all(behavior="ignoreErrors")
+        install_asset_cache(context)
+        context.route(blank_app_url(), fulfill_blank)
+        context.clear_cookies()
+        context.clear_permissions()
+
+        page = pooled.page
+        page.goto(blank_app_url())
+        page.evaluate("() => { window.localStorage.clear(); window.sessionStorage.clear(); }")
+        if pooled.identity:
+            state = self.auth_state_cache.get(pooled.identity)["storage_state"]
+            context.add_cookies(state["cookies"])
+            app_origin = page.evaluate("() => window.location.origin")
+            for origin in state["origins"]:
+                if origin["origin"] == app_origin:
+                    page.evaluate(
+                        "entries => entries.forEach(e => window.localStorage.setItem(e.name, e.value))",
+                        origin["localStorage"]
+                    )
+        page.goto("about:blank")
@@ -0,0 +1,254 @@
+"""Event-driven waits on DOM state, pushed by a MutationObserver
+
+WATCHER_SCRIPT keeps a set of named watches, each the trimmed text of the
+first element matching a selector (null while there is none). A single
+MutationObserver re-reads the watches after every batch of DOM mutations,
+resolves waiters whose state has been reached, and reports each change to
+Python through the DOM_CHANGE_BINDING binding. Waits therefore settle on the
+mutation that causes them instead of on a polling interval.
+
+install_dom_watcher() adds the script and binding to a context so changes
+are streamed from the first page load; waits also install the script on
+demand, so page objects work on contexts set up without it.
+"""
+import json
+import threading
+import time
+from collections import defaultdict
+from typing import NamedTuple, Optional
+
+import allure
+from playwright.sync_api import TimeoutError
+from saucedemo.config.logger import get_logger
+from saucedemo.utils.xdist import current_test_id
+
+logger = get_logger(__name__)
+
+DOM_CHANGE_BINDING = "__saucedemoDomChange"
+
+# Watched on every page from the start
+DEFAULT_WATCHES = {
+    "cart_badge": ".shopping_cart_badge",
+    "error": "[data-test='error']",
+}
+
+WATCHER_SCRIPT = """
+(watches => {
+    if (window.top !== window || window.__saucedemoDom) {
+        return;
+    }
+    const find = selector => selector.startsWith('//')
+        ? document.evaluate(selector, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+        : document.querySelector(selector);
+    const read = selector => {
+        const element = find(selector);
+        return element ? element.textContent.trim() : null;
+    };
+    const dom = window.__saucedemoDom = {
+        watches: {},
+        waiters: [],
+        watch(name, selector) {
+            if (!this.watches[name] || this.watches[name].selector !== selector) {
+                this.watches[name] = { selector, value: read(selector), version: 0 };
+            }
+            return this.watches[name];
+        },
+        check() {
+            for (const [name, watch] of Object.entries(this.watches)) {
+                const value = read(watch.selector);
+                if (value !== watch.value) {
+                    watch.value = value;
+                    watch.version += 1;
+                    if (window.%(binding)s) {
+                        // Rejects when the context is closing; nothing to report then
+                        window.%(binding)s(name, value, watch.version).catch(() => {});
+                    }
+                }
+            }
+            this.waiters = this.waiters.filter(settle => !settle());
+        },
+        waitFor({ name, selector, mode, value, since, timeout }) {
+            const watch = this.watch(name, selector);
+            const reached = () => mode === 'equals' ? watch.value === value : watch.version > since;
+            return new Promise(resolve => {
+                const timer = setTimeout(() => {
+                    this.waiters = this.waiters.filter(settle => settle !== waiter);
+                    resolve({ reached: false, value: watch.value, version: watch.version });
+                }, timeout);
+                const waiter = () => {
+                    if (!reached()) {
+                        return false;
+                    }
+                    clearTimeout(timer);
+                    resolve({ reached: true, value: watch.value, version: watch.version });
+                    return true;
+                };
+                if (!waiter()) {
+                    this.waiters.push(waiter);
+                }
+            });
+        },
+    };
+    Object.entries(watches).forEach(([name, selector]) => dom.watch(name, selector));
+    new MutationObserver(() => dom.check()).observe(document, {
+        subtree: true, childList: true, characterData: true, attributes: true,
+    });
+})
+""" % {"binding": DOM_CHANGE_BINDING}
+
+# Added to every page of a context by install_dom_watcher()
+INIT_SCRIPT = f"{WATCHER_SCRIPT.strip()}({json.dumps(DEFAULT_WATCHES)});"
+
+# Evaluated by the waits; installs the watcher first on pages that lack it
+WAIT_SCRIPT = f"""args => {{
+    if (!window.__saucedemoDom) {{
+        {WATCHER_SCRIPT.strip()}({json.dumps(DEFAULT_WATCHES)});
+    }}
+    return window.__saucedemoDom.waitFor(args);
+}}"""
+
+VERSION_SCRIPT = f"""([name, selector]) => {{
+    if (!window.__saucedemoDom) {{
+        {WATCHER_SCRIPT.strip()}({json.dumps(DEFAULT_WATCHES)});
+    }}
+    return window.__saucedemoDom.watch(name, selector).version;
+}}"""
+
+
+class DomChange(NamedTuple):
+    """One change of a watched element's text, as pushed by the page"""
+    timestamp: float
+    test_id: str
+    url: str
+    watch: str
+    value: Optional[str]
+    version: int
+
+
+class DomChangeLog:
+    """In-process store of the DOM changes streamed from watched pages"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._changes = []
+        self._by_test = defaultdict(list)
+
+    def record(self, change: DomChange):
+        with self._lock:
+            self._changes.append(change)
+            self._by_test[change.test_id].append(change)
+
+    def changes(self, test_id: str = None) -> list[DomChange]:
+        """All changes, or only those streamed during the given test"""
+        with self._lock:
+            if test_id is None:
+                return list(self._changes)
+            return list(self._by_test.get(test_id, ()))
+
+    def clear(self):
+        with self._lock:
+            self._changes.clear()
+            self._by_test.clear()
+
+
+# Shared by every watched context in this process
+dom_changes = DomChangeLog()
+
+
+def _on_change(source: dict, watch: str, value: Optional[str], version: int):
+    page = source.get("page")
+    url = page.url if page else ""
+    dom_changes.record(DomChange(time.time(), current_test_id(), url, watch, value, version))
+    logger.debug(f"DOM change {watch} -> {value!r} on {url}")
+
+
+def flush_changes(test_id: str, reason: str = "requested"):
+    """Write a test's streamed DOM changes to the log and attach them to the Allure report"""
+    changes = dom_changes.changes(test_id)
+    if not changes:
+        return
+    text = "\n".join(
+        f"{time.strftime('%H:%M:%S', time.localtime(change.timestamp))} "
+        f"{change.watch} -> {change.value!r} (#{change.version}) {change.url}"
+        for change in changes
+    )
+    logger.info(f"DOM changes ({reason}):\n{text}")
+    allure.attach(text, name="dom changes", attachment_type=allure.attachment_type.TEXT)
+
+
+def install_dom_watcher(context):
+    """Watch every page the context opens and stream the changes to dom_changes"""
+    context.add_init_script(INIT_SCRIPT)
+    context.expose_binding(DOM_CHANGE_BINDING, _on_change)
+
+
+async def install_dom_watcher_async(context):
+    """install_dom_watcher() for a playwright.async_api BrowserContext"""
+    await context.add_init_script(INIT_SCRIPT)
+    await context.expose_binding(DOM_CHANGE_BINDING, _on_change)
+
+
+def _wait_args(watch: str, selector: str, timeout: int, value: Optional[str] = None,
+               since: int = None) -> dict:
+    return {
+        "name": watch,
+        "selector": selector,
+        "mode": "change" if since is not None else "equals",
+        "value": value,
+        "since": since,
+        "timeout": timeout,
+    }
+
+
+def _settle(result: dict, args: dict) -> Optional[str]:
+    """The watched value once reached, or TimeoutError with the value it was left at"""
+    if not result["reached"]:
+        wanted = f"a change after version {args['since']}" if args["mode"] == "change" else repr(args["value"])
+        raise TimeoutError(
+            f"Timeout {args['timeout']}ms exceeded waiting for {args['name']} to become {wanted}, "
+            f"last value {result['value']!r}"
+        )
+    return result["value"]
+
+
+class DomWatcher:
+    """Waits for exact state transitions of watched elements on a page
+
+    A watch is a name plus a selector (CSS, or XPath starting with //); its
+    state is the element's trimmed text, or None while no element matches.
+    """
+
+    def __init__(self, page):
+        self.page = page
+
+    def version(self, watch: str, selector: str) -> int:
+        """How many times the watch has changed, to wait for the next change with wait_for_change"""
+        return self.page.evaluate(VERSION_SCRIPT, [watch, selector])
+
+    def wait_for(self, watch: str, selector: str, value: Optional[str], timeout: int) -> Optional[str]:
+        """Wait until the watched text equals value (None: no matching element)"""
+        args = _wait_args(watch, selector, timeout, value=value)
+        return _settle(self.page.evaluate(WAIT_SCRIPT, args), args)
+
+    def wait_for_change(self, watch: str, selector: str, since: int, timeout: int) -> Optional[str]:
+        """Wait until the watch has changed after the given version, and return its new text"""
+        args = _wait_args(watch, selector, timeout, since=since)
+        return _settle(self.page.evaluate(WAIT_SCRIPT, args), args)
+
+
+class AsyncDomWatcher:
+    """DomWatcher for a playwright.async_api Page"""
+
+    def __init__(self, page):
+        self.page = page
+
+    async def version(self, watch: str, selector: str) -> int:
+        return await self.page.evaluate(VERSION_SCRIPT, [watch, selector])
+
+    async def wait_for(self, watch: str, selector: str, value: Optional[str], timeout: int) -> Optional[str]:
+        args = _wait_args(watch, selector, timeout, value=value)
+        return _settle(await self.page.evaluate(WAIT_SCRIPT, args), args)
+
+    async def wait_for_change(self, watch: str, selector: str, since: int, timeout: int) -> Optional[str]:
+        args = _wait_args(watch, selector, timeout, since=since)
+        return _settle(await self.page.evaluate(WAIT_SCRIPT, args), args)
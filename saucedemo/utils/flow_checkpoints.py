@@ -0,0 +1,161 @@
+"""Checkpoints of multi-step flow prefixes, recorded once per worker
+
+A flow is a named prefix many tests share, e.g. add the backpack, open the
+cart and proceed to checkout. The first test that reaches a flow on a worker
+runs it through the page objects and records the browser state it ended in:
+cookies, app-origin localStorage and sessionStorage, and the URL. Later tests
+restore that state into their own context and open the URL directly.
+
+A checkpoint is tied to a fingerprint of the flow's source and the sync page
+object modules. If either changes, the checkpoint is recorded again instead
+of being restored, so it never replays state built by code that no longer
+exists. A checkpoint that does not land on its URL when restored (e.g. the
+app redirected to login) is dropped; the context's previous state is put
+back and the flow is built and recorded again in the same test.
+"""
+import hashlib
+import inspect
+from pathlib import Path
+from typing import Callable, NamedTuple, Optional
+from urllib.parse import urlsplit
+
+from playwright.sync_api import BrowserContext, Page
+from saucedemo.config.constants import Products, URLs
+from saucedemo.config.logger import get_logger
+from saucedemo.pages.cart_page import CartPage
+from saucedemo.pages.inventory_page import InventoryPage
+from saucedemo.utils.app_storage import write_app_storage
+
+logger = get_logger(__name__)
+
+# The sync page objects and their selectors; the aio pages do not build flows
+PAGES_DIR = Path(inspect.getfile(CartPage)).parent
+
+
+class Flow(NamedTuple):
+    """A named flow prefix; build drives a page from the logged-in start to where the flow ends"""
+    name: str
+    build: Callable[[Page], None]
+
+
+class Checkpoint(NamedTuple):
+    """Browser state at the end of a flow"""
+    flow: str
+    url: str
+    cookies: list[dict]
+    local_storage: dict[str, str]
+    session_storage: dict[str, str]
+    fingerprint: str
+
+
+def _checkout_step_one(page: Page):
+    inventory_page = InventoryPage(page)
+    inventory_page.navigate()
+    inventory_page.add_to_cart(Products.BACKPACK)
+    inventory_page.open_cart()
+    CartPage(page).proceed_to_checkout()
+
+
+CHECKOUT_STEP_ONE = Flow("checkout_step_one", _checkout_step_one)
+
+FLOWS = {flow.name: flow for flow in (CHECKOUT_STEP_ONE,)}
+
+_pages_digest = {}
+
+
+def pages_fingerprint() -> str:
+    """Digest of the page object modules, recomputed only when one of them is modified"""
+    paths = sorted(PAGES_DIR.glob("*.py"))
+    key = tuple((path.name, path.stat().st_mtime_ns) for path in paths)
+    if key not in _pages_digest:
+        digest = hashlib.sha1()
+        for path in paths:
+            digest.update(path.name.encode())
+            digest.update(path.read_bytes())
+        _pages_digest.clear()
+        _pages_digest[key] = digest.hexdigest()
+    return _pages_digest[key]
+
+
+def flow_fingerprint(flow: Flow) -> str:
+    """Digest of the code that builds a flow: its own source and the page objects"""
+    digest = hashlib.sha1(inspect.getsource(flow.build).encode())
+    digest.update(pages_fingerprint().encode())
+    return digest.hexdigest()[:12]
+
+
+def _app_origin() -> str:
+    parts = urlsplit(URLs.BASE_URL)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _app_local_storage(state: dict) -> dict[str, str]:
+    """App-origin localStorage entries of a storage_state()"""
+    origin = _app_origin()
+    return next(
+        ({item["name"]: item["value"] for item in entry["localStorage"]}
+         for entry in state["origins"] if entry["origin"] == origin),
+        {}
+    )
+
+
+class CheckpointStore:
+    """Flow checkpoints of one worker, per flow and identity"""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._checkpoints = {}
+
+    def reach(self, page: Page, flow: Flow, identity: Optional[str] = None) -> Page:
+        """Bring the page to the end of a flow, from its checkpoint when there is a valid one"""
+        if not self.enabled:
+            flow.build(page)
+            return page
+
+        key = (flow.name, identity)
+        fingerprint = flow_fingerprint(flow)
+        checkpoint = self._checkpoints.get(key)
+        if checkpoint and checkpoint.fingerprint != fingerprint:
+            logger.info(f"Checkpoint '{flow.name}' invalidated: page object code changed")
+            checkpoint = None
+        if checkpoint:
+            before = page.context.storage_state()
+            try:
+                self.restore(page, checkpoint)
+                return page
+            except RuntimeError as e:
+                # A stale checkpoint is a cache miss, not a test failure
+                logger.warning(f"{str(e)}; building the flow again")
+                del self._checkpoints[key]
+                self.revert(page, before)
+
+        flow.build(page)
+        self._checkpoints[key] = self.record(page, flow, fingerprint)
+        return page
+
+    def record(self, page: Page, flow: Flow, fingerprint: str) -> Checkpoint:
+        """Capture the state a flow ended in"""
+        state = page.context.storage_state()
+        local_storage = _app_local_storage(state)
+        session_storage = page.evaluate("() => Object.assign({}, window.sessionStorage)")
+        logger.info(f"Recorded checkpoint '{flow.name}' at {page.url} ({fingerprint})")
+        return Checkpoint(flow.name, page.url, state["cookies"], local_storage, session_storage, fingerprint)
+
+    def revert(self, page: Page, state: dict):
+        """Put back the cookies and app localStorage the context had before a failed restore"""
+        page.context.clear_cookies()
+        page.context.add_cookies(state["cookies"])
+        write_app_storage(page, _app_local_storage(state), clear=True)
+
+    def restore(self, page: Page, checkpoint: Checkpoint):
+        """Load a checkpoint's state into the page's context and open its URL"""
+        context: BrowserContext = page.context
+        context.clear_cookies()
+        context.add_cookies(checkpoint.cookies)
+        write_app_storage(page, checkpoint.local_storage, checkpoint.session_storage, clear=True)
+        page.goto(checkpoint.url)
+        if page.url != checkpoint.url:
+            raise RuntimeError(
+                f"Checkpoint '{checkpoint.flow}' landed on {page.url} instead of {checkpoint.url}"
+            )
+        logger.info(f"Restored checkpoint '{checkpoint.flow}' at {checkpoint.url}")
@@ -0,0 +1,335 @@
+"""Virtual-user load generation on the checkout flow
+
+Each virtual user repeatedly logs in, adds an item, opens the cart and checks
+out in a fresh browser context, using the async page objects so hundreds of
+users share one event loop. Contexts are spread over a few browsers, users
+start evenly across the ramp-up period, and every step is timed so the report
+gives per-step throughput, latency percentiles and error rates.
+
+Run from the command line:
+
+    python -m saucedemo.utils.load_harness --users 20 --duration 60 --ramp-up 10 --local-site
+
+or through pytest with --load-users (see saucedemo.plugins.load_mode).
+"""
+import argparse
+import asyncio
+import json
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from playwright.async_api import Playwright, async_playwright
+from saucedemo.config.constants import CONTEXT_OPTIONS, Credentials, Products, TestData, URLs
+from saucedemo.config.logger import get_logger
+from saucedemo.config.settings import get_settings
+from saucedemo.pages.aio.cart_page import AsyncCartPage
+from saucedemo.pages.aio.checkout_page import AsyncCheckoutPage
+from saucedemo.pages.aio.inventory_page import AsyncInventoryPage
+from saucedemo.pages.aio.login_page import AsyncLoginPage
+from saucedemo.utils.browser_matrix import under_load
+from saucedemo.utils.local_site import LocalSiteServer
+from saucedemo.utils.stats import histogram, latency_summary
+
+logger = get_logger(__name__)
+
+settings = get_settings()
+
+# Steps of test_successful_checkout, in the order a virtual user runs them
+CHECKOUT_STEPS = (
+    "login",
+    "add_to_cart",
+    "open_cart",
+    "proceed_to_checkout",
+    "fill_shipping_details",
+    "continue_checkout",
+    "finish_checkout",
+)
+
+# Longest error message kept per failed step
+MAX_ERROR_CHARS = 200
+
+
+class LoadProfile(NamedTuple):
+    """How many virtual users to run, for how long and on how many browsers"""
+    users: int = 1
+    duration: Optional[float] = None
+    iterations: Optional[int] = None
+    ramp_up: float = 0.0
+    browsers: int = 1
+    think_time: float = 0.0
+    browser_type: str = "chromium"
+    headless: bool = True
+
+
+class StepSample(NamedTuple):
+    """One timed step of one virtual user's iteration"""
+    user: int
+    iteration: int
+    step: str
+    started_s: float
+    duration_ms: float
+    ok: bool
+    error: str
+
+
+class FlowError(Exception):
+    """The app answered a step with an unexpected outcome"""
+
+
+def check_profile(profile: LoadProfile) -> LoadProfile:
+    """Validate a profile; a run without duration or iterations does one iteration per user"""
+    if profile.users < 1 or profile.browsers < 1:
+        raise ValueError("A load run needs at least one user and one browser")
+    if profile.duration is not None and profile.duration <= 0:
+        raise ValueError(f"Load duration must be positive, got {profile.duration}")
+    if profile.iterations is not None and profile.iterations < 1:
+        raise ValueError(f"Load iterations must be at least 1, got {profile.iterations}")
+    if profile.ramp_up < 0 or profile.think_time < 0:
+        raise ValueError("Ramp-up and think time cannot be negative")
+    if profile.duration is None and profile.iterations is None:
+        profile = profile._replace(iterations=1)
+    return profile
+
+
+class LoadRun:
+    """Samples collected while running a load profile"""
+
+    def __init__(self, profile: LoadProfile):
+        self.profile = check_profile(profile)
+        self.samples = []
+        self.iterations = Counter()
+        self.started = None
+        self.finished = None
+
+    def elapsed(self) -> float:
+        """Seconds since the run started"""
+        return time.perf_counter() - self.started
+
+    def keep_going(self, iteration: int) -> bool:
+        """Whether a virtual user should start another iteration"""
+        if self.profile.iterations is not None and iteration >= self.profile.iterations:
+            return False
+        return self.profile.duration is None or self.elapsed() < self.profile.duration
+
+    async def step(self, user: int, iteration: int, name: str, action, expect: str = None):
+        """Run and time one step, recording any exception as a failed sample before re-raising
+        
+        With expect, a step whose action returns a different outcome (e.g. the
+        login form showing an error) fails with FlowError.
+        """
+        started = self.elapsed()
+        start = time.perf_counter()
+        try:
+            result = await action
+            if expect is not None and result != expect:
+                raise FlowError(f"{name} ended in '{result}' instead of '{expect}'")
+        except Exception as e:
+            self.samples.append(StepSample(
+                user, iteration, name, started, (time.perf_counter() - start) * 1000,
+                False, f"{type(e).__name__}: {str(e)[:MAX_ERROR_CHARS]}"
+            ))
+            raise
+        self.samples.append(StepSample(
+            user, iteration, name, started, (time.perf_counter() - start) * 1000, True, ""
+        ))
+        return result
+
+    async def checkout_iteration(self, page, user: int, iteration: int):
+        """The test_successful_checkout flow, starting from the login form"""
+        login_page = AsyncLoginPage(page)
+        inventory_page = AsyncInventoryPage(page)
+        cart_page = AsyncCartPage(page)
+        checkout_page = AsyncCheckoutPage(page)
+
+        await self.step(user, iteration, "login", login_page.login(
+            Credentials.STANDARD_USER, Credentials.STANDARD_PASSWORD
+        ), expect="inventory")
+        await self.step(user, iteration, "add_to_cart", inventory_page.add_to_cart(Products.BACKPACK))
+        await self.step(user, iteration, "open_cart", inventory_page.open_cart())
+        await self.step(user, iteration, "proceed_to_checkout", cart_page.proceed_to_checkout())
+        await self.step(user, iteration, "fill_shipping_details",
+                        checkout_page.fill_shipping_details(**TestData.SHIPPING))
+        await self.step(user, iteration, "continue_checkout", checkout_page.continue_checkout(),
+                        expect="step_two")
+        await self.step(user, iteration, "finish_checkout", checkout_page.finish_checkout())
+
+    async def virtual_user(self, browser, user: int):
+        """Wait for this user's ramp-up slot, then run iterations until the profile is done"""
+        delay = self.profile.ramp_up * user / self.profile.users
+        if delay:
+            await asyncio.sleep(delay)
+        iteration = 0
+        while self.keep_going(iteration):
+            self.iterations["started"] += 1
+            context = await browser.new_context(**CONTEXT_OPTIONS)
+            try:
+                page = await context.new_page()
+                await self.checkout_iteration(page, user, iteration)
+                self.iterations["completed"] += 1
+            except Exception as e:
+                self.iterations["failed"] += 1
+                logger.debug(f"Virtual user {user} iteration {iteration} failed: {e}")
+            finally:
+                await context.close()
+            iteration += 1
+            if self.profile.think_time:
+                await asyncio.sleep(self.profile.think_time)
+
+    async def run(self, playwright: Playwright):
+        """Launch the browsers and run every virtual user to completion"""
+        browser_type = getattr(playwright, self.profile.browser_type)
+        browsers = await asyncio.gather(*(
+            browser_type.launch(headless=self.profile.headless, args=['--disable-gpu'])
+            for _ in range(self.profile.browsers)
+        ))
+        logger.info(
+            f"Starting {self.profile.users} virtual users on {len(browsers)} browser(s) "
+            f"against {URLs.BASE_URL}"
+        )
+        self.started = time.perf_counter()
+        try:
+            # Page-object latencies under load are kept under their own run target
+            with under_load():
+                await asyncio.gather(*(
+                    self.virtual_user(browsers[user % len(browsers)], user)
+                    for user in range(self.profile.users)
+                ))
+        finally:
+            self.finished = self.elapsed()
+            await asyncio.gather(*(browser.close() for browser in browsers))
+        logger.info(
+            f"Load run finished in {self.finished:.1f}s: "
+            f"{self.iterations['completed']}/{self.iterations['started']} iterations completed"
+        )
+
+    def report(self) -> dict:
+        """Per-step throughput, latency percentiles and error rates"""
+        elapsed = self.finished if self.finished is not None else self.elapsed()
+        durations = defaultdict(list)
+        errors = Counter()
+        attempts = Counter()
+        for sample in self.samples:
+            attempts[sample.step] += 1
+            if sample.ok:
+                durations[sample.step].append(sample.duration_ms)
+            else:
+                errors[sample.step] += 1
+
+        steps = []
+        for step in CHECKOUT_STEPS:
+            ok = durations[step]
+            steps.append({
+                "step": step,
+                "attempts": attempts[step],
+                "errors": errors[step],
+                "error_rate": round(errors[step] / attempts[step], 4) if attempts[step] else 0.0,
+                "throughput_per_s": round(len(ok) / elapsed, 3) if elapsed else 0.0,
+                **latency_summary(ok),
+                "histogram": histogram(ok),
+            })
+        started = self.iterations["started"]
+        return {
+            "base_url": URLs.BASE_URL,
+            "profile": self.profile._asdict(),
+            "elapsed_s": round(elapsed, 3),
+            "iterations": {
+                "started": started,
+                "completed": self.iterations["completed"],
+                "failed": self.iterations["failed"],
+                "error_rate": round(self.iterations["failed"] / started, 4) if started else 0.0,
+                "throughput_per_s": round(self.iterations["completed"] / elapsed, 3) if elapsed else 0.0,
+            },
+            "steps": steps,
+            "errors": dict(Counter(
+                f"{sample.step}: {sample.error.split(':', 1)[0]}"
+                for sample in self.samples if not sample.ok
+            ).most_common()),
+        }
+
+
+async def run_load(profile: LoadProfile, playwright: Playwright = None) -> dict:
+    """Run a load profile against URLs.BASE_URL and return its report"""
+    load_run = LoadRun(profile)
+    if playwright is not None:
+        await load_run.run(playwright)
+    else:
+        async with async_playwright() as playwright:
+            await load_run.run(playwright)
+    return load_run.report()
+
+
+def format_report(report: dict) -> str:
+    """Plain-text table of a load report"""
+    iterations = report["iterations"]
+    lines = [
+        f"{report['profile']['users']} users, {report['elapsed_s']}s against {report['base_url']}",
+        f"iterations: {iterations['completed']}/{iterations['started']} completed, "
+        f"{iterations['throughput_per_s']}/s, error rate {iterations['error_rate']:.2%}",
+        f"{'step':<24}{'ok/s':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}",
+    ]
+    for step in report["steps"]:
+        lines.append(
+            f"{step['step']:<24}{step['throughput_per_s']:>8}{step['p50_ms']:>10}"
+            f"{step['p95_ms']:>10}{step['p99_ms']:>10}{step['errors']:>8}"
+        )
+    for error, count in report["errors"].items():
+        lines.append(f"  {count} x {error}")
+    return "\n".join(lines)
+
+
+def write_report(report: dict, path: Path) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+    return path
+
+
+def main(argv: list[str] = None):
+    parser = argparse.ArgumentParser(description="Run virtual users through the checkout flow")
+    parser.add_argument("--users", type=int, default=10, help="Concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=None, help="Run for this many seconds")
+    parser.add_argument("--iterations", type=int, default=None, help="Checkouts per virtual user")
+    parser.add_argument("--ramp-up", type=float, default=0.0, help="Seconds over which users start")
+    parser.add_argument("--browsers", type=int, default=1, help="Browsers the users are spread over")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Pause between iterations")
+    parser.add_argument("--browser-type", default=settings.BROWSER, choices=["chromium", "firefox", "webkit"])
+    parser.add_argument("--headed", action="store_true", help="Show the browsers")
+    parser.add_argument("--base-url", default=None, help="Target instead of BASE_URL")
+    parser.add_argument("--local-site", action="store_true", help="Target the bundled local replica")
+    parser.add_argument(
+        "--output", default=str(Path(settings.RESULTS_DIR) / "load_report.json"), help="JSON report path"
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        profile = check_profile(LoadProfile(
+            users=args.users,
+            duration=args.duration,
+            iterations=args.iterations,
+            ramp_up=args.ramp_up,
+            browsers=args.browsers,
+            think_time=args.think_time,
+            browser_type=args.browser_type,
+            headless=not args.headed
+        ))
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.local_site:
+        with LocalSiteServer() as server:
+            URLs.rebase(server.base_url)
+            report = asyncio.run(run_load(profile))
+    else:
+        if args.base_url:
+            URLs.rebase(args.base_url)
+        report = asyncio.run(run_load(profile))
+
+    print(format_report(report))
+    print(f"Report written to {write_report(report, Path(args.output))}")
+    return 1 if report["iterations"]["failed"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,65 @@
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from saucedemo.config.logger import get_logger
+
+logger = get_logger(__name__)
+
+SITE_DIR = Path(__file__).resolve().parent.parent / "local_site"
+
+
+class LocalSiteRequestHandler(SimpleHTTPRequestHandler):
+    """Static file handler with keep-alive and without per-request stderr logging"""
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+
+class LocalSiteServer:
+    """Local replica of the SauceDemo v1 pages, served from a background thread"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, site_dir: Path = SITE_DIR):
+        self.host = host
+        self.port = port
+        self.site_dir = site_dir
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        """Base URL of the running server, equivalent to Settings.BASE_URL"""
+        return f"http://{self.host}:{self.port}"
+
+    def start(self):
+        """Bind the server (an ephemeral port when port is 0) and start serving"""
+        handler = partial(LocalSiteRequestHandler, directory=str(self.site_dir))
+        self._server = ThreadingHTTPServer((self.host, self.port), handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            name="local-saucedemo",
+            daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Local SauceDemo site serving {self.site_dir} at {self.base_url}")
+
+    def stop(self):
+        """Stop serving and release the port"""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._server = None
+        logger.info("Local SauceDemo site stopped")
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
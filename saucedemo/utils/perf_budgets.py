@@ -0,0 +1,265 @@
+"""Performance budgets for page loads and page-object actions
+
+Budgets live in a JSON file (PERF_BUDGETS) keyed by page name in URLs and by
+"PageObject.method":
+
+    {
+        "percentile": 95,
+        "pages": {
+            "INVENTORY": {"load_ms": 3000, "cls": {"max": 0.1, "percentile": null}}
+        },
+        "actions": {
+            "CheckoutPage.finish_checkout": 2000
+        }
+    }
+
+A plain number is a limit checked at the file's default percentile. With a
+percentile, the check runs over this run's samples plus the most recent ones
+from earlier runs (PERF_BUDGET_HISTORY), so one slow sample does not fail a
+test, and is only enforced once that window holds PERF_BUDGET_MIN_SAMPLES
+samples, as adaptive timeouts are; with "percentile": null every sample must
+be within the limit. Samples are checked and kept per run_target(), the host
+and engine they were measured on, so a fast local replica never pads the
+public site's window.
+
+Actions are keyed like timed_action records them, by the class of the page
+object and the method name, so pass a bound method or the key itself:
+
+    expect_perf(URLs.INVENTORY).to_meet_budget()
+    expect_perf(checkout_page.finish_checkout).to_be_within(2000, percentile=90)
+"""
+import json
+from pathlib import Path
+from typing import Callable, NamedTuple, Optional, Union
+
+from saucedemo.config.constants import URLs
+from saucedemo.config.logger import get_logger
+from saucedemo.config.settings import get_settings
+from saucedemo.utils.action_timings import action_timings
+from saucedemo.utils.stats import percentile as nearest_rank
+from saucedemo.utils.web_vitals import page_key, web_vitals
+from saucedemo.utils.xdist import current_test_id
+
+logger = get_logger(__name__)
+
+settings = get_settings()
+
+# Metric checked when a budget or expectation does not name one
+DEFAULT_PAGE_METRIC = "load_ms"
+ACTION_METRIC = "duration_ms"
+# Samples per budget key kept from earlier runs
+HISTORY_WINDOW = 20
+
+
+class Budget(NamedTuple):
+    """A limit on one metric of a page or page-object action"""
+    subject: str
+    metric: str
+    limit: float
+    percentile: Optional[float]
+
+    @property
+    def key(self) -> str:
+        return f"{self.subject}:{self.metric}"
+
+
+class BudgetResult(NamedTuple):
+    budget: Budget
+    target: str
+    observed: float
+    samples: int
+    passed: bool
+    enforced: bool = True
+
+    def describe(self) -> str:
+        mode = f"p{self.budget.percentile:g}" if self.budget.percentile is not None else "max"
+        within = self.observed <= self.budget.limit
+        return (
+            f"{self.budget.key} on {self.target} {mode} {self.observed:g} "
+            f"{'<=' if within else '>'} {self.budget.limit:g} over {self.samples} samples"
+            f"{'' if self.enforced else ' (too few to enforce)'}"
+        )
+
+
+def subject_of(target: Union[str, Callable]) -> str:
+    """"page:NAME" for a URL or URLs name, "action:Class.method" for a bound page-object method"""
+    if callable(target):
+        page_object = getattr(target, "__self__", None)
+        if page_object is None:
+            raise TypeError(
+                f"Pass {target.__name__} bound to a page object, or its 'PageObject.{target.__name__}' "
+                "key: its timings are recorded under the page object's class"
+            )
+        return f"action:{type(page_object).__name__}.{target.__name__}"
+    if target in URLs.PATHS:
+        target = getattr(URLs, target)
+    if "://" in target:
+        # Aliases such as CHECKOUT resolve to the name samples are recorded under
+        return f"page:{page_key(target)}"
+    return f"action:{target}"
+
+
+def current_values(budget_or_key: Union[Budget, tuple], test_id: Optional[str]) -> dict[str, list[float]]:
+    """Samples of a subject's metric recorded in this process by run target, optionally for one test only"""
+    subject, metric = budget_or_key[:2]
+    kind, name = subject.split(":", 1)
+    if kind == "page":
+        samples = [
+            (sample.target, sample.metrics[metric]) for sample in web_vitals.samples(test_id)
+            if sample.page == name and sample.metrics.get(metric) is not None
+        ]
+    else:
+        page_object, _, method = name.rpartition(".")
+        samples = [
+            (sample.target, sample.duration_ms) for sample in action_timings.samples(test_id)
+            if sample.ok and sample.page_object == page_object and sample.method == method
+        ]
+    by_target = {}
+    for target, value in samples:
+        by_target.setdefault(target, []).append(value)
+    return by_target
+
+
+class PerfBudgets:
+    """Budgets from the budget file plus the sample history of earlier runs"""
+
+    def __init__(self, budgets: list[Budget], history: dict[str, dict[str, list[float]]],
+                 min_samples: int = 5):
+        self.budgets = budgets
+        self.history = history
+        self.min_samples = min_samples
+
+    @classmethod
+    def load(cls, budgets_path: Path, history_path: Path) -> "PerfBudgets":
+        budgets = []
+        if budgets_path.exists():
+            with open(budgets_path) as f:
+                budgets = parse_budgets(json.load(f))
+        history = {}
+        if history_path.exists():
+            try:
+                with open(history_path) as f:
+                    history = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable budget history {history_path}: {e}")
+        return cls(budgets, history, settings.PERF_BUDGET_MIN_SAMPLES)
+
+    def for_subject(self, subject: str) -> list[Budget]:
+        return [budget for budget in self.budgets if budget.subject == subject]
+
+    def check(self, budget: Budget, values: list[float], target: str) -> BudgetResult:
+        """Check this run's values on a target, together with earlier runs' in percentile mode
+
+        A percentile over fewer than min_samples samples is reported but passes.
+        """
+        if budget.percentile is None:
+            observed = max(values)
+            return BudgetResult(budget, target, observed, len(values), observed <= budget.limit)
+        window = self.history.get(target, {}).get(budget.key, []) + values
+        observed = nearest_rank(window, budget.percentile)
+        if len(window) < self.min_samples:
+            return BudgetResult(budget, target, observed, len(window), True, enforced=False)
+        return BudgetResult(budget, target, observed, len(window), observed <= budget.limit)
+
+    def check_test(self, test_id: str, subjects: tuple = ()) -> list[BudgetResult]:
+        """Check every budget (or those of the given subjects) the test produced samples for"""
+        results = []
+        for budget in self.budgets:
+            if subjects and budget.subject not in subjects:
+                continue
+            for target, values in current_values(budget, test_id).items():
+                results.append(self.check(budget, values, target))
+        return results
+
+    def updated_history(self, new_values: dict[str, dict[str, list[float]]]) -> dict:
+        """History with this run's values appended, keeping the newest HISTORY_WINDOW per target and key"""
+        history = {target: dict(keys) for target, keys in self.history.items()}
+        for target, keys in new_values.items():
+            target_history = history.setdefault(target, {})
+            for key, values in keys.items():
+                target_history[key] = (target_history.get(key, []) + values)[-HISTORY_WINDOW:]
+        return history
+
+
+def parse_budgets(data: dict) -> list[Budget]:
+    """Budgets from the parsed budget file"""
+    default_percentile = data.get("percentile", 95)
+
+    def budget(subject: str, metric: str, spec) -> Budget:
+        if isinstance(spec, dict):
+            return Budget(subject, metric, float(spec["max"]), spec.get("percentile", default_percentile))
+        return Budget(subject, metric, float(spec), default_percentile)
+
+    budgets = []
+    for page, metrics in data.get("pages", {}).items():
+        if page not in URLs.PATHS:
+            raise ValueError(f"Unknown page '{page}' in budgets, expected one of: {', '.join(URLs.PATHS)}")
+        for metric, spec in metrics.items():
+            budgets.append(budget(subject_of(page), metric, spec))
+    for action, spec in data.get("actions", {}).items():
+        budgets.append(budget(f"action:{action}", ACTION_METRIC, spec))
+    return budgets
+
+
+# Budgets in use in this process, set by the perf_budgets plugin or loaded on first use
+_active: Optional[PerfBudgets] = None
+
+
+def use_budgets(budgets: Optional[PerfBudgets]):
+    global _active
+    _active = budgets
+
+
+def get_perf_budgets() -> PerfBudgets:
+    """Budgets in use, loaded from the configured files relative to the working directory by default"""
+    global _active
+    if _active is None:
+        _active = PerfBudgets.load(Path(settings.PERF_BUDGETS), Path(settings.PERF_BUDGET_HISTORY))
+    return _active
+
+
+class PerfExpectation:
+    """expect-style assertions on the samples of one page or page-object action"""
+
+    def __init__(self, target: Union[str, Callable], scope: str = "test"):
+        if scope not in ("test", "session"):
+            raise ValueError(f"scope must be 'test' or 'session', got '{scope}'")
+        self.subject = subject_of(target)
+        self.test_id = current_test_id() if scope == "test" else None
+
+    def _values(self, metric: str) -> dict[str, list[float]]:
+        values = current_values((self.subject, metric), self.test_id)
+        if not values:
+            raise AssertionError(f"No {metric} samples recorded for {self.subject}")
+        return values
+
+    def _check(self, budget: Budget) -> list[BudgetResult]:
+        return [
+            get_perf_budgets().check(budget, values, target)
+            for target, values in self._values(budget.metric).items()
+        ]
+
+    def to_be_within(self, limit: float, metric: str = None,
+                     percentile: Optional[float] = None) -> list[BudgetResult]:
+        """Assert the metric (load_ms for pages, duration_ms for actions) stays within limit"""
+        if metric is None:
+            metric = DEFAULT_PAGE_METRIC if self.subject.startswith("page:") else ACTION_METRIC
+        results = self._check(Budget(self.subject, metric, float(limit), percentile))
+        failures = [result.describe() for result in results if not result.passed]
+        assert not failures, "Performance budget exceeded: " + "; ".join(failures)
+        return results
+
+    def to_meet_budget(self) -> list[BudgetResult]:
+        """Assert every budget in the budget file for this page or action"""
+        budgets = get_perf_budgets().for_subject(self.subject)
+        if not budgets:
+            raise AssertionError(f"No budget defined for {self.subject} in {settings.PERF_BUDGETS}")
+        results = [result for budget in budgets for result in self._check(budget)]
+        failures = [result.describe() for result in results if not result.passed]
+        assert not failures, "Performance budget exceeded: " + "; ".join(failures)
+        return results
+
+
+def expect_perf(target: Union[str, Callable], scope: str = "test") -> PerfExpectation:
+    """Assertions on a page (URL or URLs name) or page-object method, e.g. CartPage.proceed_to_checkout"""
+    return PerfExpectation(target, scope)
@@ -0,0 +1,272 @@
+"""Playwright traces and videos, kept only for the tests that need them
+
+TRACE_MODE and VIDEO_MODE (or --trace-mode and --video-mode) are each one of
+off, on-failure (record every test, keep failed or retried ones) or always.
+
+Tracing is started once per context and every test records its own chunk,
+so a pooled context shared by many tests still gives one trace per test. The
+chunk of a test that is not kept is stopped without being exported, which
+costs next to nothing. Kept traces are the zip archives Playwright exports:
+
+    <TRACE_DIR>/<worker id>/<test id>-trace.zip
+
+Videos are recorded for every page of a strict (per-test) context into a
+scratch directory and moved next to the traces only when kept; pooled
+contexts outlive their tests, so they are never recorded.
+
+Kept files form a ring buffer per worker: one over RECORDING_MAX_MB is
+deleted straight away, and once the kept files add up to more than
+RECORDING_TOTAL_MAX_MB the oldest are deleted first.
+"""
+import shutil
+import tempfile
+from collections import deque
+from pathlib import Path
+from typing import Optional
+
+import allure
+from saucedemo.config.logger import get_logger
+from saucedemo.config.settings import get_settings
+from saucedemo.utils.artifacts import artifact_path
+
+logger = get_logger(__name__)
+
+settings = get_settings()
+
+OFF = "off"
+ON_FAILURE = "on-failure"
+ALWAYS = "always"
+MODES = (OFF, ON_FAILURE, ALWAYS)
+
+
+def keep_artifacts(node) -> bool:
+    """Whether a test failed so far, or is being retried (pytest-rerunfailures' execution_count)"""
+    for when in ("setup", "call"):
+        report = getattr(node, f"rep_{when}", None)
+        if report is not None and report.failed:
+            return True
+    return getattr(node, "execution_count", 1) > 1
+
+
+def attach_recordings(paths):
+    """Attach kept traces and videos to the Allure report"""
+    for path in paths:
+        if path.suffix == ".zip":
+            allure.attach.file(str(path), name="trace", extension="zip")
+        else:
+            allure.attach.file(str(path), name="video", attachment_type=allure.attachment_type.WEBM)
+
+
+class RecordingBuffer:
+    """Kept recordings of this process, oldest first, deleted past the size caps"""
+
+    def __init__(self, max_bytes: int = 0, total_max_bytes: int = 0):
+        self.max_bytes = max_bytes
+        self.total_max_bytes = total_max_bytes
+        self.total_bytes = 0
+        self.dropped = 0
+        self._kept = deque()
+
+    def add(self, path: Path) -> Optional[Path]:
+        """Keep a recording, or delete it if it is over the per-file cap; returns it if kept"""
+        size = path.stat().st_size
+        if self.max_bytes and size > self.max_bytes:
+            logger.warning(f"Deleting {path}: {size} bytes is over the {self.max_bytes} byte cap")
+            path.unlink(missing_ok=True)
+            self.dropped += 1
+            return None
+        self._kept.append((path, size))
+        self.total_bytes += size
+        while self.total_max_bytes and self.total_bytes > self.total_max_bytes and len(self._kept) > 1:
+            oldest, oldest_size = self._kept.popleft()
+            oldest.unlink(missing_ok=True)
+            self.total_bytes -= oldest_size
+            self.dropped += 1
+            logger.info(f"Deleted {oldest} to keep recordings under {self.total_max_bytes} bytes")
+        return path
+
+    def __len__(self) -> int:
+        return len(self._kept)
+
+
+class TraceRecorder:
+    """Starts tracing and video on contexts and keeps what the modes ask for"""
+
+    def __init__(self, trace_mode: str = OFF, video_mode: str = OFF, root: Path = Path("traces"),
+                 screenshots: bool = True, max_bytes: int = 0, total_max_bytes: int = 0):
+        for mode in (trace_mode, video_mode):
+            if mode not in MODES:
+                raise ValueError(f"Unknown recording mode '{mode}', expected one of: {', '.join(MODES)}")
+        self.trace_mode = trace_mode
+        self.video_mode = video_mode
+        self.root = root
+        self.screenshots = screenshots
+        self.buffer = RecordingBuffer(max_bytes, total_max_bytes)
+        self._video_dir = None
+
+    @classmethod
+    def from_settings(cls, trace_mode: str = None, video_mode: str = None) -> "TraceRecorder":
+        return cls(
+            trace_mode=trace_mode or settings.TRACE_MODE,
+            video_mode=video_mode or settings.VIDEO_MODE,
+            root=Path(settings.TRACE_DIR),
+            screenshots=settings.TRACE_SCREENSHOTS,
+            max_bytes=settings.RECORDING_MAX_MB * 1024 * 1024,
+            total_max_bytes=settings.RECORDING_TOTAL_MAX_MB * 1024 * 1024
+        )
+
+    @property
+    def tracing(self) -> bool:
+        return self.trace_mode != OFF
+
+    @property
+    def video(self) -> bool:
+        return self.video_mode != OFF
+
+    def keeps(self, mode: str, failed: bool) -> bool:
+        return mode == ALWAYS or (mode == ON_FAILURE and failed)
+
+    def video_options(self) -> dict:
+        """new_context() arguments recording video into the scratch directory, if video is on"""
+        if not self.video:
+            return {}
+        if self._video_dir is None:
+            self._video_dir = tempfile.mkdtemp(prefix="videos_")
+        return {"record_video_dir": self._video_dir}
+
+    def start(self, context):
+        """Start tracing a playwright.sync_api context for all its tests to come"""
+        if self.tracing:
+            context.tracing.start(screenshots=self.screenshots, snapshots=True)
+
+    async def start_async(self, context):
+        """start() for a playwright.async_api context"""
+        if self.tracing:
+            await context.tracing.start(screenshots=self.screenshots, snapshots=True)
+
+    def record(self, context, test_id: str, index: int = 1, started: bool = True) -> "Recording":
+        """Record a test in a playwright.sync_api context; started=False starts tracing it first"""
+        if not started:
+            self.start(context)
+        recording = Recording(self, context, test_id, index)
+        if self.tracing:
+            context.tracing.start_chunk(title=test_id)
+        if self.video:
+            context.on("page", recording.pages.append)
+        return recording
+
+    async def record_async(self, context, test_id: str, index: int = 1,
+                           started: bool = True) -> "AsyncRecording":
+        """record() for a playwright.async_api context"""
+        if not started:
+            await self.start_async(context)
+        recording = AsyncRecording(self, context, test_id, index)
+        if self.tracing:
+            await context.tracing.start_chunk(title=test_id)
+        if self.video:
+            context.on("page", recording.pages.append)
+        return recording
+
+    def close(self):
+        """Delete the scratch video directory"""
+        if self._video_dir is not None:
+            shutil.rmtree(self._video_dir, ignore_errors=True)
+            self._video_dir = None
+
+
+class Recording:
+    """Trace chunk and videos of one test in one playwright.sync_api context"""
+
+    def __init__(self, recorder: TraceRecorder, context, test_id: str, index: int = 1):
+        self.recorder = recorder
+        self.context = context
+        self.test_id = test_id
+        # Tests with several contexts number the files of all but the first
+        self.suffix = f"-{index}" if index > 1 else ""
+        self.pages = []
+
+    def _path(self, name: str, extension: str) -> Path:
+        path = artifact_path(self.test_id, f"{name}{self.suffix}", extension, root=str(self.recorder.root))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def _video_name(self, number: int) -> str:
+        return "video" if number == 1 else f"video-p{number}"
+
+    def stop(self, failed: bool) -> list[Path]:
+        """End the test's trace chunk, exporting it only if kept; the context stays open"""
+        if not self.recorder.tracing:
+            return []
+        if not self.recorder.keeps(self.recorder.trace_mode, failed):
+            self.context.tracing.stop_chunk()
+            return []
+        path = self._path("trace", "zip")
+        self.context.tracing.stop_chunk(path=str(path))
+        kept = self.recorder.buffer.add(path)
+        return [kept] if kept else []
+
+    def close(self, failed: bool) -> list[Path]:
+        """stop(), then close the context and keep or delete its pages' videos"""
+        kept = self.stop(failed)
+        self.context.close()
+        keep_video = self.recorder.keeps(self.recorder.video_mode, failed)
+        for number, page in enumerate(self.pages, 1):
+            video = page.video
+            if video is None:
+                continue
+            if keep_video:
+                path = self._path(self._video_name(number), "webm")
+                video.save_as(str(path))
+                kept_video = self.recorder.buffer.add(path)
+                if kept_video:
+                    kept.append(kept_video)
+            video.delete()
+        return kept
+
+
+class AsyncRecording(Recording):
+    """Recording for a playwright.async_api context"""
+
+    async def stop(self, failed: bool) -> list[Path]:
+        if not self.recorder.tracing:
+            return []
+        if not self.recorder.keeps(self.recorder.trace_mode, failed):
+            await self.context.tracing.stop_chunk()
+            return []
+        path = self._path("trace", "zip")
+        await self.context.tracing.stop_chunk(path=str(path))
+        kept = self.recorder.buffer.add(path)
+        return [kept] if kept else []
+
+    async def close(self, failed: bool) -> list[Path]:
+        kept = await self.stop(failed)
+        await self.context.close()
+        keep_video = self.recorder.keeps(self.recorder.video_mode, failed)
+        for number, page in enumerate(self.pages, 1):
+            video = page.video
+            if video is None:
+                continue
+            if keep_video:
+                path = self._path(self._video_name(number), "webm")
+                await video.save_as(str(path))
+                kept_video = self.recorder.buffer.add(path)
+                if kept_video:
+                    kept.append(kept_video)
+            await video.delete()
+        return kept
+
+
+_active: Optional[TraceRecorder] = None
+
+
+def use_trace_recorder(recorder: Optional[TraceRecorder]):
+    global _active
+    _active = recorder
+
+
+def get_trace_recorder() -> TraceRecorder:
+    """Recorder in use, configured from the TRACE_* and VIDEO_MODE settings by default"""
+    global _active
+    if _active is None:
+        _active = TraceRecorder.from_settings()
+    return _active
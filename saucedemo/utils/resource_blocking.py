@@ -0,0 +1,112 @@
+"""Named profiles of requests a test's context aborts
+
+Tests that never look at images, media or third-party content can skip
+downloading them:
+
+    @pytest.mark.block_resources("no-images")
+
+The context fixtures apply the marker's profiles with a context route that
+aborts matching requests and falls back to the other routes (e.g. the asset
+cache) for everything else. Aborting a request leaves the element that made
+it in the DOM, so an <img> keeps its src attribute without its bytes being
+fetched. Blocked requests show up as failed requests in the browser events.
+"""
+from typing import NamedTuple
+from urllib.parse import urlsplit
+
+from saucedemo.config.constants import URLs
+from saucedemo.config.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class BlockingProfile(NamedTuple):
+    """Resource types to abort, and whether to abort every request off the app's host"""
+    resource_types: frozenset = frozenset()
+    first_party_only: bool = False
+
+    def __or__(self, other: "BlockingProfile") -> "BlockingProfile":
+        return BlockingProfile(
+            self.resource_types | other.resource_types,
+            self.first_party_only or other.first_party_only
+        )
+
+
+PROFILES = {
+    "no-images": BlockingProfile(frozenset({"image"})),
+    "no-media": BlockingProfile(frozenset({"media"})),
+    "no-fonts": BlockingProfile(frozenset({"font"})),
+    "first-party-only": BlockingProfile(first_party_only=True),
+    # Everything a functional test does not need to read the DOM
+    "text-only": BlockingProfile(frozenset({"image", "media", "font"}), first_party_only=True),
+}
+
+
+def combined_profile(names) -> BlockingProfile:
+    """The union of the named profiles"""
+    unknown = [name for name in names if name not in PROFILES]
+    if unknown:
+        raise ValueError(
+            f"Unknown blocking profiles: {', '.join(unknown)}, expected some of: {', '.join(PROFILES)}"
+        )
+    profile = BlockingProfile()
+    for name in names:
+        profile = profile | PROFILES[name]
+    return profile
+
+
+def blocking_profiles(node) -> list[str]:
+    """Profile names from every block_resources marker on a test, its class and module"""
+    return [name for marker in node.iter_markers("block_resources") for name in marker.args]
+
+
+def is_first_party(url: str) -> bool:
+    """Whether a URL is on the app's host or one of its subdomains"""
+    host = urlsplit(url).hostname or ""
+    app_host = urlsplit(URLs.BASE_URL).hostname or ""
+    return host == app_host or host.endswith(f".{app_host}")
+
+
+class ResourceBlocker:
+    """Context route handler aborting the requests a profile blocks"""
+
+    def __init__(self, profile: BlockingProfile):
+        self.profile = profile
+        self.blocked = 0
+
+    def blocks(self, request) -> bool:
+        if request.resource_type in self.profile.resource_types:
+            return True
+        return self.profile.first_party_only and not is_first_party(request.url)
+
+    def handle(self, route):
+        if self.blocks(route.request):
+            self.blocked += 1
+            route.abort("blockedbyclient")
+        else:
+            route.fallback()
+
+    async def handle_async(self, route):
+        if self.blocks(route.request):
+            self.blocked += 1
+            await route.abort("blockedbyclient")
+        else:
+            await route.fallback()
+
+
+def block_resources(context, names) -> ResourceBlocker:
+    """Abort the requests the named profiles block in every page of the context"""
+    blocker = ResourceBlocker(combined_profile(names))
+    if names:
+        logger.debug(f"Blocking resources: {', '.join(names)}")
+        context.route("**/*", blocker.handle)
+    return blocker
+
+
+async def block_resources_async(context, names) -> ResourceBlocker:
+    """block_resources() for a playwright.async_api BrowserContext"""
+    blocker = ResourceBlocker(combined_profile(names))
+    if names:
+        logger.debug(f"Blocking resources: {', '.join(names)}")
+        await context.route("**/*", blocker.handle_async)
+    return blocker
@@ -0,0 +1,169 @@
+"""Resolution time of the registry selectors against the ones they replaced
+
+For each parameterised selector in saucedemo.pages.selectors and each
+product, times two things on a live page:
+
+- round trip: build the selector and Locator as the page objects do, then
+  resolve it with Locator.count(). The legacy variant is the name-based
+  XPath the page objects used before the registry, still kept as its
+  FALLBACKS; it formats its string and creates a new Locator every time.
+  The registry variant uses selector() and the page's LocatorCache.
+- in page: the browser's own matching time (querySelectorAll or XPath
+  evaluate) for the same selector, without the Playwright round trip.
+  Selectors using Playwright-only pseudo-classes have no in-page figure.
+
+    python -m saucedemo.utils.selector_benchmark --local-site --iterations 200
+"""
+import argparse
+import json
+import time
+from pathlib import Path
+
+from playwright.sync_api import Page, sync_playwright
+from saucedemo.config.constants import Credentials, Products, URLs
+from saucedemo.config.logger import get_logger
+from saucedemo.config.settings import get_settings
+from saucedemo.pages.cart_page import CartPage
+from saucedemo.pages.inventory_page import InventoryPage
+from saucedemo.pages.login_page import LoginPage
+from saucedemo.pages.selectors import FALLBACKS, TEMPLATES, locators_for, selector
+from saucedemo.utils.local_site import LocalSiteServer
+from saucedemo.utils.stats import latency_summary
+
+logger = get_logger(__name__)
+
+settings = get_settings()
+
+# Times `iterations` native matches of a selector in the page, in milliseconds
+IN_PAGE_SCRIPT = """([selector, iterations]) => {
+    const match = selector.startsWith('//')
+        ? () => document.evaluate(selector, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null).snapshotLength
+        : () => document.querySelectorAll(selector).length;
+    const start = performance.now();
+    for (let i = 0; i < iterations; i++) {
+        match();
+    }
+    return (performance.now() - start) / iterations;
+}"""
+
+# Products added to the cart first, so both add and remove buttons exist
+CART = (Products.BACKPACK, Products.ONESIE)
+
+
+def in_page_ms(page: Page, selector_text: str, iterations: int):
+    """Mean native matching time, or None when the browser cannot evaluate the selector itself"""
+    try:
+        return round(page.evaluate(IN_PAGE_SCRIPT, [selector_text, iterations]), 4)
+    except Exception:
+        return None
+
+
+def time_round_trips(page: Page, name: str, item: str, iterations: int) -> dict:
+    """Round-trip samples of the legacy and registry selector for one product"""
+    legacy, registry = [], []
+    cache = locators_for(page)
+    for _ in range(iterations):
+        start = time.perf_counter()
+        page.locator(FALLBACKS[name].format(item=item)).count()
+        legacy.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        cache.get(selector(name, item)).count()
+        registry.append((time.perf_counter() - start) * 1000)
+    return {"legacy": legacy, "registry": registry}
+
+
+def benchmark_page(page: Page, names: list[str], iterations: int) -> list[dict]:
+    results = []
+    for name in names:
+        for item in Products.IDS:
+            samples = time_round_trips(page, name, item, iterations)
+            legacy = latency_summary(samples["legacy"])
+            registry = latency_summary(samples["registry"])
+            results.append({
+                "selector": name,
+                "item": item,
+                "legacy": FALLBACKS[name].format(item=item),
+                "registry": selector(name, item),
+                "legacy_round_trip": legacy,
+                "registry_round_trip": registry,
+                "legacy_in_page_ms": in_page_ms(page, FALLBACKS[name].format(item=item), iterations),
+                "registry_in_page_ms": in_page_ms(page, selector(name, item), iterations),
+                "p50_speedup": round(legacy["p50_ms"] / registry["p50_ms"], 2) if registry["p50_ms"] else None,
+            })
+    return results
+
+
+def run_benchmark(iterations: int = 100, browser_type: str = "chromium", headless: bool = True) -> dict:
+    """Benchmark every parameterised selector on the inventory and cart pages of URLs.BASE_URL"""
+    with sync_playwright() as playwright:
+        browser = getattr(playwright, browser_type).launch(headless=headless)
+        try:
+            page = browser.new_page()
+            LoginPage(page).login(Credentials.STANDARD_USER, Credentials.STANDARD_PASSWORD)
+            inventory_page = InventoryPage(page)
+            for item in CART:
+                inventory_page.add_to_cart(item)
+            results = benchmark_page(page, [name for name in TEMPLATES if name.startswith("inventory.")], iterations)
+            inventory_page.open_cart()
+            CartPage(page).wait_for_selector(CartPage.cart_items)
+            results += benchmark_page(page, [name for name in TEMPLATES if name.startswith("cart.")], iterations)
+        finally:
+            browser.close()
+    return {
+        "base_url": URLs.BASE_URL,
+        "browser_type": browser_type,
+        "iterations": iterations,
+        "results": results,
+    }
+
+
+def format_report(report: dict) -> str:
+    """Plain-text table of the p50 round trip and in-page time per selector and product"""
+    lines = [
+        f"{report['iterations']} iterations per selector on {report['browser_type']} against {report['base_url']}",
+        f"{'selector':<30}{'item':<28}{'legacy p50':>12}{'registry p50':>14}{'speedup':>9}"
+        f"{'legacy page':>13}{'registry page':>15}",
+    ]
+    for result in report["results"]:
+        lines.append(
+            f"{result['selector']:<30}{result['item'][:27]:<28}"
+            f"{result['legacy_round_trip']['p50_ms']:>12}{result['registry_round_trip']['p50_ms']:>14}"
+            f"{str(result['p50_speedup']) + 'x':>9}"
+            f"{str(result['legacy_in_page_ms']):>13}{str(result['registry_in_page_ms']):>15}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] = None):
+    parser = argparse.ArgumentParser(description="Compare legacy and registry selector resolution times")
+    parser.add_argument("--iterations", type=int, default=100, help="Resolutions per selector and product")
+    parser.add_argument("--browser-type", default=settings.BROWSER, choices=["chromium", "firefox", "webkit"])
+    parser.add_argument("--headed", action="store_true", help="Show the browser")
+    parser.add_argument("--base-url", default=None, help="Target instead of BASE_URL")
+    parser.add_argument("--local-site", action="store_true", help="Target the bundled local replica")
+    parser.add_argument(
+        "--output", default=str(Path(settings.RESULTS_DIR) / "selector_benchmark.json"), help="JSON report path"
+    )
+    args = parser.parse_args(argv)
+
+    if args.local_site:
+        with LocalSiteServer() as server:
+            URLs.rebase(server.base_url)
+            report = run_benchmark(args.iterations, args.browser_type, not args.headed)
+    else:
+        if args.base_url:
+            URLs.rebase(args.base_url)
+        report = run_benchmark(args.iterations, args.browser_type, not args.headed)
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(format_report(report))
+    print(f"Report written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
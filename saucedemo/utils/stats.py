@@ -0,0 +1,50 @@
+import math
+from typing import Iterable, Sequence
+
+# Upper bounds (ms) of the latency histogram buckets; larger samples land in "+Inf"
+LATENCY_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of the values, 0.0 when there are none"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def histogram(values: Iterable[float], buckets: Sequence[float] = LATENCY_BUCKETS_MS) -> dict[str, int]:
+    """Count values per bucket, keyed by the bucket's upper bound"""
+    counts = {f"<={bound}": 0 for bound in buckets}
+    counts["+Inf"] = 0
+    for value in values:
+        for bound in buckets:
+            if value <= bound:
+                counts[f"<={bound}"] += 1
+                break
+        else:
+            counts["+Inf"] += 1
+    return counts
+
+
+def latency_summary(values: Sequence[float]) -> dict:
+    """Count, total, p50/p95/p99 and max of latency samples in milliseconds"""
+    return {
+        "count": len(values),
+        "total_ms": round(sum(values), 3),
+        "p50_ms": round(percentile(values, 50), 3),
+        "p95_ms": round(percentile(values, 95), 3),
+        "p99_ms": round(percentile(values, 99), 3),
+        "max_ms": round(max(values), 3) if values else 0.0,
+    }
+
+
+def merge_samples(parts: Iterable[dict[str, dict[str, list]]]) -> dict[str, dict[str, list]]:
+    """Concatenate {target: {key: [samples]}} mappings, e.g. the per-worker ones of a run"""
+    merged = {}
+    for part in parts:
+        for target, keys in part.items():
+            for key, values in keys.items():
+                merged.setdefault(target, {}).setdefault(key, []).extend(values)
+    return merged
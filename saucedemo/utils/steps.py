@@ -0,0 +1,55 @@
+"""Page-object methods written once for the sync and the asyncio Playwright APIs
+
+A method decorated with @stepwise is a generator that yields each Playwright
+call it makes and gets the call's result back:
+
+    @stepwise
+    def get_cart_count(self) -> int:
+        badge = self.locator(self.cart_badge)
+        if (yield badge.count()) == 0:
+            return 0
+        return self.parse_cart_count((yield badge.text_content()))
+
+On a playwright.sync_api page the call has already run when it is yielded, so
+run_steps() sends its result straight back. On a playwright.async_api page it
+is an awaitable, which run_steps_async() awaits before sending back the
+result, or raising the error, at the yield. Which of the two runs a method is
+the page object's run_steps, so the same method is synchronous on BasePage
+subclasses and a coroutine on AsyncBasePage subclasses.
+"""
+import functools
+import inspect
+from typing import Generator
+
+
+def run_steps(steps: Generator):
+    """Run steps whose playwright.sync_api calls already ran when yielded; returns their result"""
+    try:
+        result = next(steps)
+        while True:
+            result = steps.send(result)
+    except StopIteration as stop:
+        return stop.value
+
+
+async def run_steps_async(steps: Generator):
+    """Run steps yielding playwright.async_api calls, awaiting each one; returns their result"""
+    resume, value = steps.send, None
+    while True:
+        try:
+            step = resume(value)
+        except StopIteration as stop:
+            return stop.value
+        try:
+            value = await step if inspect.isawaitable(step) else step
+            resume = steps.send
+        except BaseException as e:
+            resume, value = steps.throw, e
+
+
+def stepwise(method):
+    """Run a page-object method written as steps with the page object's run_steps"""
+    @functools.wraps(method)
+    def run(self, *args, **kwargs):
+        return self.run_steps(method(self, *args, **kwargs))
+    return run
@@ -0,0 +1,58 @@
+"""Sync Playwright that asyncio tests can stop and later sync tests start again
+
+Sync Playwright keeps its event loop registered as running on the main thread
+for as long as it is started, so no other event loop can run in the
+meantime. The sync fixtures therefore do not own Playwright, the browsers or
+the per-browser resources: they are function-scoped and read them from the
+process's SyncPlaywrightSession, which starts Playwright on first use and
+keeps everything built on it in its EngineCache. Before an asyncio test the
+session is stopped, closing the cache first; a sync test that comes later
+(e.g. under xdist) starts it again instead of getting stopped objects.
+"""
+from typing import Optional
+
+from playwright.sync_api import Playwright, sync_playwright
+from saucedemo.config.logger import get_logger
+from saucedemo.utils.browser_matrix import EngineCache
+
+logger = get_logger(__name__)
+
+
+class SyncPlaywrightSession:
+    """Sync Playwright and the objects built on it, started on demand"""
+
+    def __init__(self):
+        self.cache = EngineCache()
+        self._playwright: Optional[Playwright] = None
+
+    @property
+    def started(self) -> bool:
+        return self._playwright is not None
+
+    def playwright(self) -> Playwright:
+        """The started Playwright, starting it if it is not"""
+        if self._playwright is None:
+            self._playwright = sync_playwright().start()
+        return self._playwright
+
+    def stop(self):
+        """Close everything in the cache, then stop Playwright; a no-op when it is not started"""
+        if self._playwright is None:
+            return
+        logger.info("Stopping sync Playwright")
+        try:
+            self.cache.close()
+        finally:
+            self._playwright.stop()
+            self._playwright = None
+
+
+_active: Optional[SyncPlaywrightSession] = None
+
+
+def get_sync_session() -> SyncPlaywrightSession:
+    """This process's sync Playwright session"""
+    global _active
+    if _active is None:
+        _active = SyncPlaywrightSession()
+    return _active
@@ -0,0 +1,268 @@
+"""Navigation Timing, paint, LCP, CLS and long-task metrics per page load
+
+OBSERVER_SCRIPT is added to every browser context as an init script, so its
+PerformanceObservers are in place before any page script runs. Page-object
+methods decorated with @records_navigation read the metrics of the document
+they end up on once it has loaded; each document is read at most once.
+Samples are keyed by the page's name in URLs (e.g. "INVENTORY") and grouped
+by run_target(), the host and engine they were measured on, since a local
+replica or another engine is not comparable with the public site on chromium.
+"""
+import functools
+import threading
+from collections import defaultdict
+from typing import NamedTuple, Optional
+from urllib.parse import urlparse
+
+from saucedemo.config.constants import URLs
+from saucedemo.config.logger import get_logger
+from saucedemo.config.settings import get_settings
+from saucedemo.utils.browser_matrix import page_engine, run_target
+from saucedemo.utils.stats import percentile
+from saucedemo.utils.xdist import current_test_id
+
+logger = get_logger(__name__)
+
+settings = get_settings()
+
+# Entry types not every engine supports (Firefox and WebKit lack some) are
+# skipped, and the matching metrics are reported as null
+OBSERVER_SCRIPT = """
+(() => {
+    if (window.top !== window || window.__saucedemoPerf) {
+        return;
+    }
+    const perf = window.__saucedemoPerf = { lcp: null, cls: 0, longTasks: [], collected: false };
+    const supported = (window.PerformanceObserver && PerformanceObserver.supportedEntryTypes) || [];
+    const observe = (type, callback) => {
+        if (!supported.includes(type)) {
+            return false;
+        }
+        new PerformanceObserver(list => list.getEntries().forEach(callback))
+            .observe({ type, buffered: true });
+        return true;
+    };
+    perf.supports = {
+        lcp: observe('largest-contentful-paint', entry => {
+            perf.lcp = entry.renderTime || entry.loadTime || entry.startTime;
+        }),
+        cls: observe('layout-shift', entry => {
+            if (!entry.hadRecentInput) {
+                perf.cls += entry.value;
+            }
+        }),
+        longtask: observe('longtask', entry => perf.longTasks.push(entry.duration)),
+    };
+})();
+"""
+
+# Returns null for documents without the observer or already collected
+COLLECT_SCRIPT = """() => {
+    const perf = window.__saucedemoPerf;
+    if (!perf || perf.collected) {
+        return null;
+    }
+    perf.collected = true;
+    const round = value => value == null ? null : Math.round(value * 100) / 100;
+    const nav = performance.getEntriesByType('navigation')[0];
+    const paint = Object.fromEntries(
+        performance.getEntriesByType('paint').map(entry => [entry.name, entry.startTime])
+    );
+    const resources = performance.getEntriesByType('resource');
+    return {
+        url: window.location.href,
+        navigation_type: nav ? nav.type : null,
+        ttfb_ms: nav ? round(nav.responseStart) : null,
+        dom_content_loaded_ms: nav ? round(nav.domContentLoadedEventEnd) : null,
+        load_ms: nav ? round(nav.loadEventEnd) : null,
+        transfer_bytes: nav ? nav.transferSize : null,
+        first_paint_ms: round(paint['first-paint']),
+        first_contentful_paint_ms: round(paint['first-contentful-paint']),
+        lcp_ms: perf.supports.lcp ? round(perf.lcp) : null,
+        cls: perf.supports.cls ? Math.round(perf.cls * 10000) / 10000 : null,
+        long_tasks: perf.supports.longtask ? perf.longTasks.length : null,
+        long_task_ms: perf.supports.longtask ? round(perf.longTasks.reduce((a, b) => a + b, 0)) : null,
+        resource_count: resources.length,
+        resource_bytes: resources.reduce((sum, entry) => sum + (entry.transferSize || 0), 0),
+        slowest_resources: resources.slice()
+            .sort((a, b) => b.duration - a.duration)
+            .slice(0, 5)
+            .map(entry => [entry.name, entry.initiatorType, round(entry.duration)]),
+    };
+}"""
+
+# Metrics summarised and compared run over run
+SUMMARY_METRICS = (
+    "ttfb_ms",
+    "dom_content_loaded_ms",
+    "load_ms",
+    "first_contentful_paint_ms",
+    "lcp_ms",
+    "cls",
+    "long_task_ms",
+    "resource_bytes",
+)
+
+
+class NavigationSample(NamedTuple):
+    """Metrics of one loaded document"""
+    page: str
+    test_id: str
+    metrics: dict
+    target: str
+
+
+class WebVitalsStore:
+    """In-process store of navigation samples"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples = []
+        self._by_test = defaultdict(list)
+
+    def record(self, sample: NavigationSample):
+        with self._lock:
+            self._samples.append(sample)
+            self._by_test[sample.test_id].append(sample)
+
+    def samples(self, test_id: str = None) -> list[NavigationSample]:
+        """All samples, or only those recorded during the given test"""
+        with self._lock:
+            if test_id is None:
+                return list(self._samples)
+            return list(self._by_test.get(test_id, ()))
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+            self._by_test.clear()
+
+
+# Shared by every page object in this process
+web_vitals = WebVitalsStore()
+
+
+def install_observer(context):
+    """Add the performance observer to every page the context opens"""
+    if settings.WEB_VITALS:
+        context.add_init_script(OBSERVER_SCRIPT)
+
+
+async def install_observer_async(context):
+    """install_observer() for a playwright.async_api BrowserContext"""
+    if settings.WEB_VITALS:
+        await context.add_init_script(OBSERVER_SCRIPT)
+
+
+def page_key(url: str) -> str:
+    """Name of the page in URLs, or the URL path for pages URLs does not know"""
+    return URLs.name_of(url) or urlparse(url).path or url
+
+
+def _record(page, raw: Optional[dict]):
+    if raw:
+        target = run_target(page_engine(page))
+        web_vitals.record(NavigationSample(page_key(raw["url"]), current_test_id(), raw, target))
+
+
+def collect(page):
+    """Steps recording the metrics of the page's current document once it has loaded
+
+    Run through a page object (see saucedemo.utils.steps), so the same steps
+    serve playwright.sync_api and playwright.async_api pages.
+    """
+    try:
+        yield page.wait_for_load_state("load")
+        _record(page, (yield page.evaluate(COLLECT_SCRIPT)))
+    except Exception as e:
+        logger.debug(f"Could not collect navigation metrics for {page.url}: {e}")
+
+
+def records_navigation(method):
+    """Collect navigation metrics after a page-object method that may load a new page
+
+    Apply under @stepwise and outside @timed_action, so the collection is not
+    part of the action's timing.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        result = yield from method(self, *args, **kwargs)
+        if settings.WEB_VITALS:
+            yield from collect(self.page)
+        return result
+    return wrapper
+
+
+def summarize(samples: list[NavigationSample]) -> dict:
+    """p50/p95/max of each summary metric per target and page"""
+    by_page = defaultdict(lambda: defaultdict(list))
+    counts = defaultdict(int)
+    for sample in samples:
+        key = (sample.target, sample.page)
+        counts[key] += 1
+        for metric in SUMMARY_METRICS:
+            value = sample.metrics.get(metric)
+            if value is not None:
+                by_page[key][metric].append(value)
+    summary = {}
+    for target, page in sorted(counts):
+        summary.setdefault(target, {})[page] = {
+            "count": counts[target, page],
+            **{
+                metric: {
+                    "p50": percentile(values, 50),
+                    "p95": percentile(values, 95),
+                    "max": max(values),
+                }
+                for metric, values in by_page[target, page].items()
+            },
+        }
+    return summary
+
+
+def updated_baseline(baseline: dict, summary: dict, min_samples: int) -> dict:
+    """Baseline with the pages this run loaded at least min_samples times replaced by its summary
+
+    Pages a run measured too few times (e.g. a single test) keep their baseline.
+    """
+    updated = {target: dict(pages) for target, pages in baseline.items()}
+    for target, pages in summary.items():
+        for page, metrics in pages.items():
+            if metrics["count"] >= min_samples:
+                updated.setdefault(target, {})[page] = metrics
+    return updated
+
+
+def compare(current: dict, previous: dict, regression_pct: float) -> dict:
+    """Change of each page's p50 against the baseline of the same target
+
+    A metric counts as regressed when its p50 grew by more than regression_pct.
+    """
+    comparison = {}
+    for target, pages in current.items():
+        changes = _compare_pages(pages, previous.get(target, {}), regression_pct)
+        if changes:
+            comparison[target] = changes
+    return comparison
+
+
+def _compare_pages(current: dict, previous: dict, regression_pct: float) -> dict:
+    comparison = {}
+    for page, metrics in current.items():
+        before = previous.get(page, {})
+        changes = {}
+        for metric in SUMMARY_METRICS:
+            if metric not in metrics or metric not in before:
+                continue
+            now, then = metrics[metric]["p50"], before[metric]["p50"]
+            delta_pct = round((now - then) / then * 100, 1) if then else 0.0
+            changes[metric] = {
+                "previous_p50": then,
+                "p50": now,
+                "delta": round(now - then, 4),
+                "delta_pct": delta_pct,
+                "regressed": delta_pct > regression_pct,
+            }
+        if changes:
+            comparison[page] = changes
+    return comparison
@@ -0,0 +1,73 @@
+import json
+import os
+import shutil
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+from saucedemo.config.settings import get_settings
+
+settings = get_settings()
+
+# Test run as an asyncio task by the concurrent runner, which cannot use the
+# process-wide PYTEST_CURRENT_TEST since several tests run at once
+_task_test_id: ContextVar[str] = ContextVar("task_test_id", default="")
+
+
+def worker_id() -> str:
+    """Name of the current pytest-xdist worker, or "master" when not distributed"""
+    return os.getenv("PYTEST_XDIST_WORKER", "master")
+
+
+def is_worker(config) -> bool:
+    """Whether this pytest process is an xdist worker rather than the controller"""
+    return hasattr(config, "workerinput")
+
+
+def current_test_id() -> str:
+    """Node id of the test currently running in this process (or asyncio task), or "" outside tests"""
+    task_test_id = _task_test_id.get()
+    if task_test_id:
+        return task_test_id
+    current = os.getenv("PYTEST_CURRENT_TEST", "")
+    return current.rsplit(" (", 1)[0]
+
+
+@contextmanager
+def running_test(test_id: str):
+    """Make current_test_id() return test_id in this thread or asyncio task"""
+    token = _task_test_id.set(test_id)
+    try:
+        yield
+    finally:
+        _task_test_id.reset(token)
+
+
+def worker_stats_dir(name: str) -> Path:
+    """RESULTS_DIR/<name>, where every process of the run writes its <worker id>.json"""
+    return Path(settings.RESULTS_DIR) / name
+
+
+def clear_worker_stats(config, name: str):
+    """Drop a previous run's per-worker files; only the controller does, before any worker starts"""
+    if not is_worker(config):
+        shutil.rmtree(worker_stats_dir(name), ignore_errors=True)
+
+
+def write_worker_stats(name: str, data):
+    """Write this process's data for the controller to merge at session end; nothing when it is empty"""
+    if not data:
+        return
+    stats_dir = worker_stats_dir(name)
+    stats_dir.mkdir(parents=True, exist_ok=True)
+    with open(stats_dir / f"{worker_id()}.json", "w") as f:
+        json.dump(data, f)
+
+
+def merge_worker_stats(name: str) -> list:
+    """The data every process of the run wrote, ordered by worker id"""
+    parts = []
+    for path in sorted(worker_stats_dir(name).glob("*.json")):
+        with open(path) as f:
+            parts.append(json.load(f))
+    return parts